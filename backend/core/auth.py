@@ -1,4 +1,5 @@
 from fastapi import Depends, HTTPException, status, Request
+import asyncio
 from typing import Optional
 from datetime import datetime
 from passlib.context import CryptContext
@@ -7,8 +8,15 @@ from bson import ObjectId
 from models.user import UserInDB
 from core.database import get_database
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: new hashes use argon2id, existing bcrypt hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1
+)
 
 # Session storage (in production, use Redis or database)
 sessions = {}
@@ -106,8 +114,13 @@ async def authenticate_user(db: AsyncIOMotorDatabase, email: str, password: str)
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await asyncio.to_thread(pwd_context.verify_and_update, password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash is not None:
+        # Deprecated (bcrypt) hash: store the argon2id rehash while the plain password is at hand
+        await db.users.update_one({"_id": ObjectId(user.id)}, {"$set": {"hashed_password": new_hash}})
+        user.hashed_password = new_hash
     if not user.is_active:
         return None
     return user
@@ -115,7 +128,7 @@ async def authenticate_user(db: AsyncIOMotorDatabase, email: str, password: str)
 async def create_user(db: AsyncIOMotorDatabase, user_data: dict) -> UserInDB:
     """Create a new user in the database"""
     # Hash the password
-    user_data["hashed_password"] = get_password_hash(user_data.pop("password"))
+    user_data["hashed_password"] = await asyncio.to_thread(get_password_hash, user_data.pop("password"))
     
     # Set timestamps
     now = datetime.utcnow()
@@ -6,6 +6,13 @@ class Settings(BaseSettings):
     # Database
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "orion_nexus"
+    # Connection pool shared by every request; size max_pool_size for peak concurrent
+    # requests times the queries each one runs in parallel (e.g. 6 for /metrics)
+    mongodb_max_pool_size: int = 50
+    mongodb_min_pool_size: int = 5
+    mongodb_max_idle_time_ms: int = 30000
+    # Fail fast instead of queueing indefinitely when every pooled connection is busy
+    mongodb_wait_queue_timeout_ms: int = 5000
     
     # Security
     secret_key: str = "your-secret-key-change-in-production"
@@ -22,6 +29,14 @@ class Settings(BaseSettings):
     device_poll_interval: int = 300  # 5 minutes
     ssl_check_interval: int = 3600   # 1 hour
     
+    # Firebase Analytics: also mirror saved credentials to ./config files and
+    # os.environ for tooling that predates database-stored credentials
+    write_legacy_firebase_config_files: bool = False
+    
+    # GCP discovery: only Cloud SQL instances in this region are discovered;
+    # empty discovers every region
+    gcp_cloud_sql_region: str = "asia-southeast1"
+    
     # API
     api_v1_prefix: str = "/api/v1"
     
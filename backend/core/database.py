@@ -1,7 +1,12 @@
+import asyncio
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from pymongo.errors import OperationFailure
+from typing import Any, Dict, Optional
 from core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Database:
     client: Optional[AsyncIOMotorClient] = None
@@ -17,7 +22,13 @@ async def get_database():
 
 async def init_db():
     """Initialize database connection"""
-    db.client = AsyncIOMotorClient(settings.mongodb_url)
+    db.client = AsyncIOMotorClient(
+        settings.mongodb_url,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        minPoolSize=settings.mongodb_min_pool_size,
+        maxIdleTimeMS=settings.mongodb_max_idle_time_ms,
+        waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms
+    )
     db.database = db.client[settings.database_name]
     
     # Create indexes for better performance
@@ -37,74 +48,133 @@ async def close_db():
         print("Disconnected from MongoDB")
 
 
+async def create_unique_index(
+    collection,
+    keys,
+    name: Optional[str] = None,
+    partial_filter_expression: Optional[Dict[str, Any]] = None
+):
+    """Create a unique index, logging instead of raising when it cannot be built.
+    
+    Duplicate documents, or an older non-unique index on the same keys, make the build
+    fail; that should not stop the other index builds or application startup.
+    scripts/dedupe_gcp_resources.py and scripts/dedupe_ga_credentials.py clear both
+    for the collections that have unique indexes.
+    """
+    options = {"unique": True}
+    if name:
+        options["name"] = name
+    if partial_filter_expression:
+        options["partialFilterExpression"] = partial_filter_expression
+    try:
+        await collection.create_index(keys, **options)
+    except OperationFailure as e:
+        logger.error("Could not create unique index %s on %s: %s", name or keys, collection.name, e)
+
+
 async def create_indexes():
     """Create database indexes for optimal performance"""
     database = await get_database()
     
-    # Devices collection indexes
-    await database.devices.create_index("ip_address", unique=True)
-    await database.devices.create_index("name")
-    await database.devices.create_index("device_type")
-    await database.devices.create_index("is_active")
-    await database.devices.create_index("location")
-    
-    # Device health indexes
-    await database.device_health.create_index([("device_id", 1), ("timestamp", -1)])
-    await database.device_health.create_index("timestamp")
-    
-    # Interface history indexes
-    await database.interface_history.create_index([("device_id", 1), ("timestamp", -1)])
-    await database.interface_history.create_index("interface_name")
-    await database.interface_status.create_index([("device_id", 1), ("interface_name", 1), ("timestamp", -1)])
-    
-    # SSL checks indexes
-    await database.ssl_checks.create_index([("domain", 1), ("timestamp", -1)])
-    await database.ssl_checks.create_index("expires_at")
-    await database.ssl_checks.create_index("is_valid")
-    
-    # Uptime monitoring indexes
-    await database.uptime_monitors.create_index("name")
-    await database.uptime_monitors.create_index("url")
-    await database.uptime_monitors.create_index("is_active")
-    await database.uptime_monitors.create_index("current_status")
-    
-    # Uptime check results indexes
-    await database.uptime_check_results.create_index([("monitor_id", 1), ("checked_at", -1)])
-    await database.uptime_check_results.create_index("status")
-    await database.uptime_check_results.create_index("checked_at")
-    
-    # Uptime checks (diagnostics) indexes - legacy collection for diagnostics
-    await database.uptime_checks.create_index([("target", 1), ("timestamp", -1)])
-    await database.uptime_checks.create_index("check_type")
-    
-    # Analytics indexes
-    await database.ga_credentials.create_index("user_id")
-    await database.ga_credentials.create_index("property_id")
-    await database.ga_credentials.create_index("is_active")
-    
-    await database.ga_properties.create_index("credentials_id")
-    await database.ga_properties.create_index("property_id")
-    
-    await database.ga_metrics.create_index([("property_id", 1), ("collected_at", -1)])
-    await database.ga_metrics.create_index("metric_type")
-    await database.ga_metrics.create_index([("date_range_start", 1), ("date_range_end", 1)])
-    
-    await database.ga_reports.create_index([("property_id", 1), ("generated_at", -1)])
-    await database.ga_reports.create_index("report_type")
-    
-    # Alerts indexes
-    await database.alerts.create_index("status")
-    await database.alerts.create_index("severity")
-    await database.alerts.create_index("timestamp")
-    await database.alerts.create_index("is_resolved")
-    
-    # Uptime alerts indexes
-    await database.uptime_alerts.create_index([("monitor_id", 1), ("triggered_at", -1)])
-    await database.uptime_alerts.create_index("is_resolved")
-    await database.uptime_alerts.create_index("alert_type")
+    # create_index is a no-op for indexes that already exist, so this is safe on every
+    # startup; the builds are independent and run concurrently
+    await asyncio.gather(
+        # Devices collection indexes
+        database.devices.create_index("ip_address", unique=True),
+        database.devices.create_index("name"),
+        database.devices.create_index("device_type"),
+        database.devices.create_index([("device_type", 1), ("_id", 1)]),
+        database.devices.create_index("is_active"),
+        database.devices.create_index("location"),
+        
+        # Device health indexes
+        database.device_health.create_index([("device_id", 1), ("timestamp", -1)]),
+        database.device_health.create_index("timestamp"),
+        database.device_health.create_index([("status", 1), ("timestamp", -1)]),
+        
+        # Interface history indexes
+        database.interface_history.create_index([("device_id", 1), ("timestamp", -1)]),
+        database.interface_history.create_index("interface_name"),
+        database.interface_status.create_index([("device_id", 1), ("interface_name", 1), ("timestamp", -1)]),
+        
+        # SSL checks indexes
+        database.ssl_checks.create_index([("domain", 1), ("timestamp", -1)]),
+        database.ssl_checks.create_index("expires_at"),
+        database.ssl_checks.create_index("is_valid"),
+        
+        # Uptime monitoring indexes
+        database.uptime_monitors.create_index("name"),
+        database.uptime_monitors.create_index("url"),
+        database.uptime_monitors.create_index("is_active"),
+        database.uptime_monitors.create_index("current_status"),
+        database.uptime_monitors.create_index([("is_active", 1), ("current_status", 1)]),
+        
+        # Uptime check results indexes
+        database.uptime_check_results.create_index([("monitor_id", 1), ("checked_at", -1)]),
+        database.uptime_check_results.create_index("status"),
+        database.uptime_check_results.create_index("checked_at"),
+        database.uptime_check_results.create_index([("status", 1), ("checked_at", -1)]),
+        
+        # Hourly uptime rollup, one bucket per hour
+        database.uptime_rollup_hourly.create_index("hour", unique=True),
+        
+        # Uptime checks (diagnostics) indexes - legacy collection for diagnostics
+        database.uptime_checks.create_index([("target", 1), ("timestamp", -1)]),
+        database.uptime_checks.create_index("check_type"),
+        database.uptime_checks.create_index([("target", 1), ("check_type", 1), ("timestamp", -1)]),
+        
+        # Analytics indexes
+        database.ga_credentials.create_index("user_id"),
+        database.ga_credentials.create_index("property_id"),
+        database.ga_credentials.create_index("is_active"),
+        database.ga_credentials.create_index([("is_active", 1), ("updated_at", -1)]),
+        # One Firebase-managed credentials document per GA4 property; per-user GA credentials are unconstrained
+        create_unique_index(
+            database.ga_credentials,
+            "property_id",
+            name="firebase_property_id_unique",
+            partial_filter_expression={"user_id": "default"}
+        ),
+        
+        database.ga_properties.create_index("credentials_id"),
+        database.ga_properties.create_index("property_id"),
+        
+        database.ga_metrics.create_index([("property_id", 1), ("collected_at", -1)]),
+        database.ga_metrics.create_index("metric_type"),
+        database.ga_metrics.create_index([("date_range_start", 1), ("date_range_end", 1)]),
+        
+        database.ga_reports.create_index([("property_id", 1), ("generated_at", -1)]),
+        database.ga_reports.create_index("report_type"),
+        
+        # GCP credentials and generic resource indexes
+        database.gcp_credentials.create_index("project_id"),
+        # Unique so a resource can be registered with a single $setOnInsert upsert
+        create_unique_index(
+            database.gcp_resources,
+            [("credentials_id", 1), ("resource_id", 1)],
+            name="credentials_resource_unique"
+        ),
+        # Per-service listings: equality on service type and credentials, newest first
+        database.gcp_resources.create_index(
+            [("service_type", 1), ("credentials_id", 1), ("created_at", -1)],
+            name="svc_creds_created"
+        ),
+        
+        # Alerts indexes
+        database.alerts.create_index("status"),
+        database.alerts.create_index("severity"),
+        database.alerts.create_index("timestamp"),
+        database.alerts.create_index("is_resolved"),
+        
+        # Uptime alerts indexes
+        database.uptime_alerts.create_index([("monitor_id", 1), ("triggered_at", -1)]),
+        database.uptime_alerts.create_index("is_resolved"),
+        database.uptime_alerts.create_index("alert_type")
+    )
     
     # GCP service-specific collection indexes
     from core.gcp_collections import create_service_indexes
     await create_service_indexes(database)
     
-    print("Database indexes created successfully")
\ No newline at end of file
+    stats = await database.command("dbStats")
+    print(f"Database indexes created successfully ({stats.get('indexSize', 0) / 1024 / 1024:.1f} MiB total index size)")
\ No newline at end of file
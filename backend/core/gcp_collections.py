@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from core.database import create_unique_index
 from models.gcp import GCPServiceType
 
 # Define collection names for each GCP service type
@@ -16,7 +17,9 @@ GCP_SERVICE_COLLECTIONS = {
     GCPServiceType.PUBSUB_TOPIC: "gcp_pubsub",
     GCPServiceType.REDIS: "gcp_cloud_redis",
     GCPServiceType.SPANNER: "gcp_cloud_spanner",
-    GCPServiceType.FIREBASE_DATABASE: "gcp_firestore"
+    GCPServiceType.FIREBASE_DATABASE: "gcp_firestore",
+    GCPServiceType.NETWORK_INTERFACE: "gcp_vpc_networks",
+    GCPServiceType.CLOUD_ROUTERS: "gcp_cloud_routers"
 }
 
 def get_service_collection(db: AsyncIOMotorDatabase, service_type: GCPServiceType):
@@ -38,8 +41,9 @@ async def create_service_indexes(db: AsyncIOMotorDatabase):
     for service_type, collection_name in GCP_SERVICE_COLLECTIONS.items():
         collection = getattr(db, collection_name)
         
-        # Create common indexes for all service collections
-        await collection.create_index("credentials_id")
+        # Create common indexes for all service collections; the unique pair backs
+        # discovery's upserts (and serves credentials_id-only queries as a prefix)
+        await create_unique_index(collection, [("credentials_id", 1), ("resource_id", 1)])
         await collection.create_index("resource_id")
         await collection.create_index("resource_name")
         await collection.create_index("created_at")
@@ -20,10 +20,13 @@ async def lifespan(app: FastAPI):
     await init_db()
     await start_analytics_scheduler()
     await start_gcp_scheduler()
+    await diagnostics.start_check_writer()
     yield
     # Shutdown
+    await diagnostics.stop_check_writer()
     await stop_analytics_scheduler()
     await stop_gcp_scheduler()
+    await analytics.close_async_data_clients()
 
 
 app = FastAPI(
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import functools
 import json
 import secrets
+from collections import OrderedDict
 from urllib.parse import urlencode
 from bson import ObjectId
 
-from google.analytics.data import BetaAnalyticsDataClient
+from google.analytics.data import BetaAnalyticsDataClient, BetaAnalyticsDataAsyncClient
 from google.analytics.data import (
     RunReportRequest,
     BatchRunReportsRequest,
@@ -45,6 +47,7 @@ from models.analytics import (
 )
 from core.database import get_database
 from core.auth import get_current_user
+from utils.common import SERVICE_ACCOUNT_REQUIRED_FIELDS
 from models.user import UserInDB
 # Encryption removed
 from core.config import settings
@@ -58,6 +61,75 @@ ANALYTICS_SCOPES = [
 
 # OAuth URL endpoint removed - using Service Account authentication
 
+# Formatted "Xm Ys" strings for durations up to an hour, built on first use
+_DURATION_CACHE_LIMIT = 3600
+_duration_cache = {}
+_format_minutes_seconds = "{0}m {1}s".format
+
+
+def _format_duration(total_seconds: float) -> str:
+    """Format a duration in seconds as 'Xm Ys'"""
+    whole_seconds = int(total_seconds)
+    cached = _duration_cache.get(whole_seconds)
+    if cached is None:
+        cached = _format_minutes_seconds(*divmod(whole_seconds, 60))
+        if 0 <= whole_seconds < _DURATION_CACHE_LIMIT:
+            _duration_cache[whole_seconds] = cached
+    return cached
+
+
+# In-flight GA report fetches, keyed by helper name, property and date range
+_inflight_fetches = {}
+
+# Async GA Data clients, one grpc.aio channel per service account key, least recently used first
+_GA_ASYNC_CLIENT_CACHE_SIZE = 32
+_ga_async_clients: "OrderedDict[Tuple[str, str], BetaAnalyticsDataAsyncClient]" = OrderedDict()
+
+
+def _get_async_data_client(credentials: Credentials) -> BetaAnalyticsDataAsyncClient:
+    """Shared async GA Data client for the credentials' service account key"""
+    cache_key = (credentials.service_account_email, credentials.signer.key_id)
+    client = _ga_async_clients.get(cache_key)
+    if client is not None:
+        _ga_async_clients.move_to_end(cache_key)
+        return client
+    
+    client = BetaAnalyticsDataAsyncClient(credentials=credentials)
+    _ga_async_clients[cache_key] = client
+    if len(_ga_async_clients) > _GA_ASYNC_CLIENT_CACHE_SIZE:
+        # Requests that fetched the evicted client may still have RPCs in flight on its
+        # channel; it is closed by garbage collection once they release it
+        _ga_async_clients.popitem(last=False)
+    return client
+
+
+async def close_async_data_clients():
+    """Close every cached async GA Data client's channel; called on application shutdown"""
+    clients = list(_ga_async_clients.values())
+    _ga_async_clients.clear()
+    await asyncio.gather(*(client.transport.close() for client in clients), return_exceptions=True)
+
+
+def _coalesce_fetch(fetch):
+    """Share a single in-flight GA fetch between concurrent identical callers"""
+    @functools.wraps(fetch)
+    async def wrapper(credentials: Credentials, property_id: str, start_date: datetime, end_date: datetime) -> dict:
+        key = (
+            fetch.__name__,
+            property_id,
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d")
+        )
+        task = _inflight_fetches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(credentials, property_id, start_date, end_date))
+            _inflight_fetches[key] = task
+            task.add_done_callback(lambda _: _inflight_fetches.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+    return wrapper
+
+
 @router.post("/analytics/credentials", response_model=GACredentialsResponse)
 async def create_analytics_credentials(
     credentials_data: GACredentialsCreate,
@@ -73,8 +145,7 @@ async def create_analytics_credentials(
             print(f"DEBUG: Service account JSON preview: {credentials_data.service_account_json[:200]}...")
             
             service_account_info = json.loads(credentials_data.service_account_json)
-            required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email']
-            missing_fields = [field for field in required_fields if field not in service_account_info]
+            missing_fields = sorted(SERVICE_ACCOUNT_REQUIRED_FIELDS.difference(service_account_info))
             
             if missing_fields:
                 print(f"DEBUG: Missing required fields: {missing_fields}")
@@ -2894,10 +2965,12 @@ async def get_unified_reports(
         credentials = await _get_valid_credentials(property_id, current_user.id)
         
         # Fetch all report types using internal helper functions
-        audience_data = await _fetch_audience_data(credentials, property_id, start_date_obj, end_date_obj)
-        content_data = await _fetch_content_data(credentials, property_id, start_date_obj, end_date_obj)
-        acquisition_data = await _fetch_acquisition_data(credentials, property_id, start_date_obj, end_date_obj)
-        behavior_data = await _fetch_behavior_data(credentials, property_id, start_date_obj, end_date_obj)
+        audience_data, content_data, acquisition_data, behavior_data = await asyncio.gather(
+            _fetch_audience_data(credentials, property_id, start_date_obj, end_date_obj),
+            _fetch_content_data(credentials, property_id, start_date_obj, end_date_obj),
+            _fetch_acquisition_data(credentials, property_id, start_date_obj, end_date_obj),
+            _fetch_behavior_data(credentials, property_id, start_date_obj, end_date_obj)
+        )
         
         # Transform data to match frontend expectations
         unified_data = {
@@ -2930,10 +3003,11 @@ async def get_unified_reports(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch unified reports: {str(e)}")
 
+@_coalesce_fetch
 async def _fetch_audience_data(credentials: Credentials, property_id: str, start_date: datetime, end_date: datetime) -> dict:
     """Internal helper to fetch audience data"""
     try:
-        client = BetaAnalyticsDataClient(credentials=credentials)
+        client = _get_async_data_client(credentials)
         
         request = RunReportRequest(
             property=f"properties/{property_id}",
@@ -2953,7 +3027,7 @@ async def _fetch_audience_data(credentials: Credentials, property_id: str, start
             )]
         )
         
-        response = client.run_report(request)
+        response = await client.run_report(request)
         
         total_users = 0
         new_users = 0
@@ -2963,10 +3037,13 @@ async def _fetch_audience_data(credentials: Credentials, property_id: str, start
         avg_session_duration = "0s"
         pages_per_session = 0
         
+        # Each proto-plus field access wraps the repeated field again; read each row's
+        # values once and index the plain sequences
         for row in response.rows:
+            metric_values = row.metric_values
             user_type = row.dimension_values[0].value
-            users = int(row.metric_values[0].value)
-            user_sessions = int(row.metric_values[1].value)
+            users = int(metric_values[0].value)
+            user_sessions = int(metric_values[1].value)
             
             total_users += users
             sessions += user_sessions
@@ -2977,14 +3054,13 @@ async def _fetch_audience_data(credentials: Credentials, property_id: str, start
                 returning_users = users
         
         if response.rows:
-            bounce_rate = float(response.rows[0].metric_values[2].value)
-            avg_duration_seconds = float(response.rows[0].metric_values[3].value)
-            pages_per_session = float(response.rows[0].metric_values[4].value)
+            first_row_values = response.rows[0].metric_values
+            bounce_rate = float(first_row_values[2].value)
+            avg_duration_seconds = float(first_row_values[3].value)
+            pages_per_session = float(first_row_values[4].value)
             
             # Convert duration to readable format
-            minutes = int(avg_duration_seconds // 60)
-            seconds = int(avg_duration_seconds % 60)
-            avg_session_duration = f"{minutes}m {seconds}s"
+            avg_session_duration = _format_duration(avg_duration_seconds)
         
         return {
             "total_users": total_users,
@@ -3007,10 +3083,11 @@ async def _fetch_audience_data(credentials: Credentials, property_id: str, start
             "pages_per_session": 0
         }
 
+@_coalesce_fetch
 async def _fetch_content_data(credentials: Credentials, property_id: str, start_date: datetime, end_date: datetime) -> dict:
     """Internal helper to fetch content data"""
     try:
-        client = BetaAnalyticsDataClient(credentials=credentials)
+        client = _get_async_data_client(credentials)
         
         request = RunReportRequest(
             property=f"properties/{property_id}",
@@ -3031,35 +3108,28 @@ async def _fetch_content_data(credentials: Credentials, property_id: str, start_
             limit=10
         )
         
-        response = client.run_report(request)
+        response = await client.run_report(request)
         
         top_pages = []
         total_page_views = 0
         unique_page_views = 0
         
         for row in response.rows:
-            page_path = row.dimension_values[0].value
-            page_title = row.dimension_values[1].value
-            page_views = int(row.metric_values[0].value)  # screenPageViews metric
-            unique_views = int(row.metric_values[1].value)  # uniquePageViews metric
-            avg_time = float(row.metric_values[2].value)
-            bounce_rate = float(row.metric_values[3].value)
+            dimension_values = row.dimension_values
+            metric_values = row.metric_values
+            page_views = int(metric_values[0].value)  # screenPageViews metric
+            unique_views = int(metric_values[1].value)  # uniquePageViews metric
             
             total_page_views += page_views
             unique_page_views += unique_views
             
-            # Convert time to readable format
-            minutes = int(avg_time // 60)
-            seconds = int(avg_time % 60)
-            avg_time_str = f"{minutes}m {seconds}s"
-            
             top_pages.append({
-                "page_path": page_path,
-                "page_title": page_title,
+                "page_path": dimension_values[0].value,
+                "page_title": dimension_values[1].value,
                 "page_views": page_views,
                 "unique_page_views": unique_views,
-                "avg_time_on_page": avg_time_str,
-                "bounce_rate": bounce_rate
+                "avg_time_on_page": _format_duration(float(metric_values[2].value)),
+                "bounce_rate": float(metric_values[3].value)
             })
         
         return {
@@ -3075,10 +3145,11 @@ async def _fetch_content_data(credentials: Credentials, property_id: str, start_
             "unique_page_views": 0
         }
 
+@_coalesce_fetch
 async def _fetch_acquisition_data(credentials: Credentials, property_id: str, start_date: datetime, end_date: datetime) -> dict:
     """Internal helper to fetch acquisition data"""
     try:
-        client = BetaAnalyticsDataClient(credentials=credentials)
+        client = _get_async_data_client(credentials)
         
         request = RunReportRequest(
             property=f"properties/{property_id}",
@@ -3097,24 +3168,21 @@ async def _fetch_acquisition_data(credentials: Credentials, property_id: str, st
             limit=10
         )
         
-        response = client.run_report(request)
+        response = await client.run_report(request)
         
         traffic_sources = []
         total_sessions = 0
         
         for row in response.rows:
-            source = row.dimension_values[0].value
-            sessions = int(row.metric_values[0].value)
-            users = int(row.metric_values[1].value)
-            bounce_rate = float(row.metric_values[2].value)
-            
+            metric_values = row.metric_values
+            sessions = int(metric_values[0].value)
             total_sessions += sessions
             
             traffic_sources.append({
-                "source": source,
+                "source": row.dimension_values[0].value,
                 "sessions": sessions,
-                "users": users,
-                "bounce_rate": bounce_rate
+                "users": int(metric_values[1].value),
+                "bounce_rate": float(metric_values[2].value)
             })
         
         return {
@@ -3128,10 +3196,11 @@ async def _fetch_acquisition_data(credentials: Credentials, property_id: str, st
             "total_sessions": 0
         }
 
+@_coalesce_fetch
 async def _fetch_behavior_data(credentials: Credentials, property_id: str, start_date: datetime, end_date: datetime) -> dict:
     """Internal helper to fetch behavior data"""
     try:
-        client = BetaAnalyticsDataClient(credentials=credentials)
+        client = _get_async_data_client(credentials)
         
         request = RunReportRequest(
             property=f"properties/{property_id}",
@@ -3149,22 +3218,20 @@ async def _fetch_behavior_data(credentials: Credentials, property_id: str, start
             limit=10
         )
         
-        response = client.run_report(request)
+        response = await client.run_report(request)
         
         events = []
         total_events = 0
         
         for row in response.rows:
-            event_name = row.dimension_values[0].value
-            event_count = int(row.metric_values[0].value)
-            unique_users = int(row.metric_values[1].value)
-            
+            metric_values = row.metric_values
+            event_count = int(metric_values[0].value)
             total_events += event_count
             
             events.append({
-                "event_name": event_name,
+                "event_name": row.dimension_values[0].value,
                 "event_count": event_count,
-                "unique_users": unique_users
+                "unique_users": int(metric_values[1].value)
             })
         
         return {
@@ -3218,11 +3285,10 @@ async def get_stored_timeseries_data(
         
         # Query database
         cursor = db.ga_timeseries_data.find(query_filter).sort("collected_at", -1).limit(limit)
-        time_series_list = await cursor.to_list(length=limit)
         
-        # Convert to response models
+        # Convert to response models as documents stream off the cursor
         result = []
-        for ts_data in time_series_list:
+        async for ts_data in cursor:
             # Convert ObjectId to string
             if "_id" in ts_data:
                 ts_data["_id"] = str(ts_data["_id"])
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 from typing import List
+import asyncio
+import logging
 
 from core.database import get_database
 from core.auth import (
@@ -27,8 +29,24 @@ from models.user import (
 )
 from bson import ObjectId
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Strong references to fire-and-forget writes so they aren't garbage collected
+_pending_writes = set()
+
+
+def _on_write_done(task: asyncio.Task):
+    """Release a fire-and-forget write and log any failure"""
+    _pending_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background user update failed: %s", task.exception())
+
+# Fields read from user documents when listing users
+_USER_RESPONSE_FIELDS = ("name", "email", "is_active", "created_at", "updated_at")
+_USER_RESPONSE_PROJECTION = dict.fromkeys(_USER_RESPONSE_FIELDS, 1)
+
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
@@ -44,11 +62,13 @@ async def login(
             detail="Incorrect email or password"
         )
     
-    # Update last login
-    await db.users.update_one(
+    # Update last login server-side without holding up the response
+    task = asyncio.create_task(db.users.update_one(
         {"_id": ObjectId(user.id)},
-        {"$set": {"last_login": datetime.utcnow()}}
-    )
+        {"$currentDate": {"last_login": True}}
+    ))
+    _pending_writes.add(task)
+    task.add_done_callback(_on_write_done)
     
     # Create session
     session_id = create_session(user.id)
@@ -97,14 +117,14 @@ async def change_password(
 ):
     """Change user password"""
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await asyncio.to_thread(verify_password, password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Update password
-    new_hashed_password = get_password_hash(password_data.new_password)
+    new_hashed_password = await asyncio.to_thread(get_password_hash, password_data.new_password)
     await db.users.update_one(
         {"_id": ObjectId(current_user.id)},
         {
@@ -154,17 +174,14 @@ async def get_users(
     current_user: UserInDB = Depends(get_current_active_user)
 ):
     """Get list of users"""
-    cursor = db.users.find().skip(skip).limit(limit)
+    cursor = db.users.find({}, _USER_RESPONSE_PROJECTION).skip(skip).limit(limit)
     users = await cursor.to_list(length=limit)
     
+    # Stored users were validated on write; skip re-validation on read
     return [
-        UserResponse(
+        UserResponse.model_construct(
             _id=str(user["_id"]),
-            name=user["name"],
-            email=user["email"],
-            is_active=user["is_active"],
-            created_at=user["created_at"],
-            updated_at=user["updated_at"]
+            **{field: user[field] for field in _USER_RESPONSE_FIELDS}
         )
         for user in users
     ]
@@ -226,7 +243,7 @@ async def update_user(
     if user_update.is_active is not None:
         update_data["is_active"] = user_update.is_active
     if user_update.password is not None:
-        update_data["hashed_password"] = get_password_hash(user_update.password)
+        update_data["hashed_password"] = await asyncio.to_thread(get_password_hash, user_update.password)
     
     # Update user
     await db.users.update_one(
@@ -1,12 +1,115 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
+from pydantic import TypeAdapter
+import asyncio
+import functools
+import time
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timedelta
 from models.device import Device, DeviceCreate, DeviceUpdate, DeviceResponse
 from core.database import get_database
+from utils.common import document_to_response, build_aggregation_pipeline, MongoJSONResponse
 # Encryption removed
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Only the fields DeviceResponse reads are fetched for device lists
+_DEVICE_PROJECTION = {field: 1 for field in DeviceResponse.model_fields if field != "id"}
+_DEVICE_LIST_ADAPTER = TypeAdapter(List[DeviceResponse])
+
+# Constant query fragments and windows shared by every request
+_HEALTH_STALE_AFTER = timedelta(minutes=10)
+_HOURS_24 = timedelta(hours=24)
+_DAYS_7 = timedelta(days=7)
+_DAYS_30 = timedelta(days=30)
+_SORT_TIMESTAMP_DESC = {"$sort": {"timestamp": -1}}
+_ACTIVE_DEVICES_FILTER = {"is_active": True}
+_MONITORS_DOWN_FILTER = {"is_active": True, "current_status": {"$in": ["down", "degraded"]}}
+_DEVICE_ALERT_LOOKUP = [
+    {
+        "$addFields": {
+            "device_oid": {
+                "$convert": {"input": "$device_id", "to": "objectId", "onError": None, "onNull": None}
+            }
+        }
+    },
+    {
+        "$lookup": {
+            "from": "devices",
+            "localField": "device_oid",
+            "foreignField": "_id",
+            "as": "device"
+        }
+    },
+    {"$unwind": "$device"}
+]
+_UPTIME_ALERT_LOOKUP = [
+    {
+        "$lookup": {
+            "from": "uptime_monitors",
+            "localField": "monitor_id",
+            "foreignField": "_id",
+            "as": "monitor"
+        }
+    },
+    {"$unwind": "$monitor"}
+]
+
+
+# Short-lived cache for the dashboard endpoints, which UIs poll every few seconds.
+# Entries are keyed by a version that device mutations bump to invalidate them.
+_DASHBOARD_CACHE_TTL = 15
+_dashboard_cache = {}
+# In-flight refreshes, keyed like _dashboard_cache
+_dashboard_refreshes = {}
+_dashboard_cache_version = 0
+
+
+def _invalidate_dashboard_cache():
+    """Drop cached dashboard responses after a device mutation"""
+    global _dashboard_cache_version
+    _dashboard_cache_version += 1
+    _dashboard_cache.clear()
+
+
+def _dashboard_cached(handler):
+    """Serve a handler's result from the dashboard cache for a few seconds"""
+    async def refresh(key, kwargs):
+        result = await handler(**kwargs)
+        _dashboard_cache[key] = (time.monotonic() + _DASHBOARD_CACHE_TTL, result)
+        return result
+    
+    @functools.wraps(handler)
+    async def wrapper(**kwargs):
+        key = (
+            handler.__name__,
+            _dashboard_cache_version,
+            tuple(sorted((name, value) for name, value in kwargs.items() if name != "db"))
+        )
+        cached = _dashboard_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        # Let one request refresh the entry while concurrent pollers of the same key wait for it
+        task = _dashboard_refreshes.get(key)
+        if task is None:
+            task = asyncio.ensure_future(refresh(key, kwargs))
+            _dashboard_refreshes[key] = task
+            task.add_done_callback(lambda _: _dashboard_refreshes.pop(key, None))
+        # Shield so one cancelled poller doesn't cancel the refresh for the others
+        return await asyncio.shield(task)
+    return wrapper
+
+
+def _device_object_id(device_id: str) -> ObjectId:
+    """Parse the device_id path parameter, rejecting malformed IDs"""
+    try:
+        return ObjectId(device_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid device ID format")
 
 
 @router.post("/", response_model=DeviceResponse)
@@ -26,14 +129,10 @@ async def create_device(device: DeviceCreate, db=Depends(get_database)):
     
     # Insert device
     result = await db.devices.insert_one(device_dict)
+    _invalidate_dashboard_cache()
     
-    # Return created device
-    created_device = await db.devices.find_one({"_id": result.inserted_id})
-    
-    return DeviceResponse(
-        id=str(created_device["_id"]),
-        **{k: v for k, v in created_device.items() if k != "_id"}
-    )
+    # Return created device from the inserted document
+    return document_to_response(device_dict, DeviceResponse)
 
 
 @router.post("/bulk", response_model=dict)
@@ -48,42 +147,61 @@ async def create_devices_bulk(devices: List[DeviceCreate], db=Depends(get_databa
     created_devices = []
     failed_devices = []
     
+    # Look up every already-registered IP in a single query
+    ip_addresses = [device.ip_address for device in devices]
+    existing_ips = {
+        existing_device["ip_address"]
+        async for existing_device in db.devices.find(
+            {"ip_address": {"$in": ip_addresses}}, {"ip_address": 1}
+        )
+    }
+    
+    pending = []
+    seen_ips = set()
+    created_at = datetime.utcnow()
+    
     for i, device in enumerate(devices):
+        # Check if device with same IP already exists or repeats within this import
+        if device.ip_address in existing_ips or device.ip_address in seen_ips:
+            failed_devices.append({
+                "index": i,
+                "device": device.model_dump(),
+                "error": f"Device with IP address {device.ip_address} already exists"
+            })
+            continue
+        seen_ips.add(device.ip_address)
+        
+        # Store device data directly (encryption removed)
+        device_dict = device.model_dump()
+        
+        # Ensure device is active for monitoring
+        device_dict['is_active'] = True
+        device_dict['created_at'] = created_at
+        pending.append((i, device_dict))
+    
+    if pending:
+        # Insert all devices in one round trip; unordered so one failure doesn't stop the rest
+        write_errors = {}
         try:
-            # Check if device with same IP already exists
-            existing_device = await db.devices.find_one({"ip_address": device.ip_address})
-            if existing_device:
+            await db.devices.insert_many([device_dict for _, device_dict in pending], ordered=False)
+        except BulkWriteError as e:
+            write_errors = {
+                error["index"]: error.get("errmsg", "Insert failed")
+                for error in e.details.get("writeErrors", [])
+            }
+        _invalidate_dashboard_cache()
+        
+        # insert_many sets _id on each document, so no re-read is needed
+        for position, (i, device_dict) in enumerate(pending):
+            if position in write_errors:
                 failed_devices.append({
                     "index": i,
-                    "device": device.model_dump(),
-                    "error": f"Device with IP address {device.ip_address} already exists"
+                    "device": devices[i].model_dump(),
+                    "error": write_errors[position]
                 })
                 continue
             
-            # Store device data directly (encryption removed)
-            device_dict = device.model_dump()
-            
-            # Ensure device is active for monitoring
-            device_dict['is_active'] = True
-            device_dict['created_at'] = datetime.utcnow()
-            
-            # Insert device
-            result = await db.devices.insert_one(device_dict)
-            
-            # Get created device
-            created_device = await db.devices.find_one({"_id": result.inserted_id})
-            
-            created_devices.append(DeviceResponse(
-                id=str(created_device["_id"]),
-                **{k: v for k, v in created_device.items() if k != "_id"}
-            ))
-            
-        except Exception as e:
-            failed_devices.append({
-                "index": i,
-                "device": device.model_dump(),
-                "error": str(e)
-            })
+            created_devices.append(document_to_response(device_dict, DeviceResponse))
     
     return {
         "message": f"Bulk import completed. {len(created_devices)} devices created, {len(failed_devices)} failed.",
@@ -99,148 +217,179 @@ async def get_devices(
     skip: int = 0,
     limit: int = 100,
     device_type: Optional[str] = None,
+    after_id: Optional[str] = None,
     db=Depends(get_database)
 ):
-    """Get all devices with optional filtering"""
+    """Get all devices with optional filtering.
+    
+    Pass the X-Next-Cursor header of a page as after_id to fetch the next one;
+    skip is still honoured when after_id is not given.
+    """
     query = {}
     if device_type:
         query["device_type"] = device_type
     
-    cursor = db.devices.find(query).skip(skip).limit(limit)
-    devices = await cursor.to_list(length=limit)
+    if after_id:
+        try:
+            query["_id"] = {"$gt": ObjectId(after_id)}
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid after_id format")
+    
+    cursor = db.devices.find(query, _DEVICE_PROJECTION).sort("_id", 1)
+    if not after_id:
+        cursor = cursor.skip(skip)
+    devices = await cursor.limit(limit).to_list(length=limit)
+    
+    headers = {}
+    if devices and len(devices) == limit:
+        headers["X-Next-Cursor"] = str(devices[-1]["_id"])
     
     # Return devices directly (encryption removed)
     result = []
     
     for device in devices:
-        result.append(DeviceResponse(
-            id=str(device["_id"]),
-            **{k: v for k, v in device.items() if k != "_id"}
-        ))
+        result.append(document_to_response(device, DeviceResponse))
     
-    return result
+    # Serialize the whole page with one adapter instead of FastAPI re-validating each item
+    return ORJSONResponse(_DEVICE_LIST_ADAPTER.dump_python(result, mode="json"), headers=headers)
 
 
 @router.get("/{device_id}", response_model=DeviceResponse)
-async def get_device(device_id: str, db=Depends(get_database)):
+async def get_device(object_id: ObjectId = Depends(_device_object_id), db=Depends(get_database)):
     """Get a specific device by ID"""
-    try:
-        object_id = ObjectId(device_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid device ID format")
-    
     device = await db.devices.find_one({"_id": object_id})
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
     # Return device directly (encryption removed)
-    return DeviceResponse(
-        id=str(device["_id"]),
-        **{k: v for k, v in device.items() if k != "_id"}
-    )
+    return document_to_response(device, DeviceResponse)
 
 
 @router.put("/{device_id}", response_model=DeviceResponse)
-async def update_device(device_id: str, device_update: DeviceUpdate, db=Depends(get_database)):
+async def update_device(
+    device_update: DeviceUpdate,
+    object_id: ObjectId = Depends(_device_object_id),
+    db=Depends(get_database)
+):
     """Update a device"""
-    try:
-        object_id = ObjectId(device_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid device ID format")
-    
-    # Check if device exists
-    existing_device = await db.devices.find_one({"_id": object_id})
-    if not existing_device:
-        raise HTTPException(status_code=404, detail="Device not found")
-    
     # Prepare update data
     update_data = device_update.model_dump(exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    # Update device directly (encryption removed)
-    await db.devices.update_one(
+    # Update device directly (encryption removed) and return the updated document
+    updated_device = await db.devices.find_one_and_update(
         {"_id": object_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
     )
+    if not updated_device:
+        raise HTTPException(status_code=404, detail="Device not found")
+    _invalidate_dashboard_cache()
     
-    # Return updated device
-    updated_device = await db.devices.find_one({"_id": object_id})
-    
-    return DeviceResponse(
-        id=str(updated_device["_id"]),
-        **{k: v for k, v in updated_device.items() if k != "_id"}
-    )
+    return document_to_response(updated_device, DeviceResponse)
 
 
 @router.delete("/{device_id}")
-async def delete_device(device_id: str, db=Depends(get_database)):
+async def delete_device(
+    device_id: str,
+    object_id: ObjectId = Depends(_device_object_id),
+    db=Depends(get_database)
+):
     """Delete a device"""
-    try:
-        object_id = ObjectId(device_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid device ID format")
-    
     # Check if device exists
     device = await db.devices.find_one({"_id": object_id})
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
-    # Delete device
-    await db.devices.delete_one({"_id": object_id})
-    
-    # Also delete related interface history
-    await db.interface_history.delete_many({"device_id": device_id})
+    # Delete device and its related interface history together
+    await asyncio.gather(
+        db.devices.delete_one({"_id": object_id}),
+        db.interface_history.delete_many({"device_id": device_id})
+    )
+    _invalidate_dashboard_cache()
     
     return {"message": "Device deleted successfully"}
 
 
 @router.get("/{device_id}/interfaces")
-async def get_device_interfaces(device_id: str, db=Depends(get_database)):
+async def get_device_interfaces(
+    device_id: str,
+    object_id: ObjectId = Depends(_device_object_id),
+    db=Depends(get_database)
+):
     """Get current interface status for a device"""
-    try:
-        object_id = ObjectId(device_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid device ID format")
-    
     # Check if device exists
     device = await db.devices.find_one({"_id": object_id})
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
-    # Get latest interface data
-    interfaces = await db.interface_history.find(
-        {"device_id": device_id}
-    ).sort("timestamp", -1).limit(50).to_list(length=50)
-    
-    # Convert ObjectId to string for JSON serialization
-    for interface in interfaces:
-        if "_id" in interface:
-            interface["_id"] = str(interface["_id"])
+    # Latest entry per interface; uses the (device_id, timestamp) index
+    pipeline = build_aggregation_pipeline(
+        {"device_id": device_id},
+        group_by_field="interface_index",
+        sort_field="timestamp"
+    )
+    interfaces = await db.interface_history.aggregate(pipeline).to_list(length=None)
     
-    return interfaces
+    return MongoJSONResponse(interfaces)
 
 
 @router.get("/{device_id}/health")
-async def get_device_health(device_id: str, db=Depends(get_database)):
+async def get_device_health(
+    device_id: str,
+    object_id: ObjectId = Depends(_device_object_id),
+    db=Depends(get_database)
+):
     """Get current health status for a device"""
-    try:
-        object_id = ObjectId(device_id)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid device ID format")
-    
     # Check if device exists
     device = await db.devices.find_one({"_id": object_id})
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
-    # Get latest health data
-    health_data = await db.device_health.find_one(
-        {"device_id": device_id},
-        sort=[("timestamp", -1)]
-    )
+    # Get latest health data with status and derived usage fields computed server-side
+    cutoff = datetime.utcnow() - _HEALTH_STALE_AFTER
+    pipeline = [
+        {"$match": {"device_id": device_id}},
+        _SORT_TIMESTAMP_DESC,
+        {"$limit": 1},
+        {
+            "$addFields": {
+                # Convert ObjectId to string for JSON serialization
+                "_id": {"$toString": "$_id"},
+                # Reachability wins; otherwise fall back to whether data is recent
+                "status": {
+                    "$switch": {
+                        "branches": [
+                            {"case": {"$eq": ["$is_reachable", True]}, "then": "online"},
+                            {"case": {"$eq": ["$is_reachable", False]}, "then": "offline"},
+                            {"case": {"$gte": ["$timestamp", cutoff]}, "then": "online"}
+                        ],
+                        "default": "offline"
+                    }
+                },
+                # Map CPU fields for frontend compatibility
+                "cpu_usage": {
+                    "$cond": [
+                        {"$and": ["$cpu_load_1min", {"$not": ["$cpu_usage"]}]},
+                        "$cpu_load_1min",
+                        "$cpu_usage"
+                    ]
+                },
+                # Calculate memory usage percentage if not available
+                "memory_usage": {
+                    "$cond": [
+                        {"$and": ["$memory_total", "$memory_used", {"$not": ["$memory_usage"]}]},
+                        {"$multiply": [{"$divide": ["$memory_used", "$memory_total"]}, 100]},
+                        "$memory_usage"
+                    ]
+                }
+            }
+        }
+    ]
+    health_results = await db.device_health.aggregate(pipeline).to_list(length=1)
     
-    if not health_data:
+    if not health_results:
         return {
             "message": "No health data available",
             "status": "offline",
@@ -248,98 +397,78 @@ async def get_device_health(device_id: str, db=Depends(get_database)):
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    # Convert ObjectId to string for JSON serialization
-    if "_id" in health_data:
-        health_data["_id"] = str(health_data["_id"])
-    
-    # Determine device status based on health data
-    is_reachable = health_data.get("is_reachable")
-    if is_reachable is True:
-        status = "online"
-    elif is_reachable is False:
-        status = "offline"
-    else:
-        # Fallback: check if we have recent data (within last 10 minutes)
-        timestamp = health_data.get("timestamp")
-        if timestamp:
-            time_diff = datetime.utcnow() - timestamp
-            if time_diff.total_seconds() < 600:  # 10 minutes
-                status = "online"
-            else:
-                status = "offline"
-        else:
-            status = "offline"
-    
-    # Add status to health data
-    health_data["status"] = status
-    
-    # Map CPU fields for frontend compatibility
-    if health_data.get("cpu_load_1min") and not health_data.get("cpu_usage"):
-        health_data["cpu_usage"] = health_data.get("cpu_load_1min")
-    
-    # Calculate memory usage percentage if not available
-    if health_data.get("memory_total") and health_data.get("memory_used") and not health_data.get("memory_usage"):
-        memory_total = health_data["memory_total"]
-        memory_used = health_data["memory_used"]
-        health_data["memory_usage"] = (memory_used / memory_total * 100) if memory_total > 0 else 0
-    
-    return health_data
+    return health_results[0]
 
 
 @router.get("/dashboard/stats")
+@_dashboard_cached
 async def get_dashboard_stats(db=Depends(get_database)):
     """Get aggregated dashboard statistics"""
     try:
-        # Get device statistics
-        total_devices = await db.devices.count_documents({})
-        active_devices = await db.devices.count_documents({"is_active": True})
-        devices_down = total_devices - active_devices
-        
-        # Get SSL statistics
-        total_ssl_checks = await db.ssl_checks.count_documents({})
+        now = datetime.utcnow()
+        thirty_days_from_now = now + _DAYS_30
+        thirty_days_ago = now - _DAYS_30
         
-        # SSL certificates expiring in next 30 days
-        thirty_days_from_now = datetime.utcnow() + timedelta(days=30)
-        ssl_expiring_soon = await db.ssl_checks.count_documents({
-            "expires_at": {"$lte": thirty_days_from_now, "$gte": datetime.utcnow()}
-        })
-        
-        # SSL certificates already expired
-        ssl_expired = await db.ssl_checks.count_documents({
-            "expires_at": {"$lt": datetime.utcnow()}
-        })
-        
-        # Get uptime statistics
-        total_uptime_checks = await db.uptime_monitors.count_documents({})
-        
-        # Get monitors that are currently down
-        uptime_checks_down = await db.uptime_monitors.count_documents({
-            "is_active": True,
-            "current_status": {"$in": ["down", "degraded"]}
-        })
+        # SSL certificates expiring in next 30 days and already expired in one pass;
+        # the leading $match uses the expires_at index, which $facet cannot do itself
+        ssl_pipeline = [
+            {"$match": {"expires_at": {"$lte": thirty_days_from_now}}},
+            {
+                "$facet": {
+                    "expiring_soon": [
+                        {"$match": {"expires_at": {"$lte": thirty_days_from_now, "$gte": now}}},
+                        {"$count": "n"}
+                    ],
+                    "expired": [
+                        {"$match": {"expires_at": {"$lt": now}}},
+                        {"$count": "n"}
+                    ]
+                }
+            }
+        ]
         
-        # Calculate average uptime percentage (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        # Calculate average uptime percentage (last 30 days) from the hourly rollup
         uptime_pipeline = [
             {
                 "$match": {
-                    "checked_at": {"$gte": thirty_days_ago}
+                    "hour": {"$gte": thirty_days_ago.replace(minute=0, second=0, microsecond=0)}
                 }
             },
             {
                 "$group": {
                     "_id": None,
-                    "total_checks": {"$sum": 1},
-                    "successful_checks": {
-                        "$sum": {
-                            "$cond": [{"$eq": ["$status", "up"]}, 1, 0]
-                        }
-                    }
+                    "total_checks": {"$sum": "$total"},
+                    "successful_checks": {"$sum": "$successful"}
                 }
             }
         ]
         
-        uptime_result = await db.uptime_check_results.aggregate(uptime_pipeline).to_list(length=1)
+        # Run all independent queries concurrently
+        (
+            total_devices,
+            active_devices,
+            total_ssl_checks,
+            ssl_result,
+            total_uptime_checks,
+            uptime_checks_down,
+            uptime_result
+        ) = await asyncio.gather(
+            db.devices.estimated_document_count(),
+            db.devices.count_documents(_ACTIVE_DEVICES_FILTER),
+            db.ssl_checks.estimated_document_count(),
+            db.ssl_checks.aggregate(ssl_pipeline).to_list(length=1),
+            db.uptime_monitors.estimated_document_count(),
+            # Monitors that are currently down
+            db.uptime_monitors.count_documents(_MONITORS_DOWN_FILTER),
+            db.uptime_rollup_hourly.aggregate(uptime_pipeline).to_list(length=1)
+        )
+        devices_down = total_devices - active_devices
+        
+        ssl_counts = ssl_result[0] if ssl_result else {}
+        ssl_expiring_soon, ssl_expired = (
+            ssl_counts[facet][0]["n"] if ssl_counts.get(facet) else 0
+            for facet in ("expiring_soon", "expired")
+        )
         
         if uptime_result and uptime_result[0]["total_checks"] > 0:
             avg_uptime_percentage = round(
@@ -365,63 +494,81 @@ async def get_dashboard_stats(db=Depends(get_database)):
 
 
 @router.get("/alerts/recent")
+@_dashboard_cached
 async def get_recent_alerts(limit: int = 10, db=Depends(get_database)):
     """Get recent alerts from various monitoring sources"""
     try:
         alerts = []
+        now = datetime.utcnow()
         
-        # Get recent device alerts (devices that went offline)
-        recent_device_alerts = await db.device_health.find({
-            "status": "offline",
-            "timestamp": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-        }).sort("timestamp", -1).limit(5).to_list(length=5)
+        # Get recent device alerts (devices that went offline) joined with their device
+        device_alerts_pipeline = [
+            {
+                "$match": {
+                    "status": "offline",
+                    "timestamp": {"$gte": now - _HOURS_24}
+                }
+            },
+            _SORT_TIMESTAMP_DESC,
+            {"$limit": 5},
+            *_DEVICE_ALERT_LOOKUP
+        ]
+        recent_device_alerts = await db.device_health.aggregate(device_alerts_pipeline).to_list(length=5)
         
         for alert in recent_device_alerts:
-            device = await db.devices.find_one({"_id": ObjectId(alert["device_id"])})
+            device = alert["device"]
             if device:
                 alerts.append({
                     "id": str(alert["_id"]),
                     "type": "error",
                     "title": f"Device Offline: {device['name']}",
                     "message": f"Device {device['name']} ({device['ip_address']}) is not responding",
-                    "timestamp": alert["timestamp"].isoformat(),
+                    "timestamp": alert["timestamp"],
                     "source": "device_monitoring"
                 })
         
         # Get SSL certificate alerts (expiring soon)
         expiring_ssl = await db.ssl_checks.find({
             "expires_at": {
-                "$lte": datetime.utcnow() + timedelta(days=7),
-                "$gte": datetime.utcnow()
+                "$lte": now + _DAYS_7,
+                "$gte": now
             }
         }).sort("expires_at", 1).limit(3).to_list(length=3)
         
         for ssl in expiring_ssl:
-            days_until_expiry = (ssl["expires_at"] - datetime.utcnow()).days
+            days_until_expiry = (ssl["expires_at"] - now).days
             alerts.append({
                 "id": str(ssl["_id"]),
                 "type": "warning",
                 "title": f"SSL Certificate Expiring Soon",
                 "message": f"SSL certificate for {ssl['domain']} expires in {days_until_expiry} days",
-                "timestamp": ssl.get("last_checked", datetime.utcnow()).isoformat(),
+                "timestamp": ssl.get("last_checked", now),
                 "source": "ssl_monitoring"
             })
         
-        # Get uptime alerts (recent downtime)
-        recent_uptime_alerts = await db.uptime_check_results.find({
-            "status": {"$in": ["down", "degraded"]},
-            "checked_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-        }).sort("checked_at", -1).limit(3).to_list(length=3)
+        # Get uptime alerts (recent downtime) joined with their monitor
+        uptime_alerts_pipeline = [
+            {
+                "$match": {
+                    "status": {"$in": ["down", "degraded"]},
+                    "checked_at": {"$gte": now - _HOURS_24}
+                }
+            },
+            {"$sort": {"checked_at": -1}},
+            {"$limit": 3},
+            *_UPTIME_ALERT_LOOKUP
+        ]
+        recent_uptime_alerts = await db.uptime_check_results.aggregate(uptime_alerts_pipeline).to_list(length=3)
         
         for alert in recent_uptime_alerts:
-            monitor = await db.uptime_monitors.find_one({"_id": ObjectId(alert["monitor_id"])})
+            monitor = alert["monitor"]
             if monitor:
                 alerts.append({
                     "id": str(alert["_id"]),
                     "type": "error" if alert["status"] == "down" else "warning",
                     "title": f"Uptime Check Failed: {monitor['name']}",
                     "message": f"Monitor {monitor['name']} ({monitor['url']}) is {alert['status']}",
-                    "timestamp": alert["checked_at"].isoformat(),
+                    "timestamp": alert["checked_at"],
                     "source": "uptime_monitoring"
                 })
         
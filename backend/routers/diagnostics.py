@@ -1,41 +1,209 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
+from pydantic import TypeAdapter
+import asyncio
+import logging
 from datetime import datetime, timedelta
-from models.diagnostics import UptimeCheck, UptimeCheckCreate, UptimeCheckResponse
+from bson import ObjectId
+from models.diagnostics import UptimeCheck, UptimeCheckCreate, UptimeCheckResponse, CheckType
 from core.database import get_database
+from utils.common import document_to_response
 from services.network_diagnostics import NetworkDiagnostics
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
 network_diagnostics = NetworkDiagnostics()
 
+# Only the fields UptimeCheckResponse reads are fetched for check lists
+_UPTIME_CHECK_PROJECTION = {field: 1 for field in UptimeCheckResponse.model_fields if field != "id"}
+_UPTIME_CHECK_LIST_ADAPTER = TypeAdapter(List[UptimeCheckResponse])
+
+# Newest-first order for check lists, with _id breaking timestamp ties
+_SORT_NEWEST_FIRST = [("timestamp", -1), ("_id", -1)]
+
+# Reduces a target's checks to totals; response times only count for successful checks
+_HAS_RESPONSE_TIME = {"$and": ["$is_up", {"$ne": ["$response_time", None]}]}
+_UPTIME_STATS_GROUP = {
+    "$group": {
+        "_id": None,
+        "total_checks": {"$sum": 1},
+        "successful_checks": {"$sum": {"$cond": ["$is_up", 1, 0]}},
+        "response_time_sum": {"$sum": {"$cond": [_HAS_RESPONSE_TIME, "$response_time", 0]}},
+        "response_time_count": {"$sum": {"$cond": [_HAS_RESPONSE_TIME, 1, 0]}},
+        "last_check": {"$max": "$timestamp"}
+    }
+}
+
+# Upper bound on checks in flight at once for a bulk request
+_BULK_CHECK_CONCURRENCY = 64
+
+
+async def _run_ping_check(uptime_check: UptimeCheckCreate) -> dict:
+    """Ping a host and build its uptime check record"""
+    ping_result = await network_diagnostics.ping_host(
+        uptime_check.target,
+        uptime_check.timeout or 5
+    )
+    
+    return {
+        "target": uptime_check.target,
+        "check_type": "ping",
+        "timestamp": datetime.utcnow(),
+        "is_up": ping_result["is_up"],
+        "response_time": ping_result["response_time"],
+        "packet_loss": ping_result.get("packet_loss", 0),
+        "error_message": ping_result.get("error_message")
+    }
+
+
+async def _run_http_check(uptime_check: UptimeCheckCreate) -> dict:
+    """Run an HTTP/HTTPS check and build its uptime check record"""
+    http_result = await network_diagnostics.http_check(
+        uptime_check.target,
+        uptime_check.timeout or 10,
+        uptime_check.expected_status_code or 200
+    )
+    
+    return {
+        "target": uptime_check.target,
+        "check_type": "http",
+        "timestamp": datetime.utcnow(),
+        "is_up": http_result["is_up"],
+        "response_time": http_result["response_time"],
+        "status_code": http_result.get("status_code"),
+        "error_message": http_result.get("error_message")
+    }
+
+
+async def _run_port_check(uptime_check: UptimeCheckCreate) -> dict:
+    """Run a TCP port check and build its uptime check record"""
+    if not uptime_check.port:
+        raise ValueError("Port is required for port check")
+    
+    port_result = await network_diagnostics.port_check(
+        uptime_check.target,
+        uptime_check.port,
+        uptime_check.timeout or 5
+    )
+    
+    return {
+        "target": uptime_check.target,
+        "port": uptime_check.port,
+        "check_type": "port",
+        "timestamp": datetime.utcnow(),
+        "is_up": port_result["is_up"],
+        "response_time": port_result["response_time"],
+        "error_message": port_result.get("error_message")
+    }
+
+
+# Write-behind buffer for single check results: flushed with insert_many when
+# a batch fills up or its oldest entry has waited the flush interval
+_WRITE_BATCH_SIZE = 500
+_WRITE_FLUSH_INTERVAL = 0.1
+_write_queue: Optional[asyncio.Queue] = None
+_flusher_task: Optional[asyncio.Task] = None
+
+
+async def _insert_uptime_checks(batch: List[dict]):
+    """Persist a batch of buffered uptime checks"""
+    try:
+        db = await get_database()
+        await db.uptime_checks.insert_many(batch, ordered=False)
+    except Exception as e:
+        logger.error(f"Failed to persist {len(batch)} buffered uptime checks: {str(e)}")
+
+
+async def _flush_uptime_checks():
+    """Drain the write queue in batches until cancelled, then flush what is left"""
+    loop = asyncio.get_running_loop()
+    batch = []
+    try:
+        while True:
+            batch.append(await _write_queue.get())
+            deadline = loop.time() + _WRITE_FLUSH_INTERVAL
+            while len(batch) < _WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Keep the batch until it is written so a cancelled insert is retried below;
+            # documents carry their _id, so ones already stored are rejected, not duplicated
+            await _insert_uptime_checks(batch)
+            batch = []
+    finally:
+        while not _write_queue.empty():
+            batch.append(_write_queue.get_nowait())
+        if batch:
+            await _insert_uptime_checks(batch)
+
+
+async def start_check_writer():
+    """Start the background writer for single check results"""
+    global _write_queue, _flusher_task
+    if _flusher_task is not None:
+        return
+    # Bounded so a stalled database applies backpressure instead of growing memory
+    _write_queue = asyncio.Queue(maxsize=_WRITE_BATCH_SIZE * 10)
+    _flusher_task = asyncio.create_task(_flush_uptime_checks())
+
+
+async def stop_check_writer():
+    """Stop the background writer, flushing any buffered check results"""
+    global _flusher_task
+    if _flusher_task is None:
+        return
+    _flusher_task.cancel()
+    try:
+        await _flusher_task
+    except asyncio.CancelledError:
+        pass
+    _flusher_task = None
+    
+    # A writer cancelled before it first ran never reached its own drain
+    remaining = []
+    while not _write_queue.empty():
+        remaining.append(_write_queue.get_nowait())
+    if remaining:
+        await _insert_uptime_checks(remaining)
+
+
+async def _save_uptime_check(check_data: dict, db) -> UptimeCheckResponse:
+    """Queue a check result for write-behind and build its response.
+    
+    The ObjectId is generated client-side so the response carries the id the
+    document will be stored under; falls back to a direct insert when the
+    writer is not running.
+    """
+    check_id = ObjectId()
+    document = {"_id": check_id, **check_data}
+    if _flusher_task is None:
+        await db.uptime_checks.insert_one(document)
+    else:
+        await _write_queue.put(document)
+    
+    return UptimeCheckResponse(id=str(check_id), **check_data)
+
+
+_CHECK_RUNNERS = {
+    CheckType.PING: _run_ping_check,
+    CheckType.HTTP: _run_http_check,
+    CheckType.HTTPS: _run_http_check,
+    CheckType.PORT: _run_port_check
+}
+
 
 @router.post("/ping", response_model=UptimeCheckResponse)
 async def ping_host(uptime_check: UptimeCheckCreate, db=Depends(get_database)):
     """Perform a ping test to a host"""
     try:
-        ping_result = await network_diagnostics.ping_host(
-            uptime_check.target,
-            uptime_check.timeout or 5
-        )
-        
-        # Create uptime check record
-        check_data = {
-            "target": uptime_check.target,
-            "check_type": "ping",
-            "timestamp": datetime.utcnow(),
-            "is_up": ping_result["is_up"],
-            "response_time": ping_result["response_time"],
-            "packet_loss": ping_result.get("packet_loss", 0),
-            "error_message": ping_result.get("error_message")
-        }
-        
-        # Insert into database
-        result = await db.uptime_checks.insert_one(check_data)
-        
-        return UptimeCheckResponse(
-            id=str(result.inserted_id),
-            **check_data
-        )
+        check_data = await _run_ping_check(uptime_check)
+        return await _save_uptime_check(check_data, db)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Ping failed: {str(e)}")
@@ -45,30 +213,8 @@ async def ping_host(uptime_check: UptimeCheckCreate, db=Depends(get_database)):
 async def http_check(uptime_check: UptimeCheckCreate, db=Depends(get_database)):
     """Perform an HTTP/HTTPS check"""
     try:
-        http_result = await network_diagnostics.http_check(
-            uptime_check.target,
-            uptime_check.timeout or 10,
-            uptime_check.expected_status_code or 200
-        )
-        
-        # Create uptime check record
-        check_data = {
-            "target": uptime_check.target,
-            "check_type": "http",
-            "timestamp": datetime.utcnow(),
-            "is_up": http_result["is_up"],
-            "response_time": http_result["response_time"],
-            "status_code": http_result.get("status_code"),
-            "error_message": http_result.get("error_message")
-        }
-        
-        # Insert into database
-        result = await db.uptime_checks.insert_one(check_data)
-        
-        return UptimeCheckResponse(
-            id=str(result.inserted_id),
-            **check_data
-        )
+        check_data = await _run_http_check(uptime_check)
+        return await _save_uptime_check(check_data, db)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"HTTP check failed: {str(e)}")
@@ -81,35 +227,61 @@ async def port_check(uptime_check: UptimeCheckCreate, db=Depends(get_database)):
         raise HTTPException(status_code=400, detail="Port is required for port check")
     
     try:
-        port_result = await network_diagnostics.port_check(
-            uptime_check.target,
-            uptime_check.port,
-            uptime_check.timeout or 5
-        )
-        
-        # Create uptime check record
-        check_data = {
-            "target": uptime_check.target,
-            "port": uptime_check.port,
-            "check_type": "port",
-            "timestamp": datetime.utcnow(),
-            "is_up": port_result["is_up"],
-            "response_time": port_result["response_time"],
-            "error_message": port_result.get("error_message")
-        }
-        
-        # Insert into database
-        result = await db.uptime_checks.insert_one(check_data)
-        
-        return UptimeCheckResponse(
-            id=str(result.inserted_id),
-            **check_data
-        )
+        check_data = await _run_port_check(uptime_check)
+        return await _save_uptime_check(check_data, db)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Port check failed: {str(e)}")
 
 
+@router.post("/bulk", response_model=dict)
+async def bulk_check(uptime_checks: List[UptimeCheckCreate], db=Depends(get_database)):
+    """Run multiple ping/HTTP/port checks concurrently"""
+    if not uptime_checks:
+        raise HTTPException(status_code=400, detail="No checks provided")
+    
+    if len(uptime_checks) > 100:
+        raise HTTPException(status_code=400, detail="Maximum 100 checks allowed per bulk request")
+    
+    semaphore = asyncio.Semaphore(_BULK_CHECK_CONCURRENCY)
+    
+    async def run_one(uptime_check: UptimeCheckCreate) -> dict:
+        runner = _CHECK_RUNNERS.get(uptime_check.check_type or CheckType.PING)
+        if runner is None:
+            raise ValueError(f"Unsupported check type: {uptime_check.check_type.value}")
+        async with semaphore:
+            return await runner(uptime_check)
+    
+    results = await asyncio.gather(
+        *(run_one(uptime_check) for uptime_check in uptime_checks),
+        return_exceptions=True
+    )
+    
+    completed = []
+    failed_checks = []
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            failed_checks.append({
+                "index": i,
+                "check": uptime_checks[i].model_dump(),
+                "error": str(result)
+            })
+        else:
+            completed.append(result)
+    
+    # Persist every completed check in one round trip; insert_many sets _id on each
+    if completed:
+        await db.uptime_checks.insert_many(completed, ordered=False)
+    
+    return {
+        "message": f"Bulk check completed. {len(completed)} checks completed, {len(failed_checks)} failed.",
+        "completed_count": len(completed),
+        "failed_count": len(failed_checks),
+        "results": [document_to_response(check_data, UptimeCheckResponse) for check_data in completed],
+        "failed_checks": failed_checks
+    }
+
+
 @router.get("/", response_model=List[UptimeCheckResponse])
 async def get_uptime_checks(
     skip: int = 0,
@@ -117,9 +289,14 @@ async def get_uptime_checks(
     target: Optional[str] = None,
     check_type: Optional[str] = None,
     days: Optional[int] = 7,
+    after_id: Optional[str] = None,
     db=Depends(get_database)
 ):
-    """Get uptime checks with optional filtering"""
+    """Get uptime checks with optional filtering.
+    
+    Pass the X-Next-Cursor header of a page as after_id to fetch the next one;
+    skip is still honoured when after_id is not given.
+    """
     query = {}
     
     if target:
@@ -132,16 +309,41 @@ async def get_uptime_checks(
         since_date = datetime.utcnow() - timedelta(days=days)
         query["timestamp"] = {"$gte": since_date}
     
-    cursor = db.uptime_checks.find(query).sort("timestamp", -1).skip(skip).limit(limit)
-    uptime_checks = await cursor.to_list(length=limit)
+    if after_id:
+        try:
+            after_oid = ObjectId(after_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid after_id format")
+        
+        anchor = await db.uptime_checks.find_one({"_id": after_oid}, {"timestamp": 1})
+        if not anchor:
+            raise HTTPException(status_code=400, detail="Unknown after_id")
+        
+        # Continue after the anchor in (timestamp, _id) order so equal timestamps aren't skipped
+        query = {
+            "$and": [
+                query,
+                {
+                    "$or": [
+                        {"timestamp": {"$lt": anchor["timestamp"]}},
+                        {"timestamp": anchor["timestamp"], "_id": {"$lt": after_oid}}
+                    ]
+                }
+            ]
+        }
+    
+    cursor = db.uptime_checks.find(query, _UPTIME_CHECK_PROJECTION).sort(_SORT_NEWEST_FIRST)
+    if not after_id:
+        cursor = cursor.skip(skip)
+    uptime_checks = await cursor.limit(limit).to_list(length=limit)
+    
+    headers = {}
+    if uptime_checks and len(uptime_checks) == limit:
+        headers["X-Next-Cursor"] = str(uptime_checks[-1]["_id"])
     
-    return [
-        UptimeCheckResponse(
-            id=str(check["_id"]),
-            **{k: v for k, v in check.items() if k != "_id"}
-        )
-        for check in uptime_checks
-    ]
+    # Serialize the whole page with one adapter instead of FastAPI re-validating each item
+    checks = [document_to_response(check, UptimeCheckResponse) for check in uptime_checks]
+    return ORJSONResponse(_UPTIME_CHECK_LIST_ADAPTER.dump_python(checks, mode="json"), headers=headers)
 
 
 @router.get("/{target}/uptime")
@@ -157,25 +359,23 @@ async def get_uptime_stats(
         since_date = datetime.utcnow() - timedelta(days=days)
         query["timestamp"] = {"$gte": since_date}
     
-    # Get all checks for the target
-    checks = await db.uptime_checks.find(query).to_list(length=None)
+    # Reduce all checks for the target server-side
+    pipeline = [{"$match": query}, _UPTIME_STATS_GROUP]
+    stats = await db.uptime_checks.aggregate(pipeline).to_list(length=1)
     
-    if not checks:
+    if not stats:
         raise HTTPException(status_code=404, detail="No uptime data found for this target")
     
     # Calculate statistics
-    total_checks = len(checks)
-    successful_checks = sum(1 for check in checks if check["is_up"])
+    stats = stats[0]
+    total_checks = stats["total_checks"]
+    successful_checks = stats["successful_checks"]
     uptime_percentage = (successful_checks / total_checks) * 100 if total_checks > 0 else 0
     
     # Calculate average response time for successful checks
-    successful_response_times = [
-        check["response_time"] for check in checks 
-        if check["is_up"] and check["response_time"] is not None
-    ]
     avg_response_time = (
-        sum(successful_response_times) / len(successful_response_times)
-        if successful_response_times else None
+        stats["response_time_sum"] / stats["response_time_count"]
+        if stats["response_time_count"] else None
     )
     
     return {
@@ -186,7 +386,7 @@ async def get_uptime_stats(
         "failed_checks": total_checks - successful_checks,
         "uptime_percentage": round(uptime_percentage, 2),
         "average_response_time": round(avg_response_time, 2) if avg_response_time else None,
-        "last_check": max(checks, key=lambda x: x["timestamp"])["timestamp"] if checks else None
+        "last_check": stats["last_check"]
     }
 
 
@@ -1,20 +1,38 @@
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form, Depends
-from typing import Dict, List, Any, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, List, Any, Optional, Union
 from services.firebase_service import firebase_analytics_service
 from core.database import get_database
+from core.config import settings
+from utils.common import document_to_response, SERVICE_ACCOUNT_REQUIRED_FIELDS
 from models.analytics import GACredentials, GACredentialsCreate, GACredentialsResponse
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
+import asyncio
 import logging
-import json
+import orjson
 import os
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Service account key files are ~2-3 KB; anything far larger is not one
+_MAX_SERVICE_ACCOUNT_FILE_SIZE = 32 * 1024
+_UPLOAD_CHUNK_SIZE = 8 * 1024
+
+# Credentials managed through this router are not tied to a portal user
+_FIREBASE_CREDENTIALS_USER = "default"
+
+# Only the fields GACredentialsResponse reads; never load the stored private key for listings
+_CREDENTIALS_PROJECTION = {field: 1 for field in GACredentialsResponse.model_fields if field != "id"}
+
 router = APIRouter(
     prefix="/firebase-analytics",
-    tags=["Firebase Analytics"]
+    tags=["Firebase Analytics"],
+    default_response_class=ORJSONResponse
 )
 
 @router.get("/status")
@@ -29,8 +47,8 @@ async def get_connection_status(db=Depends(get_database)) -> Dict[str, Any]:
             "status": "Connected to Firebase Analytics" if is_connected else "Not connected to Firebase Analytics",
             "service": "Firebase Analytics"
         }
-    except Exception as e:
-        logger.error(f"Error checking Firebase Analytics status: {str(e)}")
+    except Exception:
+        logger.exception("Error checking Firebase Analytics status")
         raise HTTPException(status_code=500, detail="Failed to check connection status")
 
 @router.get("/overview")
@@ -49,8 +67,8 @@ async def get_overview_metrics(
             "period_days": days,
             "connected": firebase_analytics_service.is_connected()
         }
-    except Exception as e:
-        logger.error(f"Error fetching overview metrics: {str(e)}")
+    except Exception:
+        logger.exception("Error fetching overview metrics")
         raise HTTPException(status_code=500, detail="Failed to fetch overview metrics")
 
 @router.get("/top-pages")
@@ -71,8 +89,8 @@ async def get_top_pages(
             "limit": limit,
             "connected": firebase_analytics_service.is_connected()
         }
-    except Exception as e:
-        logger.error(f"Error fetching top pages: {str(e)}")
+    except Exception:
+        logger.exception("Error fetching top pages")
         raise HTTPException(status_code=500, detail="Failed to fetch top pages")
 
 @router.get("/demographics")
@@ -91,8 +109,8 @@ async def get_user_demographics(
             "period_days": days,
             "connected": firebase_analytics_service.is_connected()
         }
-    except Exception as e:
-        logger.error(f"Error fetching user demographics: {str(e)}")
+    except Exception:
+        logger.exception("Error fetching user demographics")
         raise HTTPException(status_code=500, detail="Failed to fetch user demographics")
 
 @router.get("/events")
@@ -113,8 +131,8 @@ async def get_top_events(
             "limit": limit,
             "connected": firebase_analytics_service.is_connected()
         }
-    except Exception as e:
-        logger.error(f"Error fetching top events: {str(e)}")
+    except Exception:
+        logger.exception("Error fetching top events")
         raise HTTPException(status_code=500, detail="Failed to fetch top events")
 
 @router.get("/audiences")
@@ -133,8 +151,8 @@ async def get_audience_data(
             "period_days": days,
             "connected": firebase_analytics_service.is_connected()
         }
-    except Exception as e:
-        logger.error(f"Error fetching audience data: {str(e)}")
+    except Exception:
+        logger.exception("Error fetching audience data")
         raise HTTPException(status_code=500, detail="Failed to fetch audience data")
 
 @router.get("/funnels")
@@ -153,59 +171,79 @@ async def get_funnel_data(
             "period_days": days,
             "connected": firebase_analytics_service.is_connected()
         }
-    except Exception as e:
-        logger.error(f"Error fetching funnel data: {str(e)}")
+    except Exception:
+        logger.exception("Error fetching funnel data")
         raise HTTPException(status_code=500, detail="Failed to fetch funnel data")
 
+async def _metrics_section(name: str, fetch) -> tuple:
+    """Await one /metrics section and tag it with its response key."""
+    return name, await fetch
+
+
 @router.get("/metrics")
 async def get_all_metrics(
     days: int = Query(30, ge=1, le=365, description="Number of days to fetch data for"),
     db=Depends(get_database)
-) -> Dict[str, Any]:
-    """Get all Firebase Analytics metrics in a single response."""
+) -> StreamingResponse:
+    """Get all Firebase Analytics metrics in a single response.
+    
+    Sections are streamed into the "data" object in the order they finish, so
+    clients get the first bytes as soon as the fastest GA4 report returns.
+    """
     try:
         # Initialize service with database credentials
         await firebase_analytics_service.initialize_from_database(db)
         
         # Fetch all data concurrently
-        overview_task = firebase_analytics_service.get_overview_metrics(days=days)
-        pages_task = firebase_analytics_service.get_top_pages(days=days, limit=10)
-        demographics_task = firebase_analytics_service.get_user_demographics(days=days)
-        events_task = firebase_analytics_service.get_top_events(days=days, limit=10)
-        audience_task = firebase_analytics_service.get_audience_data(days=days)
-        funnel_task = firebase_analytics_service.get_funnel_data(days=days)
-        
-        # Wait for all tasks to complete
-        overview = await overview_task
-        top_pages = await pages_task
-        demographics = await demographics_task
-        events = await events_task
-        audience = await audience_task
-        funnel = await funnel_task
-        
-        return {
-            "success": True,
-            "data": {
-                "overview": overview,
-                "topPages": top_pages,
-                "demographics": demographics,
-                "events": events,
-                "audience": audience,
-                "funnel": funnel
-            },
+        tasks = [
+            asyncio.create_task(_metrics_section("overview", firebase_analytics_service.get_overview_metrics(days=days))),
+            asyncio.create_task(_metrics_section("topPages", firebase_analytics_service.get_top_pages(days=days, limit=10))),
+            asyncio.create_task(_metrics_section("demographics", firebase_analytics_service.get_user_demographics(days=days))),
+            asyncio.create_task(_metrics_section("events", firebase_analytics_service.get_top_events(days=days, limit=10))),
+            asyncio.create_task(_metrics_section("audience", firebase_analytics_service.get_audience_data(days=days))),
+            asyncio.create_task(_metrics_section("funnel", firebase_analytics_service.get_funnel_data(days=days)))
+        ]
+        trailer = {
             "period_days": days,
             "connected": firebase_analytics_service.is_connected(),
             "timestamp": None
         }
-    except Exception as e:
-        logger.error(f"Error fetching all metrics: {str(e)}")
+    except Exception:
+        logger.exception("Error fetching all metrics")
         raise HTTPException(status_code=500, detail="Failed to fetch metrics")
+    
+    async def stream():
+        try:
+            yield b'{"success":true,"data":{'
+            separator = b""
+            for next_section in asyncio.as_completed(tasks):
+                name, section = await next_section
+                yield separator + orjson.dumps(name) + b":" + orjson.dumps(section)
+                separator = b","
+            # Close "data" and splice the trailer's fields into the outer object
+            yield b"}," + orjson.dumps(trailer)[1:]
+        finally:
+            # Stop outstanding GA4 fetches if the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream(), media_type="application/json")
+
+@router.get("/metrics/cache-stats")
+async def get_metrics_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss statistics for the GA4 report cache."""
+    return {
+        "success": True,
+        "data": firebase_analytics_service.get_report_cache_stats()
+    }
 
 @router.post("/reconnect")
 async def reconnect_firebase(db=Depends(get_database)) -> Dict[str, Any]:
     """Attempt to reconnect to Firebase Analytics."""
     try:
         # Reinitialize the Firebase service with database credentials
+        firebase_analytics_service.invalidate()
+        _refresh_config_snapshot()
         await firebase_analytics_service.initialize_from_database(db)
         is_connected = firebase_analytics_service.is_connected()
         
@@ -214,41 +252,107 @@ async def reconnect_firebase(db=Depends(get_database)) -> Dict[str, Any]:
             "connected": is_connected,
             "message": "Reconnection successful" if is_connected else "Reconnection failed - check configuration"
         }
-    except Exception as e:
-        logger.error(f"Error reconnecting to Firebase Analytics: {str(e)}")
+    except Exception:
+        logger.exception("Error reconnecting to Firebase Analytics")
         raise HTTPException(status_code=500, detail="Failed to reconnect to Firebase Analytics")
 
+_REQUIRED_ENV_VARS = [
+    "GOOGLE_APPLICATION_CREDENTIALS",
+    "FIREBASE_PROJECT_ID",
+    "GA4_PROPERTY_ID"
+]
+
+
+def _read_config_status() -> Dict[str, bool]:
+    """Check which Firebase Analytics environment settings are present."""
+    creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+    return {
+        "google_application_credentials": bool(creds_path),
+        "firebase_project_id": bool(os.getenv('FIREBASE_PROJECT_ID')),
+        "ga4_property_id": bool(os.getenv('GA4_PROPERTY_ID')),
+        "credentials_file_exists": bool(creds_path) and os.path.exists(creds_path)
+    }
+
+
+# The environment only changes at startup or when a config save updates it,
+# so /config serves this snapshot instead of re-reading env vars and the filesystem
+_config_snapshot = _read_config_status()
+
+
+def _refresh_config_snapshot():
+    """Re-read the environment configuration after it may have changed."""
+    global _config_snapshot
+    _config_snapshot = _read_config_status()
+
+
 @router.get("/config")
 async def get_configuration() -> Dict[str, Any]:
     """Get Firebase Analytics configuration status."""
+    return {
+        "success": True,
+        "configuration": _config_snapshot,
+        "connected": firebase_analytics_service.is_connected(),
+        "required_env_vars": _REQUIRED_ENV_VARS
+    }
+
+def _validate_service_account(content: Union[bytes, str]) -> Dict[str, Any]:
+    """Parse a service account key and check its required fields and type; raises HTTP 400."""
     try:
-        import os
-        
-        config_status = {
-            "google_application_credentials": bool(os.getenv('GOOGLE_APPLICATION_CREDENTIALS')),
-            "firebase_project_id": bool(os.getenv('FIREBASE_PROJECT_ID')),
-            "ga4_property_id": bool(os.getenv('GA4_PROPERTY_ID')),
-            "credentials_file_exists": False
-        }
-        
-        # Check if credentials file exists
-        creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        if creds_path:
-            config_status["credentials_file_exists"] = os.path.exists(creds_path)
-        
-        return {
-            "success": True,
-            "configuration": config_status,
-            "connected": firebase_analytics_service.is_connected(),
-            "required_env_vars": [
-                "GOOGLE_APPLICATION_CREDENTIALS",
-                "FIREBASE_PROJECT_ID", 
-                "GA4_PROPERTY_ID"
-            ]
-        }
-    except Exception as e:
-        logger.error(f"Error getting configuration: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to get configuration")
+        service_account_data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid service account JSON")
+    
+    if not isinstance(service_account_data, dict):
+        raise HTTPException(status_code=400, detail="Invalid service account JSON")
+    
+    missing_fields = sorted(SERVICE_ACCOUNT_REQUIRED_FIELDS.difference(service_account_data))
+    if missing_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Service account JSON missing required fields: {', '.join(missing_fields)}"
+        )
+    
+    if service_account_data['type'] != 'service_account':
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid service account type. Expected 'service_account'"
+        )
+    
+    return service_account_data
+
+async def _read_service_account_file(upload: UploadFile) -> bytes:
+    """Read an uploaded service account file, failing fast once it exceeds the size cap."""
+    content = bytearray()
+    while chunk := await upload.read(_UPLOAD_CHUNK_SIZE):
+        content.extend(chunk)
+        if len(content) > _MAX_SERVICE_ACCOUNT_FILE_SIZE:
+            raise HTTPException(status_code=413, detail="Service account file too large")
+    return bytes(content)
+
+def _write_legacy_config_files(
+    service_account_data: Dict[str, Any],
+    firebase_project_id: str,
+    ga4_property_id: str
+) -> Dict[str, str]:
+    """Write the service account and config files under ./config; returns the config values."""
+    config_dir = Path("config")
+    config_dir.mkdir(exist_ok=True)
+    
+    service_account_path = config_dir / "firebase_service_account.json"
+    with open(service_account_path, "wb") as f:
+        f.write(orjson.dumps(service_account_data, option=orjson.OPT_INDENT_2))
+    
+    config_data = {
+        "FIREBASE_SERVICE_ACCOUNT_PATH": str(service_account_path.absolute()),
+        "FIREBASE_PROJECT_ID": firebase_project_id,
+        "GA4_PROPERTY_ID": ga4_property_id
+    }
+    
+    config_file_path = config_dir / "firebase_config.json"
+    with open(config_file_path, "wb") as f:
+        f.write(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+    
+    return config_data
 
 @router.post("/config")
 async def save_config(
@@ -264,74 +368,45 @@ async def save_config(
             raise HTTPException(status_code=400, detail="Service account file must be a JSON file")
         
         # Read and validate JSON content
-        content = await service_account_file.read()
-        try:
-            service_account_data = json.loads(content)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid JSON file")
+        content = await _read_service_account_file(service_account_file)
+        service_account_data = _validate_service_account(content)
+        
+        now = datetime.utcnow()
+        
+        # Create or update the credentials for this property in one round trip;
+        # the unique index on Firebase-managed property_ids keeps concurrent saves from duplicating it
+        creds_doc = await db.ga_credentials.find_one_and_update(
+            {"property_id": ga4_property_id, "user_id": _FIREBASE_CREDENTIALS_USER},
+            {
+                "$set": {
+                    "service_account_json": content.decode('utf-8'),
+                    "service_account_email": service_account_data.get('client_email'),
+                    "updated_at": now,
+                    "is_active": True
+                },
+                "$setOnInsert": {"created_at": now}
+            },
+            projection={"_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        credentials_id = str(creds_doc["_id"])
         
-        # Validate required fields in service account JSON
-        required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email']
-        missing_fields = [field for field in required_fields if field not in service_account_data]
-        if missing_fields:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Service account JSON missing required fields: {', '.join(missing_fields)}"
-            )
+        firebase_analytics_service.invalidate()
         
-        # Check if credentials with same property_id already exist
-        existing = await db.ga_credentials.find_one({"property_id": ga4_property_id})
-        if existing:
-            # Update existing credentials
-            update_data = {
-                "service_account_json": content.decode('utf-8'),
-                "service_account_email": service_account_data.get('client_email'),
-                "updated_at": datetime.utcnow(),
-                "is_active": True
-            }
-            await db.ga_credentials.update_one(
-                {"_id": existing["_id"]},
-                {"$set": update_data}
-            )
-            credentials_id = str(existing["_id"])
-        else:
-            # Create new credentials
-            creds_doc = GACredentials(
-                user_id="default",  # For now, using default user
-                property_id=ga4_property_id,
-                service_account_json=content.decode('utf-8'),
-                service_account_email=service_account_data.get('client_email'),
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-                is_active=True
+        # The database is the source of truth; config files are opt-in for backward compatibility
+        if settings.write_legacy_firebase_config_files:
+            config_data = await asyncio.to_thread(
+                _write_legacy_config_files, service_account_data, firebase_project_id, ga4_property_id
             )
             
-            result = await db.ga_credentials.insert_one(creds_doc.dict(by_alias=True, exclude={"id"}))
-            credentials_id = str(result.inserted_id)
-        
-        # Also save to config files for backward compatibility (optional)
-        config_dir = Path("config")
-        config_dir.mkdir(exist_ok=True)
-        
-        service_account_path = config_dir / "firebase_service_account.json"
-        with open(service_account_path, "w") as f:
-            json.dump(service_account_data, f, indent=2)
-        
-        config_data = {
-            "FIREBASE_SERVICE_ACCOUNT_PATH": str(service_account_path.absolute()),
-            "FIREBASE_PROJECT_ID": firebase_project_id,
-            "GA4_PROPERTY_ID": ga4_property_id
-        }
-        
-        config_file_path = config_dir / "firebase_config.json"
-        with open(config_file_path, "w") as f:
-            json.dump(config_data, f, indent=2)
-        
-        # Update environment variables for current session
-        os.environ.update(config_data)
+            # Update environment variables for current session
+            os.environ.update(config_data)
+            _refresh_config_snapshot()
         
         logger.info(
-            f"Firebase Analytics configuration saved to database - project_id: {firebase_project_id}, property_id: {ga4_property_id}"
+            "Firebase Analytics configuration saved to database - project_id: %s, property_id: %s",
+            firebase_project_id, ga4_property_id
         )
         
         return {
@@ -349,8 +424,8 @@ async def save_config(
     except HTTPException:
         raise
     except Exception as e:
-         logger.error(f"Error saving Firebase Analytics configuration: {str(e)}")
-         raise HTTPException(status_code=500, detail=f"Failed to save configuration: {str(e)}")
+        logger.exception("Error saving Firebase Analytics configuration")
+        raise HTTPException(status_code=500, detail=f"Failed to save configuration: {str(e)}")
 
 @router.post("/config/test")
 async def test_config(
@@ -365,32 +440,14 @@ async def test_config(
             raise HTTPException(status_code=400, detail="Service account file must be a JSON file")
         
         # Read and validate JSON content
-        content = await service_account_file.read()
-        try:
-            service_account_data = json.loads(content)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid JSON file")
-        
-        # Validate required fields in service account JSON
-        required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email']
-        missing_fields = [field for field in required_fields if field not in service_account_data]
-        if missing_fields:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Service account JSON missing required fields: {', '.join(missing_fields)}"
-            )
-        
-        # Validate service account type
-        if service_account_data.get('type') != 'service_account':
-            raise HTTPException(
-                status_code=400, 
-                detail="Invalid service account type. Expected 'service_account'"
-            )
+        content = await _read_service_account_file(service_account_file)
+        service_account_data = _validate_service_account(content)
         
         # Validate project ID matches
         if service_account_data.get('project_id') != firebase_project_id:
             logger.warning(
-                f"Project ID mismatch - service_account_project: {service_account_data.get('project_id')}, provided_project: {firebase_project_id}"
+                "Project ID mismatch - service_account_project: %s, provided_project: %s",
+                service_account_data.get('project_id'), firebase_project_id
             )
         
         # Test Firebase Analytics connection (basic validation)
@@ -401,14 +458,15 @@ async def test_config(
                 service_account_data, firebase_project_id, ga4_property_id
             )
         except Exception as conn_error:
-            logger.warning(f"Connection test failed: {str(conn_error)}")
+            logger.warning("Connection test failed: %s", conn_error)
             test_result = {
                 "connection_status": "warning",
                 "message": "Configuration appears valid but connection test failed. This may be due to API permissions or network issues."
             }
         
         logger.info(
-            f"Firebase Analytics configuration tested - project_id: {firebase_project_id}, property_id: {ga4_property_id}, test_status: {test_result.get('connection_status', 'unknown')}"
+            "Firebase Analytics configuration tested - project_id: %s, property_id: %s, test_status: %s",
+            firebase_project_id, ga4_property_id, test_result.get('connection_status', 'unknown')
         )
         
         return {
@@ -426,7 +484,7 @@ async def test_config(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error testing Firebase Analytics configuration: {str(e)}")
+        logger.exception("Error testing Firebase Analytics configuration")
         raise HTTPException(status_code=500, detail=f"Failed to test configuration: {str(e)}")
 
 
@@ -439,38 +497,26 @@ async def create_firebase_credentials(
     """Create new Firebase Analytics credentials configuration"""
     try:
         # Validate service account JSON
-        try:
-            service_account_data = json.loads(credentials.service_account_json)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid service account JSON")
-        
-        # Validate required fields
-        required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email']
-        missing_fields = [field for field in required_fields if field not in service_account_data]
-        if missing_fields:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Service account JSON missing required fields: {', '.join(missing_fields)}"
-            )
-        
-        # Check if credentials with same property_id already exist
-        existing = await db.ga_credentials.find_one({"property_id": credentials.property_id})
-        if existing:
-            raise HTTPException(status_code=400, detail="Credentials for this GA4 property already exist")
+        service_account_data = _validate_service_account(credentials.service_account_json)
         
         # Create credentials document
+        now = datetime.utcnow()
         creds_doc = GACredentials(
-            user_id="default",  # For now, using default user
+            user_id=_FIREBASE_CREDENTIALS_USER,
             property_id=credentials.property_id,
             service_account_json=credentials.service_account_json,
             service_account_email=service_account_data.get('client_email'),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
             is_active=True
         )
         
-        # Insert into database
-        result = await db.ga_credentials.insert_one(creds_doc.dict(by_alias=True, exclude={"id"}))
+        # Insert into database; the unique index rejects a second set for the same property
+        try:
+            result = await db.ga_credentials.insert_one(creds_doc.dict(by_alias=True, exclude={"id"}))
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Credentials for this GA4 property already exist")
+        firebase_analytics_service.invalidate()
         
         # Return response
         return GACredentialsResponse(
@@ -485,42 +531,48 @@ async def create_firebase_credentials(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating Firebase Analytics credentials: {str(e)}")
+        logger.exception("Error creating Firebase Analytics credentials")
         raise HTTPException(status_code=500, detail=f"Failed to create credentials: {str(e)}")
 
 
-@router.get("/credentials", response_model=List[GACredentialsResponse])
+@router.get(
+    "/credentials",
+    response_model=List[GACredentialsResponse],
+    response_class=ORJSONResponse,
+    response_model_exclude_none=True
+)
 async def list_firebase_credentials(db=Depends(get_database)) -> List[GACredentialsResponse]:
     """List all Firebase Analytics credentials configurations"""
     try:
-        cursor = db.ga_credentials.find({})
-        credentials = await cursor.to_list(length=None)
-        
-        return [
-            GACredentialsResponse(
-                id=str(cred["_id"]),
-                property_id=cred["property_id"],
-                service_account_email=cred.get("service_account_email"),
-                created_at=cred["created_at"],
-                updated_at=cred["updated_at"],
-                is_active=cred.get("is_active", True)
-            )
-            for cred in credentials
-        ]
+        # Stored documents were validated on write, so build responses without re-validating
+        credentials = []
+        async for cred in db.ga_credentials.find({}, _CREDENTIALS_PROJECTION):
+            cred.setdefault("is_active", True)
+            credentials.append(document_to_response(cred, GACredentialsResponse))
+        return credentials
         
     except Exception as e:
-        logger.error(f"Error listing Firebase Analytics credentials: {str(e)}")
+        logger.exception("Error listing Firebase Analytics credentials")
         raise HTTPException(status_code=500, detail=f"Failed to list credentials: {str(e)}")
 
 
+def _credentials_object_id(credentials_id: str) -> ObjectId:
+    """Parse the credentials_id path parameter; malformed IDs cannot match any credentials"""
+    try:
+        return ObjectId(credentials_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=404, detail="Firebase Analytics credentials not found")
+
+
 @router.get("/credentials/{credentials_id}", response_model=GACredentialsResponse)
 async def get_firebase_credentials(
     credentials_id: str,
+    object_id: ObjectId = Depends(_credentials_object_id),
     db=Depends(get_database)
 ) -> GACredentialsResponse:
     """Get specific Firebase Analytics credentials configuration"""
     try:
-        cred = await db.ga_credentials.find_one({"_id": ObjectId(credentials_id)})
+        cred = await db.ga_credentials.find_one({"_id": object_id}, _CREDENTIALS_PROJECTION)
         if not cred:
             raise HTTPException(status_code=404, detail="Firebase Analytics credentials not found")
         
@@ -536,21 +588,24 @@ async def get_firebase_credentials(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting Firebase Analytics credentials: {str(e)}")
+        logger.exception("Error getting Firebase Analytics credentials")
         raise HTTPException(status_code=500, detail=f"Failed to get credentials: {str(e)}")
 
 
 @router.delete("/credentials/{credentials_id}")
 async def delete_firebase_credentials(
     credentials_id: str,
+    object_id: ObjectId = Depends(_credentials_object_id),
     db=Depends(get_database)
 ) -> Dict[str, Any]:
     """Delete Firebase Analytics credentials configuration"""
     try:
-        result = await db.ga_credentials.delete_one({"_id": ObjectId(credentials_id)})
+        result = await db.ga_credentials.delete_one({"_id": object_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Firebase Analytics credentials not found")
         
+        firebase_analytics_service.invalidate()
+        
         return {
             "success": True,
             "message": "Firebase Analytics credentials deleted successfully"
@@ -559,5 +614,5 @@ async def delete_firebase_credentials(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting Firebase Analytics credentials: {str(e)}")
+        logger.exception("Error deleting Firebase Analytics credentials")
         raise HTTPException(status_code=500, detail=f"Failed to delete credentials: {str(e)}")
\ No newline at end of file
@@ -1,14 +1,27 @@
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import List, Dict, Any, Optional
+from fastapi.responses import ORJSONResponse
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+import orjson
 import json
 import asyncio
+import functools
+import hashlib
+import logging
 import os
 import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+from core.config import settings
 from core.database import get_database
-from core.gcp_collections import get_service_collection
+from core.gcp_collections import get_all_service_collections, get_service_collection
+from utils.common import SERVICE_ACCOUNT_REQUIRED_FIELDS, validate_object_id
 from models.gcp import (
     GCPCredentials, GCPCredentialsCreate, GCPCredentialsUpdate, GCPCredentialsResponse,
     GCPResource, GCPResourceCreate, GCPResourceUpdate, GCPResourceResponse,
@@ -30,6 +43,8 @@ try:
     from google.cloud import storage
     from google.cloud.sql.connector import Connector
     from googleapiclient import discovery
+    import google_auth_httplib2
+    import httplib2
     from google.cloud import firestore
     from google.cloud import functions_v1
     from google.cloud import run_v2
@@ -47,6 +62,8 @@ except ImportError:
     storage = None
     Connector = None
     discovery = None
+    google_auth_httplib2 = None
+    httplib2 = None
     firestore = None
     functions_v1 = None
     run_v2 = None
@@ -59,10 +76,200 @@ except ImportError:
     service_account = None
     google = None
 
-router = APIRouter(prefix="/gcp", tags=["gcp-integration"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/gcp", tags=["gcp-integration"], default_response_class=ORJSONResponse)
 
 # Note: Service account keys are now stored as plain JSON for simplicity
 
+# GCP client list calls are blocking, paginated HTTPS RPCs; per-zone/per-region calls
+# run on this pool, with a per-discovery cap to stay under per-project API QPS limits
+_GCP_DISCOVERY_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="gcp-discovery")
+_GCP_LIST_CONCURRENCY = 16
+
+# Credentials and API clients are reused across requests: each new client opens its own
+# channel/session (TLS handshake, token fetch), which dominated short discovery runs
+_gcp_credentials: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+_GCP_CREDENTIALS_CACHE_SIZE = 128
+_GCP_CLIENT_CACHE_SIZE = 64
+
+
+def _get_credentials(service_account_key: Dict[str, Any]):
+    """Service account credentials, shared per key so cached clients can be reused
+    
+    Parsing the PEM private key is the expensive part; keys are identified by
+    (client_email, private_key_id), so a rotated key gets a new entry.
+    """
+    cache_key = (service_account_key.get('client_email'), service_account_key.get('private_key_id'))
+    credentials = _gcp_credentials.get(cache_key)
+    if credentials is None:
+        credentials = service_account.Credentials.from_service_account_info(service_account_key)
+        _gcp_credentials[cache_key] = credentials
+        if len(_gcp_credentials) > _GCP_CREDENTIALS_CACHE_SIZE:
+            _gcp_credentials.popitem(last=False)
+    else:
+        _gcp_credentials.move_to_end(cache_key)
+    return credentials
+
+
+def _forget_credentials(service_account_key: Optional[Dict[str, Any]]):
+    """Drop the cached credentials, and the clients built on them, for a replaced or deleted key"""
+    if not service_account_key:
+        return
+    cache_key = (service_account_key.get('client_email'), service_account_key.get('private_key_id'))
+    if _gcp_credentials.pop(cache_key, None) is not None:
+        # lru_cache has no per-entry eviction; clients are cheap to rebuild on the next call
+        _get_client.cache_clear()
+        _get_sql_admin_service.cache_clear()
+
+
+@functools.lru_cache(maxsize=_GCP_CLIENT_CACHE_SIZE)
+def _get_client(client_class, credentials, project: Optional[str] = None):
+    """Long-lived API client per (client class, credentials, project)"""
+    if project is None:
+        return client_class(credentials=credentials)
+    return client_class(credentials=credentials, project=project)
+
+@functools.lru_cache(maxsize=_GCP_CLIENT_CACHE_SIZE)
+def _get_sql_admin_service(credentials):
+    """SQL Admin API resource, built once per credentials from the bundled discovery document
+    
+    Only used to create requests: httplib2 is not thread-safe, so every caller
+    executes them with its own HTTP object.
+    """
+    return discovery.build('sqladmin', 'v1beta4', credentials=credentials, cache_discovery=False, static_discovery=True)
+
+
+def _list_sql_instances(credentials, project_id: str, region: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Every Cloud SQL instance in the project, or in one region, following page tokens"""
+    instances_api = _get_sql_admin_service(credentials).instances()
+    http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+    
+    # Region is filtered server-side so other regions' instances are never transferred
+    list_kwargs = {'project': project_id}
+    if region:
+        list_kwargs['filter'] = f'region:{region}'
+    
+    instances = []
+    request = instances_api.list(**list_kwargs)
+    while request is not None:
+        response = request.execute(http=http)
+        instances.extend(response.get('items', []))
+        request = instances_api.list_next(request, response)
+    return instances
+
+# Partial-response projections for bucket object listings
+_BLOB_SIZE_FIELDS = "items(size),nextPageToken"
+_BLOB_NAME_FIELDS = "items(name),nextPageToken"
+
+_BUCKET_TOTAL_BYTES_METRIC = "storage.googleapis.com/storage/total_bytes"
+_BUCKET_OBJECT_COUNT_METRIC = "storage.googleapis.com/storage/object_count"
+
+
+async def _run_in_pool(func, *args):
+    """Run a blocking GCP call on the discovery pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_GCP_DISCOVERY_POOL, functools.partial(func, *args))
+
+
+async def _list_in_pool(list_call) -> List[Any]:
+    """Run a blocking list call on the discovery pool and return every item"""
+    # list() inside the worker so lazy pagers fetch every page off the event loop
+    return await _run_in_pool(lambda: list(list_call()))
+
+
+async def _gather_in_pool(items, func) -> List[Any]:
+    """Run a blocking call for every item concurrently, at most _GCP_LIST_CONCURRENCY at a time.
+    
+    Returns one entry per item, in order: the call's result or the exception it raised.
+    """
+    semaphore = asyncio.Semaphore(_GCP_LIST_CONCURRENCY)
+    
+    async def run_one(item):
+        async with semaphore:
+            return await _run_in_pool(func, item)
+    
+    return await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+
+
+async def _gather_per_location(locations, list_location) -> List[Any]:
+    """Run a blocking list call for every zone/region concurrently.
+    
+    Returns one entry per location, in order: the fully paged results as a list,
+    or the exception the call raised.
+    """
+    return await _gather_in_pool(locations, lambda location: list(list_location(location)))
+
+
+# A project's zones and regions change on the order of months; cache the listings
+_LOCATIONS_TTL = 3600
+_location_cache: Dict[Tuple[str, str], Tuple[float, List[Any]]] = {}
+# get_available_regions responses built from those listings, keyed by project
+_regions_response_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+async def _cached_locations(kind: str, project_id: str, list_call, refresh: bool = False) -> List[Any]:
+    """Project zones/regions from the cache, listing them again once _LOCATIONS_TTL has passed"""
+    cache_key = (kind, project_id)
+    cached = _location_cache.get(cache_key)
+    if cached and not refresh and time.monotonic() - cached[0] < _LOCATIONS_TTL:
+        return cached[1]
+    
+    locations = await _list_in_pool(list_call)
+    _location_cache[cache_key] = (time.monotonic(), locations)
+    return locations
+
+
+async def _get_zones(project_id: str, credentials, refresh: bool = False) -> List[Any]:
+    """All Compute Engine zones of the project"""
+    zones_client = _get_client(compute_v1.ZonesClient, credentials)
+    return await _cached_locations(
+        'zones', project_id, lambda: zones_client.list(request=compute_v1.ListZonesRequest(project=project_id)),
+        refresh
+    )
+
+
+async def _get_regions(project_id: str, credentials, refresh: bool = False) -> List[Any]:
+    """All Compute Engine regions of the project"""
+    regions_client = _get_client(compute_v1.RegionsClient, credentials)
+    return await _cached_locations(
+        'regions', project_id, lambda: regions_client.list(request=compute_v1.ListRegionsRequest(project=project_id)),
+        refresh
+    )
+
+
+def _last_segment(path: str) -> str:
+    """Last '/'-separated segment of a resource URL or name, without splitting the whole string
+    
+    Returns '' for an unset ('') proto field, so callers read the field once and
+    fall back with `or`.
+    """
+    return path[path.rfind('/') + 1:]
+
+
+def _network_interface_summary(ni) -> Dict[str, str]:
+    """Name, network and IPs of a Compute Engine network interface
+    
+    Proto fields always exist and read as '' when unset, so no hasattr checks are needed.
+    """
+    access_configs = ni.access_configs
+    return {
+        'name': ni.name,
+        'network': _last_segment(ni.network) or 'unknown',
+        'internal_ip': ni.network_ip or 'unknown',
+        'external_ip': (access_configs[0].nat_ip if access_configs else None) or 'none'
+    }
+
+
+def _zone_region(zone_name: str) -> str:
+    """Region a zone belongs to, e.g. 'us-central1-a' -> 'us-central1'"""
+    return zone_name.rsplit('-', 1)[0]
+
+
+def _zone_regions(zones) -> Dict[str, str]:
+    """Region of every listed Compute Engine zone, keyed by zone name"""
+    return {zone.name: _last_segment(zone.region) or 'unknown' for zone in zones}
+
 def get_bucket_size_info(bucket, storage_client, project_id: str) -> Dict[str, Any]:
     """Get storage size and object count for a bucket"""
     try:
@@ -70,11 +277,11 @@ def get_bucket_size_info(bucket, storage_client, project_id: str) -> Dict[str, A
         total_size = 0
         object_count = 0
         
-        # List all objects and calculate total size
-        blobs = list(bucket.list_blobs())
+        # Page through the objects fetching only their sizes; nextPageToken must be
+        # requested explicitly or a field-projected listing stops after one page
+        blobs = storage_client.list_blobs(bucket, fields=_BLOB_SIZE_FIELDS, page_size=1000)
         for blob in blobs:
-            if blob.size:
-                total_size += blob.size
+            total_size += blob.size or 0
             object_count += 1
         
         return {
@@ -82,31 +289,69 @@ def get_bucket_size_info(bucket, storage_client, project_id: str) -> Dict[str, A
             'total_size_gb': round(total_size / (1024 ** 3), 2) if total_size > 0 else 0,
             'object_count': object_count
         }
-    except Exception as e:
-        print(f"Error getting size info for bucket {bucket.name}: {e}")
+    except Exception:
+        logger.exception("Error getting size info for bucket %s", bucket.name)
         return {
             'total_size_bytes': 0,
             'total_size_gb': 0,
             'object_count': 0
         }
 
-def get_bucket_size_from_monitoring(project_id: str, bucket_name: str, credentials) -> Optional[int]:
-    """Get bucket size using Cloud Monitoring API (faster for large buckets)"""
+def get_bucket_size_summary(
+    bucket, storage_client, monitored: Tuple[Optional[int], Optional[int]]
+) -> Tuple[int, float, Any]:
+    """Size in bytes, size in GB and object count for a bucket
+    
+    Uses the Cloud Monitoring values where present and lists objects only for what is missing.
+    """
+    size_bytes, object_count = monitored
+    
+    # If monitoring API doesn't return data, fall back to listing objects
+    if size_bytes is None:
+        size_info = get_bucket_size_info(bucket, storage_client, storage_client.project)
+        return size_info['total_size_bytes'], size_info['total_size_gb'], size_info['object_count']
+    
+    size_gb = round(size_bytes / (1024 ** 3), 2) if size_bytes > 0 else 0
+    
+    # Only count objects directly if monitoring had a size but no object_count
+    if object_count is None:
+        try:
+            # Quick object count (limit to avoid timeout)
+            blobs = list(storage_client.list_blobs(
+                bucket, max_results=10000, fields=_BLOB_NAME_FIELDS, page_size=1000
+            ))
+            object_count = len(blobs)
+            # If we hit the limit, indicate it's approximate
+            if len(blobs) == 10000:
+                object_count = f"{object_count}+"
+        except:
+            object_count = "N/A"
+    
+    return size_bytes, size_gb, object_count
+
+def get_all_bucket_sizes_from_monitoring(
+    project_id: str, bucket_names: List[str], credentials
+) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+    """Get size and object count for every bucket using Cloud Monitoring API (faster for large buckets)
+    
+    Returns {bucket_name: (size_bytes, object_count)}; buckets without metric data are
+    absent and either value is None when only the other metric has data.
+    """
     try:
-        if not monitoring_v3:
-            return None
+        if not monitoring_v3 or not bucket_names:
+            return {}
             
-        client = monitoring_v3.MetricServiceClient(credentials=credentials)
+        client = _get_client(monitoring_v3.MetricServiceClient, credentials)
         project_name = f"projects/{project_id}"
         
         # Get current time and 24 hours ago
         now = datetime.utcnow()
         start_time = now - timedelta(days=1)
         
-        # Build the filter for storage metrics
+        # Both storage metrics for the whole project in one request; buckets are
+        # matched afterwards so the filter stays short however many there are
         filter_str = (
-            f'metric.type="storage.googleapis.com/storage/total_bytes" '
-            f'AND resource.labels.bucket_name="{bucket_name}"'
+            f'metric.type="{_BUCKET_TOTAL_BYTES_METRIC}" OR metric.type="{_BUCKET_OBJECT_COUNT_METRIC}"'
         )
         
         # Create time interval
@@ -124,169 +369,263 @@ def get_bucket_size_from_monitoring(project_id: str, bucket_name: str, credentia
             }
         )
         
-        # Get the latest value
+        # Each metric has one series per bucket and storage class; points are newest
+        # first, so sum the latest point of every series
+        wanted = set(bucket_names)
+        totals: Dict[str, Dict[str, int]] = {}
         for time_series in results:
-            for point in time_series.points:
-                if point.value.int64_value:
-                    return point.value.int64_value
+            bucket_name = time_series.resource.labels.get("bucket_name")
+            if bucket_name not in wanted or not time_series.points:
+                continue
+            bucket_totals = totals.setdefault(bucket_name, {})
+            metric_type = time_series.metric.type
+            bucket_totals[metric_type] = bucket_totals.get(metric_type, 0) + time_series.points[0].value.int64_value
         
-        return None
+        return {
+            bucket_name: (bucket_totals.get(_BUCKET_TOTAL_BYTES_METRIC), bucket_totals.get(_BUCKET_OBJECT_COUNT_METRIC))
+            for bucket_name, bucket_totals in totals.items()
+        }
         
-    except Exception as e:
-        print(f"Error getting monitoring data for {bucket_name}: {e}")
-        return None
+    except Exception:
+        logger.exception("Error getting bucket monitoring data for project %s", project_id)
+        return {}
 
-async def discover_gcp_resources(credentials_id: str, service_account_key: Dict[str, Any], db) -> List[Dict[str, Any]]:
-    """Automatically discover GCP resources for the given credentials"""
-    discovered_resources = []
+_DISCOVERY_WRITE_BATCH_SIZE = 500
+
+
+# Fields refreshed on resources that were already stored when their content changes
+_DISCOVERY_MUTABLE_FIELDS = ('labels', 'metadata', 'metadata_hash', 'updated_at')
+
+
+def _resource_content_hash(resource: Dict[str, Any]) -> str:
+    """Digest of the discovered labels and metadata, used to skip unchanged resources"""
+    content = orjson.dumps(
+        {'labels': resource['labels'], 'metadata': resource['metadata']},
+        default=str,
+        option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+async def _save_discovered_resources(db, resources: List[Dict[str, Any]]) -> int:
+    """Store discovered resources and empty the buffer.
+    
+    New resources are inserted; stored ones are only written when their labels or
+    metadata changed, and then only those fields and updated_at are refreshed.
+    Writes go to each service collection as unordered bulk upserts of up to
+    _DISCOVERY_WRITE_BATCH_SIZE operations.
+    """
+    # Producers set service_type to a GCPServiceType member, so it groups as-is
+    resources_by_service: Dict[GCPServiceType, List[Dict[str, Any]]] = {}
+    for resource in resources:
+        resources_by_service.setdefault(resource['service_type'], []).append(resource)
+    
+    for service_type, service_resources in resources_by_service.items():
+        collection = get_service_collection(db, service_type)
+        
+        # A buffer only ever holds one credentials' resources
+        stored_hashes = {
+            stored['resource_id']: stored.get('metadata_hash')
+            async for stored in collection.find(
+                {
+                    'credentials_id': service_resources[0]['credentials_id'],
+                    'resource_id': {'$in': [resource['resource_id'] for resource in service_resources]}
+                },
+                {'_id': 0, 'resource_id': 1, 'metadata_hash': 1}
+            )
+        }
+        
+        requests = []
+        for resource in service_resources:
+            resource['metadata_hash'] = _resource_content_hash(resource)
+            if stored_hashes.get(resource['resource_id']) == resource['metadata_hash']:
+                continue
+            
+            changed = {field: resource[field] for field in _DISCOVERY_MUTABLE_FIELDS}
+            unchanged = {field: value for field, value in resource.items() if field not in changed}
+            requests.append(UpdateOne(
+                {'credentials_id': resource['credentials_id'], 'resource_id': resource['resource_id']},
+                {'$set': changed, '$setOnInsert': unchanged},
+                upsert=True
+            ))
+        
+        for start in range(0, len(requests), _DISCOVERY_WRITE_BATCH_SIZE):
+            await collection.bulk_write(requests[start:start + _DISCOVERY_WRITE_BATCH_SIZE], ordered=False)
+    
+    saved = len(resources)
+    resources.clear()
+    return saved
+
+
+class _DiscoveryWriter:
+    """Buffers discovered resources and saves them in batches of _DISCOVERY_WRITE_BATCH_SIZE"""
+    
+    def __init__(self, db):
+        self.db = db
+        self.count = 0
+        self._buffer: List[Dict[str, Any]] = []
+    
+    async def add(self, resource: Dict[str, Any]):
+        self._buffer.append(resource)
+        self.count += 1
+        if len(self._buffer) >= _DISCOVERY_WRITE_BATCH_SIZE:
+            await self.flush()
+    
+    async def flush(self):
+        if self._buffer:
+            # Swap the buffer out first so concurrent phases keep adding to a fresh one
+            batch, self._buffer = self._buffer, []
+            await _save_discovered_resources(self.db, batch)
+
+
+async def discover_gcp_resources(credentials_id: str, service_account_key: Dict[str, Any], db) -> int:
+    """Automatically discover GCP resources for the given credentials
+    
+    Every service is discovered concurrently. Resources are saved in batches as they
+    are found and whenever a service finishes. Returns the number of resources discovered.
+    """
+    writer = _DiscoveryWriter(db)
+    regions_task = None
+    # One timestamp for the whole run
+    now = datetime.utcnow()
     
     try:
-        print(f"Starting resource discovery for credentials_id: {credentials_id}")
+        logger.info("Starting resource discovery for credentials_id: %s", credentials_id)
+        credentials_oid = ObjectId(credentials_id)
         # Create credentials from service account key
-        credentials = service_account.Credentials.from_service_account_info(service_account_key)
+        credentials = _get_credentials(service_account_key)
         project_id = service_account_key['project_id']
-        print(f"Project ID: {project_id}")
+        logger.debug("Project ID: %s", project_id)
+        
+        # The project's regions are listed once, and only Cloud Run needs them (the
+        # Compute phases use aggregated listings), so start fetching them right away
+        if compute_v1 and run_v2:
+            regions_task = asyncio.ensure_future(_get_regions(project_id, credentials))
         
         # Discover Compute Engine instances
-        if compute_v1:
-            try:
-                print("Starting Compute Engine discovery...")
-                compute_client = compute_v1.InstancesClient(credentials=credentials)
-                zones_client = compute_v1.ZonesClient(credentials=credentials)
-                
-                # Get all zones for the project
-                zones_request = compute_v1.ListZonesRequest(project=project_id)
-                zones = zones_client.list(request=zones_request)
-                print(f"Found {len(list(zones))} zones")
-                
-                zone_count = 0
-                for zone in zones:
-                    zone_count += 1
-                    try:
-                        print(f"Checking zone {zone_count}: {zone.name}")
-                        # List instances in each zone
-                        instances_request = compute_v1.ListInstancesRequest(
-                            project=project_id,
-                            zone=zone.name
-                        )
-                        instances = compute_client.list(request=instances_request)
-                        
+        async def _discover_compute_engine():
+            if compute_v1:
+                try:
+                    logger.info("Starting Compute Engine discovery")
+                    compute_client = _get_client(compute_v1.InstancesClient, credentials)
+                    
+                    # One aggregated listing covers every zone; zones without instances come back
+                    # as scopes with only a warning, so there is no per-zone round-trip. Partial
+                    # success keeps an unreachable zone from failing the whole listing
+                    scoped_instances = await _list_in_pool(lambda: compute_client.aggregated_list(
+                        request=compute_v1.AggregatedListInstancesRequest(project=project_id, return_partial_success=True)
+                    ))
+                    
+                    zone_count = 0
+                    instance_total = 0
+                    for scope, scoped_list in scoped_instances:
+                        instances = scoped_list.instances
+                        if not instances:
+                            continue
+                        zone_count += 1
+                        instance_total += len(instances)
+                        zone_name = _last_segment(scope)
+                        region_name = _zone_region(zone_name)
+                        logger.debug("Checking zone %s: %s", zone_count, zone_name)
                         instance_count = 0
                         for instance in instances:
                             instance_count += 1
-                            print(f"Found instance {instance_count}: {instance.name}")
+                            logger.debug("Found instance %s: %s", instance_count, instance.name)
                             resource_data = {
-                                'credentials_id': ObjectId(credentials_id),
+                                'credentials_id': credentials_oid,
                                 'resource_id': str(instance.id),
                                 'resource_name': instance.name,
                                 'service_type': GCPServiceType.COMPUTE_ENGINE,
-                                'zone': zone.name,
-                                'region': zone.region.split('/')[-1] if zone.region else None,
-                                'labels': dict(instance.labels) if instance.labels else {},
+                                'zone': zone_name,
+                                'region': region_name,
+                                'labels': dict(instance.labels),
                                 'metadata': {
-                                    'machine_type': instance.machine_type.split('/')[-1] if instance.machine_type else None,
+                                    'machine_type': _last_segment(instance.machine_type) or None,
                                     'status': instance.status,
                                     'creation_timestamp': instance.creation_timestamp,
                                     'network_interfaces': [
-                                        {
-                                            'name': ni.name,
-                                            'network': ni.network.split('/')[-1] if ni.network else 'unknown',
-                                            'internal_ip': ni.network_ip if hasattr(ni, 'network_ip') else 'unknown',
-                                            'external_ip': ni.access_configs[0].nat_ip if ni.access_configs and hasattr(ni.access_configs[0], 'nat_ip') else 'none'
-                                        } for ni in instance.network_interfaces
-                                    ] if instance.network_interfaces else []
+                                        _network_interface_summary(ni) for ni in instance.network_interfaces
+                                    ]
                                 },
                                 'monitoring_enabled': True,
-                                'created_at': datetime.utcnow(),
-                                'updated_at': datetime.utcnow()
+                                'created_at': now,
+                                'updated_at': now
                             }
-                            discovered_resources.append(resource_data)
+                            await writer.add(resource_data)
                         
-                        if instance_count == 0:
-                            print(f"No instances found in zone {zone.name}")
-                    except Exception as e:
-                        print(f"Error discovering instances in zone {zone.name}: {str(e)}")
-                        continue
-                
-                print(f"Finished checking {zone_count} zones, found {len(discovered_resources)} compute instances")
-            except Exception as e:
-                print(f"Error discovering Compute Engine resources: {str(e)}")
+                    logger.info("Found instances in %s zones, %s compute instances in total", zone_count, instance_total)
+                except Exception:
+                    logger.exception("Error discovering Compute Engine resources")
+            
+            await writer.flush()
         
         # Discover Cloud Storage buckets
-        if storage:
-            try:
-                storage_client = storage.Client(credentials=credentials, project=project_id)
-                buckets = storage_client.list_buckets()
-                
-                for bucket in buckets:
-                    # Try to get size from monitoring API first (faster for large buckets)
-                    size_bytes = get_bucket_size_from_monitoring(project_id, bucket.name, credentials)
+        async def _discover_storage():
+            if storage:
+                try:
+                    storage_client = _get_client(storage.Client, credentials, project=project_id)
+                    buckets = await _list_in_pool(storage_client.list_buckets)
                     
-                    # If monitoring API doesn't return data, fall back to listing objects
-                    if size_bytes is None:
-                        size_info = get_bucket_size_info(bucket, storage_client, project_id)
-                        size_bytes = size_info['total_size_bytes']
-                        object_count = size_info['object_count']
-                        size_gb = size_info['total_size_gb']
-                    else:
-                        # Calculate GB and get object count separately if using monitoring API
-                        size_gb = round(size_bytes / (1024 ** 3), 2) if size_bytes > 0 else 0
-                        try:
-                            # Quick object count (limit to avoid timeout)
-                            blobs = list(bucket.list_blobs(max_results=10000))
-                            object_count = len(blobs)
-                            # If we hit the limit, indicate it's approximate
-                            if len(blobs) == 10000:
-                                object_count = f"{object_count}+"
-                        except:
-                            object_count = "N/A"
+                    # Try to get sizes from monitoring API first (faster for large buckets)
+                    monitored_sizes = await _run_in_pool(
+                        get_all_bucket_sizes_from_monitoring, project_id, [bucket.name for bucket in buckets], credentials
+                    )
                     
-                    resource_data = {
-                        'credentials_id': ObjectId(credentials_id),
-                        'resource_id': bucket.name,
-                        'resource_name': bucket.name,
-                        'service_type': GCPServiceType.CLOUD_STORAGE,
-                        'zone': None,
-                        'region': bucket.location,
-                        'labels': dict(bucket.labels) if bucket.labels else {},
-                        'metadata': {
-                            'storage_class': bucket.storage_class,
-                            'creation_time': bucket.time_created.isoformat() if bucket.time_created else None,
-                            'total_size_bytes': size_bytes,
-                            'total_size_gb': size_gb,
-                            'object_count': object_count
-                        },
-                        'monitoring_enabled': True,
-                        'created_at': datetime.utcnow(),
-                        'updated_at': datetime.utcnow()
-                    }
-                    discovered_resources.append(resource_data)
-            except Exception as e:
-                print(f"Error discovering Cloud Storage resources: {str(e)}")
+                    # Buckets missing monitoring data are listed concurrently
+                    bucket_sizes = await _gather_in_pool(
+                        buckets,
+                        lambda bucket: get_bucket_size_summary(
+                            bucket, storage_client, monitored_sizes.get(bucket.name, (None, None))
+                        )
+                    )
+                    
+                    for bucket, sizes in zip(buckets, bucket_sizes):
+                        if isinstance(sizes, Exception):
+                            logger.warning("Error getting size info for bucket %s: %s", bucket.name, sizes)
+                            sizes = (0, 0, "N/A")
+                        size_bytes, size_gb, object_count = sizes
+                        
+                        resource_data = {
+                            'credentials_id': credentials_oid,
+                            'resource_id': bucket.name,
+                            'resource_name': bucket.name,
+                            'service_type': GCPServiceType.CLOUD_STORAGE,
+                            'zone': None,
+                            'region': bucket.location,
+                            'labels': bucket.labels,  # already a plain dict copy
+                            'metadata': {
+                                'storage_class': bucket.storage_class,
+                                'creation_time': bucket.time_created.isoformat() if bucket.time_created else None,
+                                'total_size_bytes': size_bytes,
+                                'total_size_gb': size_gb,
+                                'object_count': object_count
+                            },
+                            'monitoring_enabled': True,
+                            'created_at': now,
+                            'updated_at': now
+                        }
+                        await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering Cloud Storage resources")
+            
+            await writer.flush()
         
         # Discover Cloud SQL instances
-        print(f"Discovery module available: {discovery is not None}")
-        if discovery:
-            try:
-                print("Starting Cloud SQL discovery...")
-                # Build the SQL Admin API service
-                sql_service = discovery.build('sqladmin', 'v1beta4', credentials=credentials)
-                
-                # List all Cloud SQL instances in the project
-                request = sql_service.instances().list(project=project_id)
-                response = request.execute()
-                
-                print(f"Cloud SQL API response: {response}")
-                
-                if 'items' in response:
-                    print(f"Found {len(response['items'])} Cloud SQL instances")
-                    for instance in response['items']:
-                        print(f"Processing Cloud SQL instance: {instance['name']} in region {instance.get('region', 'unknown')}")
-                        # Focus on asia-southeast1-b location as requested
-                        if 'region' in instance and 'asia-southeast1' in instance['region']:
-                            print(f"Found Cloud SQL instance: {instance['name']} in {instance['region']}")
+        async def _discover_cloud_sql():
+            logger.debug("Discovery module available: %s", discovery is not None)
+            if discovery:
+                try:
+                    logger.info("Starting Cloud SQL discovery")
+                    # List Cloud SQL instances in the configured region (all regions when unset)
+                    sql_region = settings.gcp_cloud_sql_region or None
+                    sql_instances = await _run_in_pool(_list_sql_instances, credentials, project_id, sql_region)
+                    
+                    if sql_instances:
+                        logger.debug("Found %s Cloud SQL instances", len(sql_instances))
+                        for instance in sql_instances:
+                            logger.debug("Found Cloud SQL instance: %s in %s", instance['name'], instance.get('region', 'unknown'))
                             resource_data = {
-                                'credentials_id': ObjectId(credentials_id),
+                                'credentials_id': credentials_oid,
                                 'resource_id': instance['name'],
                                 'resource_name': instance['name'],
                                 'service_type': GCPServiceType.CLOUD_SQL,
@@ -302,165 +641,179 @@ async def discover_gcp_resources(credentials_id: str, service_account_key: Dict[
                                     'ip_addresses': instance.get('ipAddresses', [])
                                 },
                                 'monitoring_enabled': True,
-                                'created_at': datetime.utcnow(),
-                                'updated_at': datetime.utcnow()
+                                'created_at': now,
+                                'updated_at': now
                             }
-                            discovered_resources.append(resource_data)
-                        else:
-                            print(f"Skipping Cloud SQL instance {instance['name']} - not in asia-southeast1 region")
-                else:
-                    print("No Cloud SQL instances found in the project")
-                        
-            except Exception as e:
-                print(f"Error discovering Cloud SQL resources: {str(e)}")
+                            await writer.add(resource_data)
+                    else:
+                        logger.debug("No Cloud SQL instances found in the project")
+                            
+                except Exception:
+                    logger.exception("Error discovering Cloud SQL resources")
+            
+            await writer.flush()
         
         # Discover Firestore databases
-        if firestore:
-            try:
-                print("Starting Firestore discovery...")
-                firestore_client = firestore.Client(credentials=credentials, project=project_id)
-                
-                # Firestore databases are project-level resources
-                resource_data = {
-                    'credentials_id': ObjectId(credentials_id),
-                    'resource_id': f"{project_id}-firestore",
-                    'resource_name': f"Firestore Database ({project_id})",
-                    'service_type': GCPServiceType.FIREBASE_DATABASE,
-                    'zone': None,
-                    'region': 'global',
-                    'labels': {},
-                    'metadata': {
-                        'project_id': project_id,
-                        'database_type': 'firestore'
-                    },
-                    'monitoring_enabled': True,
-                    'created_at': datetime.utcnow(),
-                    'updated_at': datetime.utcnow()
-                }
-                discovered_resources.append(resource_data)
-                print(f"Found Firestore database for project: {project_id}")
-            except Exception as e:
-                print(f"Error discovering Firestore resources: {str(e)}")
-        
-        # Discover Cloud Functions
-        if functions_v1:
-            try:
-                print("Starting Cloud Functions discovery...")
-                functions_client = functions_v1.CloudFunctionsServiceClient(credentials=credentials)
-                
-                # Get all regions for the project to search for functions
-                parent = f"projects/{project_id}/locations/-"
-                request = functions_v1.ListFunctionsRequest(parent=parent)
-                functions = functions_client.list_functions(request=request)
-                
-                for function in functions:
-                    print(f"Found Cloud Function: {function.name}")
-                    function_name = function.name.split('/')[-1]
-                    location = function.name.split('/')[3]
+        async def _discover_firestore():
+            if firestore:
+                try:
+                    logger.info("Starting Firestore discovery")
+                    firestore_client = _get_client(firestore.Client, credentials, project=project_id)
                     
+                    # Firestore databases are project-level resources
                     resource_data = {
-                        'credentials_id': ObjectId(credentials_id),
-                        'resource_id': function.name,
-                        'resource_name': function_name,
-                        'service_type': GCPServiceType.CLOUD_FUNCTIONS,
+                        'credentials_id': credentials_oid,
+                        'resource_id': f"{project_id}-firestore",
+                        'resource_name': f"Firestore Database ({project_id})",
+                        'service_type': GCPServiceType.FIREBASE_DATABASE,
                         'zone': None,
-                        'region': location,
-                        'labels': dict(function.labels) if function.labels else {},
+                        'region': 'global',
+                        'labels': {},
                         'metadata': {
-                            'runtime': function.runtime,
-                            'status': function.status.name if function.status else 'UNKNOWN',
-                            'entry_point': function.entry_point,
-                            'update_time': function.update_time.isoformat() if function.update_time else None
+                            'project_id': project_id,
+                            'database_type': 'firestore'
                         },
                         'monitoring_enabled': True,
-                        'created_at': datetime.utcnow(),
-                        'updated_at': datetime.utcnow()
+                        'created_at': now,
+                        'updated_at': now
                     }
-                    discovered_resources.append(resource_data)
-            except Exception as e:
-                print(f"Error discovering Cloud Functions resources: {str(e)}")
+                    await writer.add(resource_data)
+                    logger.debug("Found Firestore database for project: %s", project_id)
+                except Exception:
+                    logger.exception("Error discovering Firestore resources")
+            
+            await writer.flush()
+        
+        # Discover Cloud Functions
+        async def _discover_cloud_functions():
+            if functions_v1:
+                try:
+                    logger.info("Starting Cloud Functions discovery")
+                    functions_client = _get_client(functions_v1.CloudFunctionsServiceClient, credentials)
+                    
+                    # Get all regions for the project to search for functions
+                    parent = f"projects/{project_id}/locations/-"
+                    request = functions_v1.ListFunctionsRequest(parent=parent)
+                    functions = await _list_in_pool(lambda: functions_client.list_functions(request=request))
+                    
+                    for function in functions:
+                        logger.debug("Found Cloud Function: %s", function.name)
+                        function_name = _last_segment(function.name)
+                        location = function.name.split('/')[3]
+                        
+                        resource_data = {
+                            'credentials_id': credentials_oid,
+                            'resource_id': function.name,
+                            'resource_name': function_name,
+                            'service_type': GCPServiceType.CLOUD_FUNCTIONS,
+                            'zone': None,
+                            'region': location,
+                            'labels': dict(function.labels),
+                            'metadata': {
+                                'runtime': function.runtime,
+                                'status': function.status.name if function.status else 'UNKNOWN',
+                                'entry_point': function.entry_point,
+                                'update_time': function.update_time.isoformat() if function.update_time else None
+                            },
+                            'monitoring_enabled': True,
+                            'created_at': now,
+                            'updated_at': now
+                        }
+                        await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering Cloud Functions resources")
+            
+            await writer.flush()
         
         # Discover Pub/Sub topics
-        if pubsub_v1:
-            try:
-                print("Starting Pub/Sub discovery...")
-                publisher_client = pubsub_v1.PublisherClient(credentials=credentials)
-                
-                project_path = publisher_client.common_project_path(project_id)
-                topics = publisher_client.list_topics(request={"project": project_path})
-                
-                for topic in topics:
-                    print(f"Found Pub/Sub topic: {topic.name}")
-                    topic_name = topic.name.split('/')[-1]
+        async def _discover_pubsub():
+            if pubsub_v1:
+                try:
+                    logger.info("Starting Pub/Sub discovery")
+                    publisher_client = _get_client(pubsub_v1.PublisherClient, credentials)
                     
-                    resource_data = {
-                        'credentials_id': ObjectId(credentials_id),
-                        'resource_id': topic.name,
-                        'resource_name': topic_name,
-                        'service_type': GCPServiceType.PUBSUB_TOPIC,
-                        'zone': None,
-                        'region': 'global',
-                        'labels': dict(topic.labels) if topic.labels else {},
-                        'metadata': {
-                            'full_name': topic.name
-                        },
-                        'monitoring_enabled': True,
-                        'created_at': datetime.utcnow(),
-                        'updated_at': datetime.utcnow()
-                    }
-                    discovered_resources.append(resource_data)
-            except Exception as e:
-                print(f"Error discovering Pub/Sub resources: {str(e)}")
+                    project_path = publisher_client.common_project_path(project_id)
+                    topics = await _list_in_pool(lambda: publisher_client.list_topics(request={"project": project_path}))
+                    
+                    for topic in topics:
+                        logger.debug("Found Pub/Sub topic: %s", topic.name)
+                        topic_name = _last_segment(topic.name)
+                        
+                        resource_data = {
+                            'credentials_id': credentials_oid,
+                            'resource_id': topic.name,
+                            'resource_name': topic_name,
+                            'service_type': GCPServiceType.PUBSUB_TOPIC,
+                            'zone': None,
+                            'region': 'global',
+                            'labels': dict(topic.labels),
+                            'metadata': {
+                                'full_name': topic.name
+                            },
+                            'monitoring_enabled': True,
+                            'created_at': now,
+                            'updated_at': now
+                        }
+                        await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering Pub/Sub resources")
+            
+            await writer.flush()
         
         # Discover Load Balancers
-        if compute_v1:
-            try:
-                print("Starting Load Balancer discovery...")
-                # Global forwarding rules (HTTP/HTTPS load balancers)
-                global_forwarding_rules_client = compute_v1.GlobalForwardingRulesClient(credentials=credentials)
-                global_forwarding_rules = global_forwarding_rules_client.list(project=project_id)
-                
-                for rule in global_forwarding_rules:
-                    print(f"Found global load balancer: {rule.name}")
-                    resource_data = {
-                        'credentials_id': ObjectId(credentials_id),
-                        'resource_id': rule.name,
-                        'resource_name': rule.name,
-                        'service_type': GCPServiceType.CLOUD_LOAD_BALANCER,
-                        'zone': None,
-                        'region': 'global',
-                        'labels': dict(rule.labels) if rule.labels else {},
-                        'metadata': {
-                            'ip_address': getattr(rule, 'IPAddress', None),
-                            'port_range': getattr(rule, 'port_range', None),
-                            'target': getattr(rule, 'target', None),
-                            'load_balancing_scheme': getattr(rule, 'load_balancing_scheme', None)
-                        },
-                        'monitoring_enabled': True,
-                        'created_at': datetime.utcnow(),
-                        'updated_at': datetime.utcnow()
-                    }
-                    discovered_resources.append(resource_data)
-                
-                # Regional forwarding rules (internal load balancers)
-                regions_client = compute_v1.RegionsClient(credentials=credentials)
-                regions = regions_client.list(project=project_id)
-                
-                for region in regions:
-                    try:
-                        regional_forwarding_rules_client = compute_v1.ForwardingRulesClient(credentials=credentials)
-                        regional_rules = regional_forwarding_rules_client.list(project=project_id, region=region.name)
+        async def _discover_load_balancers():
+            if compute_v1:
+                try:
+                    logger.info("Starting Load Balancer discovery")
+                    # Global forwarding rules (HTTP/HTTPS load balancers)
+                    global_forwarding_rules_client = _get_client(compute_v1.GlobalForwardingRulesClient, credentials)
+                    global_forwarding_rules = await _list_in_pool(lambda: global_forwarding_rules_client.list(project=project_id))
+                    
+                    for rule in global_forwarding_rules:
+                        logger.debug("Found global load balancer: %s", rule.name)
+                        resource_data = {
+                            'credentials_id': credentials_oid,
+                            'resource_id': rule.name,
+                            'resource_name': rule.name,
+                            'service_type': GCPServiceType.CLOUD_LOAD_BALANCER,
+                            'zone': None,
+                            'region': 'global',
+                            'labels': dict(rule.labels),
+                            'metadata': {
+                                'ip_address': getattr(rule, 'IPAddress', None),
+                                'port_range': getattr(rule, 'port_range', None),
+                                'target': getattr(rule, 'target', None),
+                                'load_balancing_scheme': getattr(rule, 'load_balancing_scheme', None)
+                            },
+                            'monitoring_enabled': True,
+                            'created_at': now,
+                            'updated_at': now
+                        }
+                        await writer.add(resource_data)
+                    
+                    # Regional forwarding rules (internal load balancers)
+                    regional_forwarding_rules_client = _get_client(compute_v1.ForwardingRulesClient, credentials)
+                    scoped_rules = await _list_in_pool(lambda: regional_forwarding_rules_client.aggregated_list(
+                        request=compute_v1.AggregatedListForwardingRulesRequest(project=project_id, return_partial_success=True)
+                    ))
+                    
+                    for scope, scoped_list in scoped_rules:
+                        # Global rules were listed above
+                        if not scope.startswith('regions/'):
+                            continue
+                        region_name = _last_segment(scope)
+                        regional_rules = scoped_list.forwarding_rules
                         
                         for rule in regional_rules:
-                            print(f"Found regional load balancer: {rule.name} in {region.name}")
+                            logger.debug("Found regional load balancer: %s in %s", rule.name, region_name)
                             resource_data = {
-                                'credentials_id': ObjectId(credentials_id),
-                                'resource_id': f"{region.name}/{rule.name}",
+                                'credentials_id': credentials_oid,
+                                'resource_id': f"{region_name}/{rule.name}",
                                 'resource_name': rule.name,
                                 'service_type': GCPServiceType.CLOUD_LOAD_BALANCER,
                                 'zone': None,
-                                'region': region.name,
-                                'labels': dict(rule.labels) if rule.labels else {},
+                                'region': region_name,
+                                'labels': dict(rule.labels),
                                 'metadata': {
                                     'ip_address': getattr(rule, 'IPAddress', None),
                                     'port_range': getattr(rule, 'port_range', None),
@@ -468,67 +821,71 @@ async def discover_gcp_resources(credentials_id: str, service_account_key: Dict[
                                     'load_balancing_scheme': getattr(rule, 'load_balancing_scheme', None)
                                 },
                                 'monitoring_enabled': True,
-                                'created_at': datetime.utcnow(),
-                                'updated_at': datetime.utcnow()
+                                'created_at': now,
+                                'updated_at': now
                             }
-                            discovered_resources.append(resource_data)
-                    except Exception as e:
-                        print(f"Error discovering regional load balancers in {region.name}: {str(e)}")
-                        continue
-            except Exception as e:
-                print(f"Error discovering Load Balancer resources: {str(e)}")
+                            await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering Load Balancer resources")
+            
+            await writer.flush()
         
         # Discover VPC Networks
-        if compute_v1:
-            try:
-                print("Starting VPC Networks discovery...")
-                networks_client = compute_v1.NetworksClient(credentials=credentials)
-                networks = networks_client.list(project=project_id)
-                
-                for network in networks:
-                    print(f"Found VPC network: {network.name}")
-                    resource_data = {
-                        'credentials_id': ObjectId(credentials_id),
-                        'resource_id': network.name,
-                        'resource_name': network.name,
-                        'service_type': GCPServiceType.NETWORK_INTERFACE,
-                        'zone': None,
-                        'region': 'global',
-                        'labels': {},
-                        'metadata': {
-                            'auto_create_subnetworks': network.auto_create_subnetworks,
-                            'routing_mode': network.routing_config.routing_mode if network.routing_config else None,
-                            'creation_timestamp': network.creation_timestamp
-                        },
-                        'monitoring_enabled': True,
-                        'created_at': datetime.utcnow(),
-                        'updated_at': datetime.utcnow()
-                    }
-                    discovered_resources.append(resource_data)
-            except Exception as e:
-                print(f"Error discovering VPC Networks: {str(e)}")
+        async def _discover_vpc_networks():
+            if compute_v1:
+                try:
+                    logger.info("Starting VPC Networks discovery")
+                    networks_client = _get_client(compute_v1.NetworksClient, credentials)
+                    networks = await _list_in_pool(lambda: networks_client.list(project=project_id))
+                    
+                    for network in networks:
+                        logger.debug("Found VPC network: %s", network.name)
+                        resource_data = {
+                            'credentials_id': credentials_oid,
+                            'resource_id': network.name,
+                            'resource_name': network.name,
+                            'service_type': GCPServiceType.NETWORK_INTERFACE,
+                            'zone': None,
+                            'region': 'global',
+                            'labels': {},
+                            'metadata': {
+                                'auto_create_subnetworks': network.auto_create_subnetworks,
+                                'routing_mode': network.routing_config.routing_mode if network.routing_config else None,
+                                'creation_timestamp': network.creation_timestamp
+                            },
+                            'monitoring_enabled': True,
+                            'created_at': now,
+                            'updated_at': now
+                        }
+                        await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering VPC Networks")
+            
+            await writer.flush()
         
         # Discover Cloud Routers
-        if compute_v1:
-            try:
-                print("Starting Cloud Router discovery...")
-                regions_client = compute_v1.RegionsClient(credentials=credentials)
-                regions = regions_client.list(project=project_id)
-                
-                for region in regions:
-                    try:
-                        routers_client = compute_v1.RoutersClient(credentials=credentials)
-                        routers = routers_client.list(project=project_id, region=region.name)
+        async def _discover_cloud_routers():
+            if compute_v1:
+                try:
+                    logger.info("Starting Cloud Router discovery")
+                    routers_client = _get_client(compute_v1.RoutersClient, credentials)
+                    scoped_routers = await _list_in_pool(lambda: routers_client.aggregated_list(
+                        request=compute_v1.AggregatedListRoutersRequest(project=project_id, return_partial_success=True)
+                    ))
+                    
+                    for scope, scoped_list in scoped_routers:
+                        region_name = _last_segment(scope)
+                        routers = scoped_list.routers
                         
                         for router in routers:
-                            print(f"Found Cloud Router: {router.name} in {region.name}")
+                            logger.debug("Found Cloud Router: %s in %s", router.name, region_name)
                             resource_data = {
-                                'credentials_id': ObjectId(credentials_id),
-                                'resource_id': f"{region.name}/{router.name}",
+                                'credentials_id': credentials_oid,
+                                'resource_id': f"{region_name}/{router.name}",
                                 'resource_name': router.name,
                                 'service_type': GCPServiceType.CLOUD_ROUTERS,
                                 'zone': None,
-                                'region': region.name,
+                                'region': region_name,
                                 'labels': {},
                                 'metadata': {
                                     'network': router.network,
@@ -536,43 +893,48 @@ async def discover_gcp_resources(credentials_id: str, service_account_key: Dict[
                                     'nats_count': len(router.nats) if router.nats else 0
                                 },
                                 'monitoring_enabled': True,
-                                'created_at': datetime.utcnow(),
-                                'updated_at': datetime.utcnow()
+                                'created_at': now,
+                                'updated_at': now
                             }
-                            discovered_resources.append(resource_data)
-                    except Exception as e:
-                        print(f"Error discovering routers in {region.name}: {str(e)}")
-                        continue
-            except Exception as e:
-                print(f"Error discovering Cloud Router resources: {str(e)}")
+                            await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering Cloud Router resources")
+            
+            await writer.flush()
         
         # Discover Cloud Run services
-        if run_v2:
-            try:
-                print("Starting Cloud Run discovery...")
-                services_client = run_v2.ServicesClient(credentials=credentials)
-                
-                # Get all regions for the project to search for Cloud Run services
-                regions_client = compute_v1.RegionsClient(credentials=credentials)
-                regions = regions_client.list(project=project_id)
-                
-                for region in regions:
-                    try:
-                        parent = f"projects/{project_id}/locations/{region.name}"
-                        services = services_client.list_services(parent=parent)
+        async def _discover_cloud_run():
+            if run_v2:
+                try:
+                    logger.info("Starting Cloud Run discovery")
+                    services_client = _get_client(run_v2.ServicesClient, credentials)
+                    
+                    # Search every region of the project for Cloud Run services
+                    regions = await regions_task
+                    region_results = await _gather_per_location(
+                        regions,
+                        lambda region: services_client.list_services(
+                            parent=f"projects/{project_id}/locations/{region.name}"
+                        )
+                    )
+                    
+                    for region, services in zip(regions, region_results):
+                        if isinstance(services, Exception):
+                            logger.warning("Error discovering Cloud Run services in %s: %s", region.name, services)
+                            continue
                         
                         for service in services:
-                            print(f"Found Cloud Run service: {service.name}")
-                            service_name = service.name.split('/')[-1]
+                            logger.debug("Found Cloud Run service: %s", service.name)
+                            service_name = _last_segment(service.name)
                             
                             resource_data = {
-                                'credentials_id': ObjectId(credentials_id),
+                                'credentials_id': credentials_oid,
                                 'resource_id': service.name,
                                 'resource_name': service_name,
                                 'service_type': GCPServiceType.CLOUD_RUN,
                                 'zone': None,
                                 'region': region.name,
-                                'labels': dict(service.labels) if service.labels else {},
+                                'labels': dict(service.labels),
                                 'metadata': {
                                     'uri': service.uri,
                                     'generation': service.generation,
@@ -580,116 +942,122 @@ async def discover_gcp_resources(credentials_id: str, service_account_key: Dict[
                                     'update_timestamp': service.update_time.isoformat() if service.update_time else None
                                 },
                                 'monitoring_enabled': True,
-                                'created_at': datetime.utcnow(),
-                                'updated_at': datetime.utcnow()
+                                'created_at': now,
+                                'updated_at': now
                             }
-                            discovered_resources.append(resource_data)
-                    except Exception as e:
-                        print(f"Error discovering Cloud Run services in {region.name}: {str(e)}")
-                        continue
-            except Exception as e:
-                print(f"Error discovering Cloud Run resources: {str(e)}")
+                            await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering Cloud Run resources")
+            
+            await writer.flush()
         
         # Discover Google Kubernetes Engine (GKE) clusters
-        if container_v1:
-            try:
-                print("Starting GKE discovery...")
-                cluster_manager_client = container_v1.ClusterManagerClient(credentials=credentials)
-                
-                # Get all zones and regions for the project to search for GKE clusters
-                zones_client = compute_v1.ZonesClient(credentials=credentials)
-                zones = zones_client.list(project=project_id)
-                
-                for zone in zones:
-                    try:
-                        parent = f"projects/{project_id}/locations/{zone.name}"
-                        clusters = cluster_manager_client.list_clusters(parent=parent)
+        async def _discover_gke():
+            if container_v1:
+                try:
+                    logger.info("Starting GKE discovery")
+                    cluster_manager_client = _get_client(container_v1.ClusterManagerClient, credentials)
+                    
+                    # The '-' location lists zonal and regional clusters in every location at once
+                    clusters = await _run_in_pool(
+                        lambda: cluster_manager_client.list_clusters(parent=f"projects/{project_id}/locations/-")
+                    )
+                    for location in clusters.missing_zones:
+                        logger.warning("GKE clusters in %s could not be listed", location)
+                    
+                    for cluster in clusters.clusters:
+                        location = cluster.location
+                        is_zonal = location.count('-') > 1
+                        logger.debug("Found GKE cluster: %s in %s", cluster.name, location)
                         
-                        for cluster in clusters.clusters:
-                            print(f"Found GKE cluster: {cluster.name} in {zone.name}")
-                            
-                            resource_data = {
-                                'credentials_id': ObjectId(credentials_id),
-                                'resource_id': f"{zone.name}/{cluster.name}",
-                                'resource_name': cluster.name,
-                                'service_type': GCPServiceType.KUBERNETES_ENGINE,
-                                'zone': zone.name,
-                                'region': zone.region.split('/')[-1] if zone.region else None,
-                                'labels': dict(cluster.resource_labels) if cluster.resource_labels else {},
-                                'metadata': {
-                                    'status': cluster.status.name if cluster.status else 'UNKNOWN',
-                                    'current_master_version': cluster.current_master_version,
-                                    'current_node_version': cluster.current_node_version,
-                                    'initial_node_count': cluster.initial_node_count,
-                                    'endpoint': cluster.endpoint,
-                                    'network': cluster.network,
-                                    'subnetwork': cluster.subnetwork
-                                },
-                                'monitoring_enabled': True,
-                                'created_at': datetime.utcnow(),
-                                'updated_at': datetime.utcnow()
-                            }
-                            discovered_resources.append(resource_data)
-                    except Exception as e:
-                        print(f"Error discovering GKE clusters in {zone.name}: {str(e)}")
-                        continue
-            except Exception as e:
-                print(f"Error discovering GKE resources: {str(e)}")
+                        resource_data = {
+                            'credentials_id': credentials_oid,
+                            'resource_id': f"{location}/{cluster.name}",
+                            'resource_name': cluster.name,
+                            'service_type': GCPServiceType.KUBERNETES_ENGINE,
+                            'zone': location if is_zonal else None,
+                            'region': _zone_region(location) if is_zonal else location,
+                            'labels': dict(cluster.resource_labels),
+                            'metadata': {
+                                'status': cluster.status.name if cluster.status else 'UNKNOWN',
+                                'current_master_version': cluster.current_master_version,
+                                'current_node_version': cluster.current_node_version,
+                                'initial_node_count': cluster.initial_node_count,
+                                'endpoint': cluster.endpoint,
+                                'network': cluster.network,
+                                'subnetwork': cluster.subnetwork
+                            },
+                            'monitoring_enabled': True,
+                            'created_at': now,
+                            'updated_at': now
+                        }
+                        await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering GKE resources")
+            
+            await writer.flush()
         
         # Discover Cloud DNS zones
-        if dns:
-            try:
-                print("Starting Cloud DNS discovery...")
-                dns_client = dns.Client(credentials=credentials, project=project_id)
-                zones = dns_client.list_zones()
-                
-                for zone in zones:
-                    print(f"Found Cloud DNS zone: {zone.name}")
+        async def _discover_dns():
+            if dns:
+                try:
+                    logger.info("Starting Cloud DNS discovery")
+                    dns_client = _get_client(dns.Client, credentials, project=project_id)
+                    zones = await _list_in_pool(dns_client.list_zones)
                     
-                    resource_data = {
-                        'credentials_id': ObjectId(credentials_id),
-                        'resource_id': zone.name,
-                        'resource_name': zone.name,
-                        'service_type': GCPServiceType.CLOUD_DNS,
-                        'zone': None,
-                        'region': 'global',
-                        'labels': {},
-                        'metadata': {
-                            'dns_name': zone.dns_name,
-                            'description': zone.description,
-                            'creation_time': zone.created.isoformat() if zone.created else None
-                        },
-                        'monitoring_enabled': True,
-                        'created_at': datetime.utcnow(),
-                        'updated_at': datetime.utcnow()
-                    }
-                    discovered_resources.append(resource_data)
-            except Exception as e:
-                print(f"Error discovering Cloud DNS resources: {str(e)}")
-        
-        print(f"Resource discovery completed. Found {len(discovered_resources)} total resources.")
-        
-        # Save discovered resources to database
-        if discovered_resources:
-            for resource in discovered_resources:
-                # Get service-specific collection
-                service_type = GCPServiceType(resource['service_type'])
-                collection = get_service_collection(db, service_type)
-                
-                # Check if resource already exists
-                existing = await collection.find_one({
-                    'credentials_id': resource['credentials_id'],
-                    'resource_id': resource['resource_id']
-                })
-                
-                if not existing:
-                    await collection.insert_one(resource)
+                    for zone in zones:
+                        logger.debug("Found Cloud DNS zone: %s", zone.name)
+                        
+                        resource_data = {
+                            'credentials_id': credentials_oid,
+                            'resource_id': zone.name,
+                            'resource_name': zone.name,
+                            'service_type': GCPServiceType.CLOUD_DNS,
+                            'zone': None,
+                            'region': 'global',
+                            'labels': {},
+                            'metadata': {
+                                'dns_name': zone.dns_name,
+                                'description': zone.description,
+                                'creation_time': zone.created.isoformat() if zone.created else None
+                            },
+                            'monitoring_enabled': True,
+                            'created_at': now,
+                            'updated_at': now
+                        }
+                        await writer.add(resource_data)
+                except Exception:
+                    logger.exception("Error discovering Cloud DNS resources")
+            
+            await writer.flush()
+        
+        # The services share nothing, so discover them all at once; each phase
+        # handles its own errors and the writer is shared
+        await asyncio.gather(
+            _discover_compute_engine(),
+            _discover_storage(),
+            _discover_cloud_sql(),
+            _discover_firestore(),
+            _discover_cloud_functions(),
+            _discover_pubsub(),
+            _discover_load_balancers(),
+            _discover_vpc_networks(),
+            _discover_cloud_routers(),
+            _discover_cloud_run(),
+            _discover_gke(),
+            _discover_dns()
+        )
+        await writer.flush()
         
-        return discovered_resources
+        logger.info("Resource discovery completed. Found %s total resources.", writer.count)
+        return writer.count
         
-    except Exception as e:
-        print(f"Error in resource discovery: {str(e)}")
-        return []
+    except Exception:
+        logger.exception("Error in resource discovery")
+        return writer.count
+    finally:
+        if regions_task is not None and not regions_task.done():
+            regions_task.cancel()
 
 async def discover_gcp_resources_filtered(
     credentials_id: str, 
@@ -700,126 +1068,130 @@ async def discover_gcp_resources_filtered(
 ) -> List[Dict[str, Any]]:
     """Discover GCP resources with optional region/zone filtering"""
     discovered_resources = []
+    # One timestamp for the whole run
+    now = datetime.now()
     
     try:
-        print(f"Starting filtered resource discovery for credentials_id: {credentials_id}")
+        logger.info("Starting filtered resource discovery for credentials_id: %s", credentials_id)
+        credentials_oid = ObjectId(credentials_id)
         if regions:
-            print(f"Filtering by regions: {regions}")
+            logger.info("Filtering by regions: %s", regions)
         if zones:
-            print(f"Filtering by zones: {zones}")
+            logger.info("Filtering by zones: %s", zones)
             
         # Create credentials from service account key
-        credentials = service_account.Credentials.from_service_account_info(service_account_key)
+        credentials = _get_credentials(service_account_key)
         project_id = service_account_key['project_id']
-        print(f"Project ID: {project_id}")
+        logger.debug("Project ID: %s", project_id)
         
         # Discover Compute Engine instances with filtering
         if compute_v1:
             try:
-                instances_client = compute_v1.InstancesClient(credentials=credentials)
+                instances_client = _get_client(compute_v1.InstancesClient, credentials)
                 
                 # Get all zones if no specific zones provided
-                target_zones = zones if zones else []
-                if not target_zones and regions:
-                    # Get zones for specified regions
-                    zones_client = compute_v1.ZonesClient(credentials=credentials)
-                    zones_request = compute_v1.ListZonesRequest(project=project_id)
-                    all_zones = zones_client.list(request=zones_request)
-                    
-                    for zone in all_zones:
-                        zone_region = zone.region.split('/')[-1] if zone.region else 'unknown'
-                        if zone_region in regions:
-                            target_zones.append(zone.name)
-                elif not target_zones and not regions:
-                    # Get all zones if no filtering
-                    zones_client = compute_v1.ZonesClient(credentials=credentials)
-                    zones_request = compute_v1.ListZonesRequest(project=project_id)
-                    all_zones = zones_client.list(request=zones_request)
-                    target_zones = [zone.name for zone in all_zones]
+                zone_regions = {}
+                if zones:
+                    # Each zone is listed once even if the caller repeats it
+                    target_zones = list(dict.fromkeys(zones))
+                else:
+                    zone_regions = _zone_regions(await _get_zones(project_id, credentials))
+                    if regions:
+                        # Get zones for specified regions
+                        region_set = frozenset(regions)
+                        target_zones = [zone for zone, region in zone_regions.items() if region in region_set]
+                    else:
+                        target_zones = list(zone_regions)
                 
-                # Discover instances in target zones
-                for zone in target_zones:
-                    print(f"Checking zone {zone} for instances...")
-                    try:
-                        request = compute_v1.ListInstancesRequest(
-                            project=project_id,
-                            zone=zone
-                        )
-                        instances = instances_client.list(request=request)
-                        
-                        for instance in instances:
-                            print(f"Found instance: {instance.name} in zone {zone}")
-                            resource = {
-                                "credentials_id": credentials_id,
-                                "resource_id": str(instance.id),
-                                "name": instance.name,
-                                "type": "compute_instance",
-                                "service_type": GCPServiceType.COMPUTE_ENGINE,
-                                "zone": zone,
-                                "region": zone.rsplit('-', 1)[0] if '-' in zone else zone,
-                                "status": instance.status,
-                                "machine_type": instance.machine_type.split('/')[-1] if instance.machine_type else "unknown",
-                                "created_at": datetime.now(),
-                                "last_updated": datetime.now(),
-                                "metadata": {
-                                    "self_link": instance.self_link,
-                                    "description": instance.description,
-                                    "tags": list(instance.tags.items) if instance.tags else [],
-                                    "machine_type": instance.machine_type.split('/')[-1] if instance.machine_type else "unknown",
-                                    "status": instance.status,
-                                    "network_interfaces": [
-                                        {
-                                            "name": ni.name,
-                                            "network": ni.network.split('/')[-1] if ni.network else "unknown",
-                                            "internal_ip": ni.network_ip if hasattr(ni, 'network_ip') else "unknown",
-                                            "external_ip": ni.access_configs[0].nat_ip if ni.access_configs and hasattr(ni.access_configs[0], 'nat_ip') else "none"
-                                        } for ni in instance.network_interfaces
-                                    ] if instance.network_interfaces else []
-                                }
-                            }
-                            discovered_resources.append(resource)
-                            
-                            # Store in database (upsert to avoid duplicates)
-                            service_type = GCPServiceType(resource["service_type"])
-                            collection = get_service_collection(db, service_type)
-                            await collection.replace_one(
-                                {
-                                    "credentials_id": resource["credentials_id"],
-                                    "resource_id": resource["resource_id"]
-                                },
-                                resource,
-                                upsert=True
-                            )
-                            
-                    except Exception as zone_error:
-                        print(f"Error checking zone {zone}: {str(zone_error)}")
+                # Discover instances in all target zones concurrently
+                zone_results = await _gather_per_location(
+                    target_zones,
+                    lambda zone: instances_client.list(request=compute_v1.ListInstancesRequest(
+                        project=project_id,
+                        zone=zone
+                    ))
+                )
+                
+                for zone, instances in zip(target_zones, zone_results):
+                    if isinstance(instances, Exception):
+                        logger.warning("Error checking zone %s: %s", zone, instances)
                         continue
+                    
+                    region_name = zone_regions.get(zone) or _zone_region(zone)
+                    for instance in instances:
+                        logger.debug("Found instance: %s in zone %s", instance.name, zone)
+                        # Read each proto field once; the values are repeated in metadata
+                        machine_type = _last_segment(instance.machine_type) or "unknown"
+                        status = instance.status
+                        resource = {
+                            "credentials_id": credentials_oid,
+                            "resource_id": str(instance.id),
+                            "name": instance.name,
+                            "type": "compute_instance",
+                            "service_type": GCPServiceType.COMPUTE_ENGINE,
+                            "zone": zone,
+                            "region": region_name,
+                            "status": status,
+                            "machine_type": machine_type,
+                            "created_at": now,
+                            "last_updated": now,
+                            "metadata": {
+                                "self_link": instance.self_link,
+                                "description": instance.description,
+                                "tags": list(instance.tags.items) if instance.tags else [],
+                                "machine_type": machine_type,
+                                "status": status,
+                                "network_interfaces": [
+                                    _network_interface_summary(ni) for ni in instance.network_interfaces
+                                ]
+                            }
+                        }
+                        discovered_resources.append(resource)
+                
+                # Store in database (upsert to avoid duplicates)
+                collection = get_service_collection(db, GCPServiceType.COMPUTE_ENGINE)
+                replacements = [
+                    ReplaceOne(
+                        {
+                            "credentials_id": resource["credentials_id"],
+                            "resource_id": resource["resource_id"]
+                        },
+                        resource,
+                        upsert=True
+                    )
+                    for resource in discovered_resources
+                ]
+                for start in range(0, len(replacements), _DISCOVERY_WRITE_BATCH_SIZE):
+                    await collection.bulk_write(replacements[start:start + _DISCOVERY_WRITE_BATCH_SIZE], ordered=False)
                         
-            except Exception as compute_error:
-                print(f"Error discovering compute instances: {str(compute_error)}")
+            except Exception:
+                logger.exception("Error discovering compute instances")
         
-        print(f"Filtered resource discovery completed. Found {len(discovered_resources)} resources.")
+        logger.info("Filtered resource discovery completed. Found %s resources.", len(discovered_resources))
         return discovered_resources
         
-    except Exception as e:
-        print(f"Error in filtered resource discovery: {str(e)}")
+    except Exception:
+        logger.exception("Error in filtered resource discovery")
         return []
 
+
 async def validate_gcp_credentials(service_account_key: Dict[str, Any], skip_api_validation: bool = True) -> bool:
     """Validate GCP service account credentials"""
     try:
         # Basic validation - check required fields in service account key
-        required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email']
-        for field in required_fields:
-            if field not in service_account_key:
-                raise HTTPException(status_code=400, detail=f"Missing required field in service account key: {field}")
+        missing_fields = SERVICE_ACCOUNT_REQUIRED_FIELDS - service_account_key.keys()
+        if missing_fields:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Missing required field(s) in service account key: {', '.join(sorted(missing_fields))}"
+            )
         
         if service_account_key.get('type') != 'service_account':
             raise HTTPException(status_code=400, detail="Invalid service account key type")
         
-        # Validate email format (basic check)
-        client_email = service_account_key.get('client_email', '')
-        if not ('@' in client_email and '.' in client_email):
+        # Validate email format (basic check): a local part and a dotted domain
+        local_part, at, domain = str(service_account_key['client_email']).rpartition('@')
+        if not (local_part and at and '.' in domain):
             raise HTTPException(status_code=400, detail="Invalid client_email format")
         
         # Skip API validation by default (for faster credential creation)
@@ -831,37 +1203,29 @@ async def validate_gcp_credentials(service_account_key: Dict[str, Any], skip_api
             raise HTTPException(status_code=500, detail="GCP monitoring library not available")
             
         # Create credentials from service account key
-        credentials = service_account.Credentials.from_service_account_info(service_account_key)
+        credentials = _get_credentials(service_account_key)
         
         # Optional API validation with timeout (only when explicitly requested)
-        import asyncio
-        import concurrent.futures
-        
         def _test_api_access():
-            """Test API access in a separate thread with timeout"""
-            client = monitoring_v3.MetricServiceClient(credentials=credentials)
+            """Test API access on the discovery pool"""
+            client = _get_client(monitoring_v3.MetricServiceClient, credentials)
             project_name = f"projects/{service_account_key['project_id']}"
             request = monitoring_v3.ListMetricDescriptorsRequest(
                 name=project_name,
                 page_size=1
             )
             response = client.list_metric_descriptors(request=request)
-            list(response)  # Force evaluation
+            next(iter(response), None)  # Fetch the first page only
             return True
         
         # Run API validation with 10-second timeout
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(_test_api_access)
-            try:
-                await asyncio.wait_for(
-                    asyncio.wrap_future(future),
-                    timeout=10.0
-                )
-            except asyncio.TimeoutError:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="GCP API validation timed out. Credentials may be valid but API is slow to respond."
-                )
+        try:
+            await asyncio.wait_for(_run_in_pool(_test_api_access), timeout=10.0)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=400, 
+                detail="GCP API validation timed out. Credentials may be valid but API is slow to respond."
+            )
         
         return True
     except HTTPException:
@@ -869,6 +1233,41 @@ async def validate_gcp_credentials(service_account_key: Dict[str, Any], skip_api
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid GCP credentials: {str(e)}")
 
+def _credentials_object_id(credentials_id: str) -> ObjectId:
+    """Parse the credentials_id path parameter, rejecting malformed IDs"""
+    try:
+        return ObjectId(credentials_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid credentials ID format")
+
+
+# Fields returned by the credentials endpoints. The key itself stays on the server;
+# only whether one is stored is projected.
+_CREDENTIALS_RESPONSE_PROJECTION = {
+    "name": 1,
+    "project_id": 1,
+    "enabled": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "last_used": 1,
+    "has_service_account_key": {"$ne": [{"$type": "$service_account_key"}, "missing"]},
+}
+
+
+def _credentials_response(cred: Dict[str, Any]) -> GCPCredentialsResponse:
+    """Build the API response from a document read with _CREDENTIALS_RESPONSE_PROJECTION"""
+    return GCPCredentialsResponse(
+        id=str(cred["_id"]),
+        name=cred["name"],
+        project_id=cred["project_id"],
+        enabled=cred["enabled"],
+        created_at=cred["created_at"],
+        updated_at=cred["updated_at"],
+        last_used=cred.get("last_used"),
+        has_service_account_key=cred["has_service_account_key"]
+    )
+
+
 # GCP Credentials Management
 @router.post("/credentials", response_model=GCPCredentialsResponse)
 async def create_gcp_credentials(
@@ -948,44 +1347,27 @@ async def create_gcp_credentials(
 async def list_gcp_credentials(db=Depends(get_database)):
     """List all GCP credentials configurations"""
     try:
-        cursor = db.gcp_credentials.find({})
+        cursor = db.gcp_credentials.find({}, _CREDENTIALS_RESPONSE_PROJECTION)
         credentials = await cursor.to_list(length=None)
         
-        return [
-            GCPCredentialsResponse(
-                id=str(cred["_id"]),
-                name=cred["name"],
-                project_id=cred["project_id"],
-                enabled=cred["enabled"],
-                created_at=cred["created_at"],
-                updated_at=cred["updated_at"],
-                last_used=cred.get("last_used"),
-                has_service_account_key="service_account_key" in cred
-            )
-            for cred in credentials
-        ]
+        return [_credentials_response(cred) for cred in credentials]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list GCP credentials: {str(e)}")
 
 @router.get("/credentials/{credentials_id}", response_model=GCPCredentialsResponse)
-async def get_gcp_credentials(credentials_id: str, db=Depends(get_database)):
+async def get_gcp_credentials(
+    credentials_id: str,
+    credentials_oid: ObjectId = Depends(_credentials_object_id),
+    db=Depends(get_database)
+):
     """Get specific GCP credentials configuration"""
     try:
-        cred = await db.gcp_credentials.find_one({"_id": ObjectId(credentials_id)})
+        cred = await db.gcp_credentials.find_one({"_id": credentials_oid}, _CREDENTIALS_RESPONSE_PROJECTION)
         if not cred:
             raise HTTPException(status_code=404, detail="GCP credentials not found")
         
-        return GCPCredentialsResponse(
-            id=str(cred["_id"]),
-            name=cred["name"],
-            project_id=cred["project_id"],
-            enabled=cred["enabled"],
-            created_at=cred["created_at"],
-            updated_at=cred["updated_at"],
-            last_used=cred.get("last_used"),
-            has_service_account_key="service_account_key" in cred
-        )
+        return _credentials_response(cred)
         
     except HTTPException:
         raise
@@ -994,8 +1376,9 @@ async def get_gcp_credentials(credentials_id: str, db=Depends(get_database)):
 
 @router.put("/credentials/{credentials_id}", response_model=GCPCredentialsResponse)
 async def update_gcp_credentials(
-    credentials_id: str, 
+    credentials_id: str,
     update_data: GCPCredentialsUpdate, 
+    credentials_oid: ObjectId = Depends(_credentials_object_id),
     validate_api: bool = False,
     db=Depends(get_database)
 ):
@@ -1008,11 +1391,6 @@ async def update_gcp_credentials(
         db: Database dependency
     """
     try:
-        # Check if credentials exist
-        existing = await db.gcp_credentials.find_one({"_id": ObjectId(credentials_id)})
-        if not existing:
-            raise HTTPException(status_code=404, detail="GCP credentials not found")
-        
         update_dict = {"updated_at": datetime.utcnow()}
         
         # Update fields
@@ -1028,25 +1406,26 @@ async def update_gcp_credentials(
             await validate_gcp_credentials(update_data.service_account_key, skip_api_validation=not validate_api)
             update_dict["service_account_key"] = update_data.service_account_key  # Store plain JSON
         
-        # Update document
-        await db.gcp_credentials.update_one(
-            {"_id": ObjectId(credentials_id)},
-            {"$set": update_dict}
+        # Update and read back in one round trip. A replaced key needs the previous
+        # document instead, so the cached credentials for the old key can be dropped.
+        key_replaced = "service_account_key" in update_dict
+        updated = await db.gcp_credentials.find_one_and_update(
+            {"_id": credentials_oid},
+            {"$set": update_dict},
+            projection=(
+                {**_CREDENTIALS_RESPONSE_PROJECTION, "service_account_key": 1}
+                if key_replaced else _CREDENTIALS_RESPONSE_PROJECTION
+            ),
+            return_document=ReturnDocument.BEFORE if key_replaced else ReturnDocument.AFTER
         )
+        if not updated:
+            raise HTTPException(status_code=404, detail="GCP credentials not found")
         
-        # Get updated document
-        updated = await db.gcp_credentials.find_one({"_id": ObjectId(credentials_id)})
+        if key_replaced:
+            _forget_credentials(updated.get("service_account_key"))
+            updated.update(update_dict, has_service_account_key=True)
         
-        return GCPCredentialsResponse(
-            id=str(updated["_id"]),
-            name=updated["name"],
-            project_id=updated["project_id"],
-            enabled=updated["enabled"],
-            created_at=updated["created_at"],
-            updated_at=updated["updated_at"],
-            last_used=updated.get("last_used"),
-            has_service_account_key="service_account_key" in updated
-        )
+        return _credentials_response(updated)
         
     except HTTPException:
         raise
@@ -1054,22 +1433,28 @@ async def update_gcp_credentials(
         raise HTTPException(status_code=500, detail=f"Failed to update GCP credentials: {str(e)}")
 
 @router.delete("/credentials/{credentials_id}")
-async def delete_gcp_credentials(credentials_id: str, db=Depends(get_database)):
+async def delete_gcp_credentials(
+    credentials_id: str,
+    credentials_oid: ObjectId = Depends(_credentials_object_id),
+    db=Depends(get_database)
+):
     """Delete GCP credentials configuration"""
     try:
-        # Check if credentials exist
-        existing = await db.gcp_credentials.find_one({"_id": ObjectId(credentials_id)})
-        if not existing:
+        # Delete the credentials and their resources together; the deleted document
+        # carries the key whose cached credentials should be dropped
+        resource_filter = {"credentials_id": credentials_oid}
+        resource_collections = [db.gcp_resources, *get_all_service_collections(db).values()]
+        deleted, *_ = await asyncio.gather(
+            db.gcp_credentials.find_one_and_delete(
+                {"_id": credentials_oid},
+                projection={"service_account_key": 1}
+            ),
+            *(collection.delete_many(resource_filter) for collection in resource_collections)
+        )
+        if not deleted:
             raise HTTPException(status_code=404, detail="GCP credentials not found")
         
-        # Delete associated resources first
-        await db.gcp_resources.delete_many({"credentials_id": ObjectId(credentials_id)})
-        
-        # Delete credentials
-        result = await db.gcp_credentials.delete_one({"_id": ObjectId(credentials_id)})
-        
-        if result.deleted_count == 0:
-            raise HTTPException(status_code=404, detail="GCP credentials not found")
+        _forget_credentials(deleted.get("service_account_key"))
         
         return {"message": "GCP credentials deleted successfully"}
         
@@ -1082,12 +1467,21 @@ async def delete_gcp_credentials(credentials_id: str, db=Depends(get_database)):
 @router.get("/regions/{credentials_id}")
 async def get_available_regions(
     credentials_id: str,
+    credentials_oid: ObjectId = Depends(_credentials_object_id),
+    force_refresh: bool = False,
     db=Depends(get_database)
 ):
-    """Get available GCP regions and zones for the given credentials"""
+    """Get available GCP regions and zones for the given credentials
+    
+    Responses are cached per project for _LOCATIONS_TTL; force_refresh lists
+    the regions and zones again.
+    """
     try:
         # Get credentials
-        creds = await db.gcp_credentials.find_one({"_id": ObjectId(credentials_id)})
+        creds = await db.gcp_credentials.find_one(
+            {"_id": credentials_oid},
+            {"service_account_key": 1, "enabled": 1}
+        )
         if not creds:
             raise HTTPException(status_code=404, detail="GCP credentials not found")
         
@@ -1096,30 +1490,28 @@ async def get_available_regions(
         
         # Create credentials from service account key
         service_account_key = creds["service_account_key"]
-        credentials = service_account.Credentials.from_service_account_info(service_account_key)
         project_id = service_account_key['project_id']
         
+        cached = _regions_response_cache.get(project_id)
+        if cached and not force_refresh and time.monotonic() - cached[0] < _LOCATIONS_TTL:
+            return cached[1]
+        
+        credentials = _get_credentials(service_account_key)
         regions_zones = []
         
         if compute_v1:
             try:
-                # Get all regions
-                regions_client = compute_v1.RegionsClient(credentials=credentials)
-                regions_request = compute_v1.ListRegionsRequest(project=project_id)
-                regions = regions_client.list(request=regions_request)
-                
-                # Get zones for each region
-                zones_client = compute_v1.ZonesClient(credentials=credentials)
-                zones_request = compute_v1.ListZonesRequest(project=project_id)
-                zones = zones_client.list(request=zones_request)
+                # Get all regions and zones
+                regions, zones = await asyncio.gather(
+                    _get_regions(project_id, credentials, force_refresh),
+                    _get_zones(project_id, credentials, force_refresh)
+                )
                 
                 # Group zones by region
+                zone_regions = _zone_regions(zones)
                 region_zone_map = {}
                 for zone in zones:
-                    region_name = zone.region.split('/')[-1] if zone.region else 'unknown'
-                    if region_name not in region_zone_map:
-                        region_zone_map[region_name] = []
-                    region_zone_map[region_name].append({
+                    region_zone_map.setdefault(zone_regions[zone.name], []).append({
                         'name': zone.name,
                         'status': zone.status
                     })
@@ -1133,9 +1525,13 @@ async def get_available_regions(
                         'zones': region_zone_map.get(region.name, [])
                     }
                     regions_zones.append(region_data)
+                
+                response = {"regions": regions_zones}
+                _regions_response_cache[project_id] = (time.monotonic(), response)
+                return response
                     
-            except Exception as e:
-                print(f"Error fetching regions/zones: {str(e)}")
+            except Exception:
+                logger.exception("Error fetching regions/zones")
                 # Return a default set of common regions if API fails
                 regions_zones = [
                     {'name': 'us-central1', 'description': 'Iowa', 'status': 'UP', 'zones': [{'name': 'us-central1-a', 'status': 'UP'}, {'name': 'us-central1-b', 'status': 'UP'}, {'name': 'us-central1-c', 'status': 'UP'}]},
@@ -1156,6 +1552,7 @@ async def get_available_regions(
 async def discover_resources_for_credentials(
     credentials_id: str,
     background_tasks: BackgroundTasks,
+    credentials_oid: ObjectId = Depends(_credentials_object_id),
     regions: Optional[List[str]] = None,
     zones: Optional[List[str]] = None,
     db=Depends(get_database)
@@ -1163,7 +1560,7 @@ async def discover_resources_for_credentials(
     """Manually trigger resource discovery for existing credentials"""
     try:
         # Get credentials
-        creds = await db.gcp_credentials.find_one({"_id": ObjectId(credentials_id)})
+        creds = await db.gcp_credentials.find_one({"_id": credentials_oid})
         if not creds:
             raise HTTPException(status_code=404, detail="GCP credentials not found")
         
@@ -1201,22 +1598,16 @@ async def discover_resources_for_credentials(
 async def create_gcp_resource(resource: GCPResourceCreate, db=Depends(get_database)):
     """Create new GCP resource for monitoring"""
     try:
+        credentials_oid = ObjectId(resource.credentials_id)
+        
         # Validate credentials exist
-        creds = await db.gcp_credentials.find_one({"_id": ObjectId(resource.credentials_id)})
+        creds = await db.gcp_credentials.find_one({"_id": credentials_oid}, {"_id": 1})
         if not creds:
             raise HTTPException(status_code=404, detail="GCP credentials not found")
         
-        # Check if resource already exists
-        existing = await db.gcp_resources.find_one({
-            "credentials_id": ObjectId(resource.credentials_id),
-            "resource_id": resource.resource_id
-        })
-        if existing:
-            raise HTTPException(status_code=400, detail="Resource already exists")
-        
         # Create resource document
         resource_doc = GCPResource(
-            credentials_id=ObjectId(resource.credentials_id),
+            credentials_id=credentials_oid,
             resource_id=resource.resource_id,
             resource_name=resource.resource_name,
             service_type=resource.service_type,
@@ -1229,10 +1620,22 @@ async def create_gcp_resource(resource: GCPResourceCreate, db=Depends(get_databa
             updated_at=datetime.utcnow()
         )
         
-        result = await db.gcp_resources.insert_one(resource_doc.dict(by_alias=True, exclude={"id"}))
+        # Insert only if the resource is not registered yet; the unique
+        # (credentials_id, resource_id) index makes this safe against concurrent requests
+        try:
+            result = await db.gcp_resources.update_one(
+                {"credentials_id": credentials_oid, "resource_id": resource.resource_id},
+                {"$setOnInsert": resource_doc.dict(by_alias=True, exclude={"id"})},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # A concurrent request registered it between the match and the insert
+            result = None
+        if result is None or result.upserted_id is None:
+            raise HTTPException(status_code=400, detail="Resource already exists")
         
         return GCPResourceResponse(
-            id=str(result.inserted_id),
+            id=str(result.upserted_id),
             credentials_id=resource.credentials_id,
             resource_id=resource.resource_id,
             resource_name=resource.resource_name,
@@ -1251,6 +1654,34 @@ async def create_gcp_resource(resource: GCPResourceCreate, db=Depends(get_databa
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create GCP resource: {str(e)}")
 
+# Stored fields the resource list responses are built from; discovery bookkeeping
+# such as metadata_hash stays on the server
+_RESOURCE_RESPONSE_PROJECTION = {
+    "credentials_id": 1,
+    "resource_id": 1,
+    "resource_name": 1,
+    "name": 1,
+    "service_type": 1,
+    "zone": 1,
+    "region": 1,
+    "labels": 1,
+    "metadata": 1,
+    "monitoring_enabled": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "last_updated": 1,
+}
+
+# The grouped VM view only shows the first network interface of each instance
+_GROUPED_VM_PROJECTION = {
+    "name": 1,
+    "zone": 1,
+    "status": 1,
+    "machine_type": 1,
+    "metadata.network_interfaces": {"$slice": 1},
+}
+
+
 @router.get("/resources", response_model=List[GCPResourceResponse])
 async def list_gcp_resources(credentials_id: Optional[str] = None, db=Depends(get_database)):
     """List GCP resources"""
@@ -1263,7 +1694,7 @@ async def list_gcp_resources(credentials_id: Optional[str] = None, db=Depends(ge
                 # If credentials_id is not a valid ObjectId, return empty list
                 return []
         
-        cursor = db.gcp_resources.find(query)
+        cursor = db.gcp_resources.find(query, _RESOURCE_RESPONSE_PROJECTION)
         resources = await cursor.to_list(length=None)
         
         return [
@@ -1298,7 +1729,7 @@ async def list_storage_resources_with_size(credentials_id: Optional[str] = None,
             except Exception:
                 return []
         
-        cursor = db.gcp_resources.find(query)
+        cursor = db.gcp_resources.find(query, _RESOURCE_RESPONSE_PROJECTION)
         resources = await cursor.to_list(length=None)
         
         return [
@@ -1326,7 +1757,9 @@ async def list_storage_resources_with_size(credentials_id: Optional[str] = None,
 async def get_grouped_vm_instances(db=Depends(get_database)):
     """Get all VM instances without grouping"""
     try:
-        resources = await db.gcp_resources.find({"service_type": "compute_engine"}).to_list(length=None)
+        resources = await db.gcp_resources.find(
+            {"service_type": "compute_engine"}, _GROUPED_VM_PROJECTION
+        ).to_list(length=None)
         
         instances = []
         
@@ -1367,21 +1800,65 @@ async def get_grouped_vm_instances(db=Depends(get_database)):
 
 # Service-specific endpoints for individual GCP services
 
+def _service_resource_response(resource: Dict[str, Any]) -> GCPResourceResponse:
+    """Build the API response for a stored resource of any service type"""
+    return GCPResourceResponse(
+        id=str(resource["_id"]),
+        credentials_id=str(resource["credentials_id"]),
+        resource_id=resource["resource_id"],
+        resource_name=resource.get("name", resource.get("resource_name", "")),
+        service_type=resource["service_type"],
+        zone=resource.get("zone"),
+        region=resource.get("region"),
+        labels=resource.get("labels", {}),
+        metadata=resource.get("metadata", {}),
+        monitoring_enabled=resource.get("monitoring_enabled", True),
+        created_at=resource["created_at"],
+        updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
+    )
+
+
+async def _list_by_service_type(
+    service_type: GCPServiceType,
+    credentials_id: Optional[str],
+    db,
+    label: str
+) -> List[GCPResourceResponse]:
+    """List stored resources of one service type, optionally for one set of credentials"""
+    try:
+        query_filter = {"service_type": service_type}
+        if credentials_id:
+            if not validate_object_id(credentials_id):
+                # A malformed ID cannot match any stored credentials reference
+                return []
+            query_filter["credentials_id"] = ObjectId(credentials_id)
+        
+        cursor = db.gcp_resources.find(query_filter, _RESOURCE_RESPONSE_PROJECTION)
+        resources = await cursor.to_list(length=None)
+        
+        return [_service_resource_response(resource) for resource in resources]
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list {label} resources: {str(e)}")
+
+
 @router.get("/resources/compute-engine", response_model=List[GCPResourceResponse])
 async def list_compute_engine_resources(
     credentials_id: Optional[str] = None,
     db=Depends(get_database)
 ):
     """List GCP Compute Engine instances (deduplicated, latest records only)"""
+    if credentials_id:
+        # (credentials_id, resource_id) is unique, so one set of credentials has no duplicates
+        return await _list_by_service_type(GCPServiceType.COMPUTE_ENGINE, credentials_id, db, "compute engine")
+    
     try:
-        query_filter = {"service_type": GCPServiceType.COMPUTE_ENGINE}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        # Aggregate to get the latest record for each unique resource_id
+        # The same resource can be registered under several credentials; aggregate
+        # to get the latest record for each unique resource_id
         pipeline = [
-            {"$match": query_filter},
+            {"$match": {"service_type": GCPServiceType.COMPUTE_ENGINE}},
             {"$sort": {"created_at": -1}},  # Sort by creation date descending
+            {"$project": _RESOURCE_RESPONSE_PROJECTION},
             {
                 "$group": {
                     "_id": "$resource_id",  # Group by resource_id
@@ -1394,24 +1871,7 @@ async def list_compute_engine_resources(
         cursor = db.gcp_resources.aggregate(pipeline)
         resources = await cursor.to_list(length=None)
         
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
+        return [_service_resource_response(resource) for resource in resources]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list compute engine resources: {str(e)}")
@@ -1422,35 +1882,7 @@ async def list_cloud_sql_resources(
     db=Depends(get_database)
 ):
     """List GCP Cloud SQL instances"""
-    try:
-        query_filter = {"service_type": GCPServiceType.CLOUD_SQL}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list cloud sql resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.CLOUD_SQL, credentials_id, db, "cloud sql")
 
 @router.get("/resources/cloud-functions", response_model=List[GCPResourceResponse])
 async def list_cloud_functions_resources(
@@ -1458,35 +1890,7 @@ async def list_cloud_functions_resources(
     db=Depends(get_database)
 ):
     """List GCP Cloud Functions"""
-    try:
-        query_filter = {"service_type": GCPServiceType.CLOUD_FUNCTIONS}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list cloud functions resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.CLOUD_FUNCTIONS, credentials_id, db, "cloud functions")
 
 @router.get("/resources/cloud-run", response_model=List[GCPResourceResponse])
 async def list_cloud_run_resources(
@@ -1494,35 +1898,7 @@ async def list_cloud_run_resources(
     db=Depends(get_database)
 ):
     """List GCP Cloud Run services"""
-    try:
-        query_filter = {"service_type": GCPServiceType.CLOUD_RUN}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list cloud run resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.CLOUD_RUN, credentials_id, db, "cloud run")
 
 @router.get("/resources/kubernetes-engine", response_model=List[GCPResourceResponse])
 async def list_gke_resources(
@@ -1530,35 +1906,7 @@ async def list_gke_resources(
     db=Depends(get_database)
 ):
     """List GCP GKE clusters"""
-    try:
-        query_filter = {"service_type": GCPServiceType.KUBERNETES_ENGINE}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list gke resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.KUBERNETES_ENGINE, credentials_id, db, "gke")
 
 @router.get("/resources/pubsub-topic", response_model=List[GCPResourceResponse])
 async def list_pubsub_resources(
@@ -1566,35 +1914,7 @@ async def list_pubsub_resources(
     db=Depends(get_database)
 ):
     """List GCP Pub/Sub topics"""
-    try:
-        query_filter = {"service_type": GCPServiceType.PUBSUB}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list pubsub resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.PUBSUB_TOPIC, credentials_id, db, "pubsub")
 
 @router.get("/resources/cloud-dns", response_model=List[GCPResourceResponse])
 async def list_cloud_dns_resources(
@@ -1602,35 +1922,7 @@ async def list_cloud_dns_resources(
     db=Depends(get_database)
 ):
     """List GCP Cloud DNS zones"""
-    try:
-        query_filter = {"service_type": GCPServiceType.CLOUD_DNS}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list cloud dns resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.CLOUD_DNS, credentials_id, db, "cloud dns")
 
 @router.get("/resources/load-balancing", response_model=List[GCPResourceResponse])
 async def list_load_balancer_resources(
@@ -1638,35 +1930,7 @@ async def list_load_balancer_resources(
     db=Depends(get_database)
 ):
     """List GCP Load Balancers"""
-    try:
-        query_filter = {"service_type": GCPServiceType.LOAD_BALANCER}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list load balancer resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.CLOUD_LOAD_BALANCER, credentials_id, db, "load balancer")
 
 @router.get("/resources/cloud-routers", response_model=List[GCPResourceResponse])
 async def list_cloud_router_resources(
@@ -1674,35 +1938,7 @@ async def list_cloud_router_resources(
     db=Depends(get_database)
 ):
     """List GCP Cloud Routers"""
-    try:
-        query_filter = {"service_type": GCPServiceType.CLOUD_ROUTER}
-        if credentials_id:
-            query_filter["credentials_id"] = ObjectId(credentials_id)
-        
-        cursor = db.gcp_resources.find(query_filter)
-        resources = await cursor.to_list(length=None)
-        
-        response_resources = []
-        for resource in resources:
-            response_resources.append(GCPResourceResponse(
-                id=str(resource["_id"]),
-                credentials_id=str(resource["credentials_id"]),
-                resource_id=resource["resource_id"],
-                resource_name=resource.get("name", resource.get("resource_name", "")),
-                service_type=resource["service_type"],
-                zone=resource.get("zone"),
-                region=resource.get("region"),
-                labels=resource.get("labels", {}),
-                metadata=resource.get("metadata", {}),
-                monitoring_enabled=resource.get("monitoring_enabled", True),
-                created_at=resource["created_at"],
-                updated_at=resource.get("updated_at", resource.get("last_updated", resource["created_at"]))
-            ))
-        
-        return response_resources
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list cloud router resources: {str(e)}")
+    return await _list_by_service_type(GCPServiceType.CLOUD_ROUTERS, credentials_id, db, "cloud router")
 
 # Refresh endpoints for individual services
 
@@ -2399,7 +2635,7 @@ async def _collect_metrics_task(credentials_id: Optional[str], db):
         # Process credentials sequentially
         for creds in credentials_list:
             try:
-                print(f"Starting metrics collection for credentials {creds['_id']}")
+                logger.info("Starting metrics collection for credentials %s", creds['_id'])
                 
                 # Get service account key (now stored as plain JSON)
                 service_account_key = creds["service_account_key"]
@@ -2411,12 +2647,15 @@ async def _collect_metrics_task(credentials_id: Optional[str], db):
                 })
                 resources = await resources_cursor.to_list(length=None)
                 
-                print(f"Found {len(resources)} resources to monitor for credentials {creds['_id']}")
+                logger.info("Found %s resources to monitor for credentials %s", len(resources), creds['_id'])
                 
                 # Collect metrics for each resource sequentially
                 for i, resource in enumerate(resources, 1):
                     try:
-                        print(f"Collecting metrics for resource {i}/{len(resources)}: {resource.get('name', resource['resource_id'])}")
+                        logger.debug(
+                            "Collecting metrics for resource %s/%s: %s",
+                            i, len(resources), resource.get('name', resource['resource_id'])
+                        )
                         metrics_count = await _collect_resource_metrics(service_account_key, resource, db)
                         total_metrics_collected += metrics_count
                         
@@ -2426,10 +2665,12 @@ async def _collect_metrics_task(credentials_id: Optional[str], db):
                             {"$set": {"last_monitored": datetime.utcnow()}}
                         )
                         
-                        print(f"Collected {metrics_count} metrics for resource {resource.get('name', resource['resource_id'])}")
+                        logger.debug(
+                            "Collected %s metrics for resource %s", metrics_count, resource.get('name', resource['resource_id'])
+                        )
                         
-                    except Exception as e:
-                        print(f"Error collecting metrics for resource {resource.get('name', resource['resource_id'])}: {str(e)}")
+                    except Exception:
+                        logger.exception("Error collecting metrics for resource %s", resource.get('name', resource['resource_id']))
                         # Continue with next resource instead of stopping
                         continue
                 
@@ -2443,16 +2684,16 @@ async def _collect_metrics_task(credentials_id: Optional[str], db):
                     }}
                 )
                 
-                print(f"Completed metrics collection for credentials {creds['_id']}")
+                logger.info("Completed metrics collection for credentials %s", creds['_id'])
                 
-            except Exception as e:
-                print(f"Error collecting metrics for credentials {creds['_id']}: {str(e)}")
+            except Exception:
+                logger.exception("Error collecting metrics for credentials %s", creds['_id'])
                 continue
         
-        print(f"Metrics collection completed. Total metrics collected: {total_metrics_collected}")
+        logger.info("Metrics collection completed. Total metrics collected: %s", total_metrics_collected)
         
-    except Exception as e:
-        print(f"Error in metrics collection task: {str(e)}")
+    except Exception:
+        logger.exception("Error in metrics collection task")
 
 async def _collect_resource_metrics(service_account_key: Dict[str, Any], resource: Dict[str, Any], db) -> int:
     """Collect metrics for a specific GCP resource and return count of metrics collected"""
@@ -2464,8 +2705,8 @@ async def _collect_resource_metrics(service_account_key: Dict[str, Any], resourc
             raise HTTPException(status_code=500, detail="Google Cloud libraries not installed")
         
         # Create credentials and client
-        credentials = service_account.Credentials.from_service_account_info(service_account_key)
-        client = monitoring_v3.MetricServiceClient(credentials=credentials)
+        credentials = _get_credentials(service_account_key)
+        client = _get_client(monitoring_v3.MetricServiceClient, credentials)
         
         project_name = f"projects/{service_account_key['project_id']}"
         
@@ -2485,13 +2726,13 @@ async def _collect_resource_metrics(service_account_key: Dict[str, Any], resourc
         
         service_type = resource["service_type"]
         if service_type not in metric_mappings:
-            print(f"No metric mappings found for service type: {service_type}")
+            logger.debug("No metric mappings found for service type: %s", service_type)
             return 0
         
         # Collect metrics for this service type sequentially
         for metric_name, metric_type, unit in metric_mappings[service_type]:
             try:
-                print(f"  Collecting metric: {metric_name}")
+                logger.debug("Collecting metric: %s", metric_name)
                 
                 # Query metric data
                 interval = monitoring_v3.TimeInterval({
@@ -2506,7 +2747,7 @@ async def _collect_resource_metrics(service_account_key: Dict[str, Any], resourc
                     "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL
                 })
                 
-                results = client.list_time_series(request=request)
+                results = await _list_in_pool(lambda: client.list_time_series(request=request))
                 
                 # Process results and count metrics
                 metric_points_count = 0
@@ -2537,16 +2778,16 @@ async def _collect_resource_metrics(service_account_key: Dict[str, Any], resourc
                         metric_points_count += 1
                         metrics_collected += 1
                 
-                print(f"    Collected {metric_points_count} data points for {metric_name}")
+                logger.debug("Collected %s data points for %s", metric_points_count, metric_name)
                 
-            except Exception as e:
-                print(f"Error collecting metric {metric_name} for resource {resource['resource_id']}: {str(e)}")
+            except Exception:
+                logger.exception("Error collecting metric %s for resource %s", metric_name, resource['resource_id'])
                 continue
         
         return metrics_collected
         
-    except Exception as e:
-        print(f"Error collecting metrics for resource {resource['resource_id']}: {str(e)}")
+    except Exception:
+        logger.exception("Error collecting metrics for resource %s", resource['resource_id'])
         return metrics_collected
 
 # Health check
@@ -2579,8 +2820,8 @@ async def query_time_series(query: GCPTimeSeriesQuery, db=Depends(get_database))
             raise HTTPException(status_code=404, detail=f"No enabled credentials found for project {query.project_id}")
         
         # Create credentials and client
-        credentials = service_account.Credentials.from_service_account_info(credentials_doc["service_account_key"])
-        client = monitoring_v3.MetricServiceClient(credentials=credentials)
+        credentials = _get_credentials(credentials_doc["service_account_key"])
+        client = _get_client(monitoring_v3.MetricServiceClient, credentials)
         
         # Build the request
         project_name = f"projects/{query.project_id}"
@@ -2600,7 +2841,7 @@ async def query_time_series(query: GCPTimeSeriesQuery, db=Depends(get_database))
             request.aggregation = query.aggregation
         
         # Execute the query
-        page_result = client.list_time_series(request=request)
+        page_result = await _list_in_pool(lambda: client.list_time_series(request=request))
         
         # Process results
         time_series_list = []
@@ -2618,7 +2859,7 @@ async def query_time_series(query: GCPTimeSeriesQuery, db=Depends(get_database))
                         # Convert protobuf timestamp to datetime
                         timestamp = point.interval.end_time.ToDatetime()
                 except Exception as e:
-                    print(f"Error converting timestamp: {e}")
+                    logger.warning("Error converting timestamp: %s", e)
                     timestamp = datetime.utcnow()
                 value = float(point.value.double_value or point.value.int64_value or 0)
                 points.append(GCPTimeSeriesPoint(timestamp=timestamp, value=value))
@@ -2718,8 +2959,8 @@ async def list_metric_descriptors(project_id: str, db=Depends(get_database)):
             raise HTTPException(status_code=404, detail=f"No enabled credentials found for project {project_id}")
         
         # Create credentials and client
-        credentials = service_account.Credentials.from_service_account_info(credentials_doc["service_account_key"])
-        client = monitoring_v3.MetricServiceClient(credentials=credentials)
+        credentials = _get_credentials(credentials_doc["service_account_key"])
+        client = _get_client(monitoring_v3.MetricServiceClient, credentials)
         
         # Build the request
         project_name = f"projects/{project_id}"
@@ -2729,7 +2970,7 @@ async def list_metric_descriptors(project_id: str, db=Depends(get_database)):
         )
         
         # Execute the query
-        page_result = client.list_metric_descriptors(request=request)
+        page_result = await _list_in_pool(lambda: client.list_metric_descriptors(request=request))
         
         # Process results
         descriptors_list = []
@@ -2797,8 +3038,8 @@ async def create_alert_policy(policy: GCPAlertPolicyCreate, db=Depends(get_datab
             raise HTTPException(status_code=404, detail=f"No enabled credentials found for project {policy.project_id}")
         
         # Create credentials and client
-        credentials = service_account.Credentials.from_service_account_info(credentials_doc["service_account_key"])
-        client = monitoring_v3.AlertPolicyServiceClient(credentials=credentials)
+        credentials = _get_credentials(credentials_doc["service_account_key"])
+        client = _get_client(monitoring_v3.AlertPolicyServiceClient, credentials)
         
         # Build the alert policy
         project_name = f"projects/{policy.project_id}"
@@ -2817,7 +3058,7 @@ async def create_alert_policy(policy: GCPAlertPolicyCreate, db=Depends(get_datab
             alert_policy=alert_policy
         )
         
-        created_policy = client.create_alert_policy(request=request)
+        created_policy = await _run_in_pool(lambda: client.create_alert_policy(request=request))
         
         # Store in database
         policy_doc = GCPAlertPolicy(
@@ -2867,8 +3108,8 @@ async def list_alert_policies(project_id: str, db=Depends(get_database)):
             raise HTTPException(status_code=404, detail=f"No enabled credentials found for project {project_id}")
         
         # Create credentials and client
-        credentials = service_account.Credentials.from_service_account_info(credentials_doc["service_account_key"])
-        client = monitoring_v3.AlertPolicyServiceClient(credentials=credentials)
+        credentials = _get_credentials(credentials_doc["service_account_key"])
+        client = _get_client(monitoring_v3.AlertPolicyServiceClient, credentials)
         
         # Build the request
         project_name = f"projects/{project_id}"
@@ -2878,7 +3119,7 @@ async def list_alert_policies(project_id: str, db=Depends(get_database)):
         )
         
         # Execute the query
-        page_result = client.list_alert_policies(request=request)
+        page_result = await _list_in_pool(lambda: client.list_alert_policies(request=request))
         
         # Process results
         policies_list = []
@@ -2903,7 +3144,7 @@ async def list_alert_policies(project_id: str, db=Depends(get_database)):
             )
             
             policies_list.append(GCPAlertPolicyResponse(
-                id=f"{project_id}_{policy.name.split('/')[-1]}",
+                id=f"{project_id}_{_last_segment(policy.name)}",
                 project_id=project_id,
                 name=policy.name,
                 display_name=policy.display_name,
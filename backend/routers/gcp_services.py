@@ -38,7 +38,10 @@ async def list_compute_engine_instances(
         # Build query filter
         query_filter = {}
         if credentials_id:
-            query_filter["credentials_id"] = credentials_id
+            if not validate_object_id(credentials_id):
+                # A malformed ID cannot match any stored credentials reference
+                return []
+            query_filter["credentials_id"] = ObjectId(credentials_id)
         if zone:
             query_filter["zone"] = zone
         if region:
@@ -133,7 +136,10 @@ async def list_cloud_sql_instances(
         # Build query filter
         query_filter = {}
         if credentials_id:
-            query_filter["credentials_id"] = credentials_id
+            if not validate_object_id(credentials_id):
+                # A malformed ID cannot match any stored credentials reference
+                return []
+            query_filter["credentials_id"] = ObjectId(credentials_id)
         if region:
             query_filter["region"] = region
         if database_version:
@@ -150,7 +156,7 @@ async def list_cloud_sql_instances(
         return [
             GCPCloudSQLResponse(
                 id=str(instance["_id"]),
-                credentials_id=instance["credentials_id"],
+                credentials_id=str(instance["credentials_id"]),
                 resource_id=instance["resource_id"],
                 resource_name=instance["resource_name"],
                 region=instance.get("region", ""),
@@ -188,7 +194,7 @@ async def get_cloud_sql_instance(instance_id: str, db=Depends(get_database)):
             
         return GCPCloudSQLResponse(
             id=str(instance["_id"]),
-            credentials_id=instance["credentials_id"],
+            credentials_id=str(instance["credentials_id"]),
             resource_id=instance["resource_id"],
             resource_name=instance["resource_name"],
             region=instance.get("region", ""),
@@ -229,7 +235,10 @@ async def list_cloud_storage_buckets(
         # Build query filter
         query_filter = {}
         if credentials_id:
-            query_filter["credentials_id"] = credentials_id
+            if not validate_object_id(credentials_id):
+                # A malformed ID cannot match any stored credentials reference
+                return []
+            query_filter["credentials_id"] = ObjectId(credentials_id)
         if location:
             query_filter["location"] = location
         if storage_class:
@@ -255,7 +264,7 @@ async def list_cloud_storage_buckets(
         return [
             GCPCloudStorageResponse(
                 id=str(bucket["_id"]),
-                credentials_id=bucket["credentials_id"],
+                credentials_id=str(bucket["credentials_id"]),
                 resource_id=bucket["resource_id"],
                 resource_name=bucket["resource_name"],
                 location=bucket.get("location", ""),
@@ -292,7 +301,7 @@ async def get_cloud_storage_bucket(bucket_id: str, db=Depends(get_database)):
             
         return GCPCloudStorageResponse(
             id=str(bucket["_id"]),
-            credentials_id=bucket["credentials_id"],
+            credentials_id=str(bucket["credentials_id"]),
             resource_id=bucket["resource_id"],
             resource_name=bucket["resource_name"],
             location=bucket.get("location", ""),
@@ -332,7 +341,10 @@ async def list_load_balancers(
         # Build query filter
         query_filter = {}
         if credentials_id:
-            query_filter["credentials_id"] = credentials_id
+            if not validate_object_id(credentials_id):
+                # A malformed ID cannot match any stored credentials reference
+                return []
+            query_filter["credentials_id"] = ObjectId(credentials_id)
         if region:
             query_filter["region"] = region
         if load_balancing_scheme:
@@ -358,7 +370,7 @@ async def list_load_balancers(
         return [
             GCPLoadBalancerResponse(
                 id=str(lb["_id"]),
-                credentials_id=lb["credentials_id"],
+                credentials_id=str(lb["credentials_id"]),
                 resource_id=lb["resource_id"],
                 resource_name=lb["resource_name"],
                 region=lb.get("region"),
@@ -398,7 +410,10 @@ async def list_kubernetes_clusters(
         # Build query filter
         query_filter = {}
         if credentials_id:
-            query_filter["credentials_id"] = credentials_id
+            if not validate_object_id(credentials_id):
+                # A malformed ID cannot match any stored credentials reference
+                return []
+            query_filter["credentials_id"] = ObjectId(credentials_id)
         if zone:
             query_filter["zone"] = zone
         if region:
@@ -426,7 +441,7 @@ async def list_kubernetes_clusters(
         return [
             GCPKubernetesEngineResponse(
                 id=str(cluster["_id"]),
-                credentials_id=cluster["credentials_id"],
+                credentials_id=str(cluster["credentials_id"]),
                 resource_id=cluster["resource_id"],
                 resource_name=cluster["resource_name"],
                 zone=cluster.get("zone"),
@@ -471,7 +486,10 @@ async def list_cloud_functions(
         # Build query filter
         query_filter = {}
         if credentials_id:
-            query_filter["credentials_id"] = credentials_id
+            if not validate_object_id(credentials_id):
+                # A malformed ID cannot match any stored credentials reference
+                return []
+            query_filter["credentials_id"] = ObjectId(credentials_id)
         if region:
             query_filter["region"] = region
         if runtime:
@@ -499,7 +517,7 @@ async def list_cloud_functions(
         return [
             GCPCloudFunctionsResponse(
                 id=str(func["_id"]),
-                credentials_id=func["credentials_id"],
+                credentials_id=str(func["credentials_id"]),
                 resource_id=func["resource_id"],
                 resource_name=func["resource_name"],
                 region=func.get("region", ""),
@@ -539,7 +557,7 @@ async def get_cloud_function(function_id: str, db=Depends(get_database)):
             
         return GCPCloudFunctionsResponse(
             id=str(func["_id"]),
-            credentials_id=func["credentials_id"],
+            credentials_id=str(func["credentials_id"]),
             resource_id=func["resource_id"],
             resource_name=func["resource_name"],
             region=func.get("region", ""),
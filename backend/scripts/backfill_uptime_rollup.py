@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Migration script to build the hourly uptime rollup from existing check results.
+
+The dashboard reads average uptime from uptime_rollup_hourly, which the uptime
+monitoring task only updates for new checks. This script rebuilds the buckets
+for historical uptime_check_results server-side:
+1. Groups check results by the hour of checked_at
+2. Counts total and successful (status "up") checks per hour
+3. Replaces the matching uptime_rollup_hourly buckets with the recomputed counts
+
+Usage:
+    python scripts/backfill_uptime_rollup.py [--days N] [--dry-run]
+"""
+
+import asyncio
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import get_database, init_db
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def build_rollup_pipeline(since: datetime, dry_run: bool):
+    """Aggregate check results into hourly buckets, merging them unless dry-running"""
+    pipeline = [
+        {"$match": {"checked_at": {"$gte": since}}},
+        {
+            "$group": {
+                "_id": {"$dateTrunc": {"date": "$checked_at", "unit": "hour"}},
+                "total": {"$sum": 1},
+                "successful": {"$sum": {"$cond": [{"$eq": ["$status", "up"]}, 1, 0]}}
+            }
+        },
+        {"$project": {"_id": 0, "hour": "$_id", "total": 1, "successful": 1}},
+    ]
+    if dry_run:
+        pipeline.append({"$count": "hours"})
+    else:
+        pipeline.append({
+            "$merge": {
+                "into": "uptime_rollup_hourly",
+                "on": "hour",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }
+        })
+    return pipeline
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Backfill the hourly uptime rollup from check results')
+    parser.add_argument('--days', type=int, default=30, help='Number of days of history to roll up (default: 30)')
+    parser.add_argument('--dry-run', action='store_true', help='Only report how many hourly buckets would be written')
+
+    args = parser.parse_args()
+
+    # init_db also ensures the unique hour index that $merge relies on
+    await init_db()
+    db = await get_database()
+    logger.info("Connected to database")
+
+    # Start on an hour boundary so the first bucket is complete
+    since = (datetime.utcnow() - timedelta(days=args.days)).replace(minute=0, second=0, microsecond=0)
+    result = await db.uptime_check_results.aggregate(build_rollup_pipeline(since, args.dry_run)).to_list(length=1)
+
+    if args.dry_run:
+        hours = result[0]["hours"] if result else 0
+        logger.info(f"Would write {hours} hourly buckets since {since.isoformat()}")
+    else:
+        buckets = await db.uptime_rollup_hourly.count_documents({"hour": {"$gte": since}})
+        logger.info(f"Hourly rollup now holds {buckets} buckets since {since.isoformat()}")
+    logger.info("Backfill completed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
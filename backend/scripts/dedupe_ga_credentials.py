@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Migration script to keep one Firebase-managed GA credentials document per GA4 property.
+
+The Firebase Analytics routes store their credentials with user_id "default" and rely on
+the unique partial index firebase_property_id_unique on ga_credentials.property_id.
+Documents saved before that index existed can block its build:
+1. Duplicate Firebase-managed documents for the same property are removed, keeping the
+   most recently updated one
+2. The index is then created again
+
+Per-user GA credentials are not covered by the index and are left untouched.
+
+Usage:
+    python scripts/dedupe_ga_credentials.py [--dry-run]
+"""
+
+import asyncio
+import argparse
+import logging
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import create_indexes, get_database, init_db
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Must match the partialFilterExpression of firebase_property_id_unique in core/database.py
+FIREBASE_CREDENTIALS_FILTER = {"user_id": "default"}
+NEWEST_FIRST = {"updated_at": -1, "created_at": -1}
+
+
+async def remove_duplicates(db, dry_run: bool):
+    """Keep the newest Firebase-managed document for each property_id and delete the rest"""
+    pipeline = [
+        {"$match": FIREBASE_CREDENTIALS_FILTER},
+        {"$sort": NEWEST_FIRST},
+        {"$group": {"_id": "$property_id", "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+        {"$project": {"stale_ids": {"$slice": ["$ids", 1, {"$size": "$ids"}]}}}
+    ]
+
+    stale_ids = []
+    async for group in db.ga_credentials.aggregate(pipeline):
+        logger.info(f"Property {group['_id']}: {len(group['stale_ids'])} duplicate credentials")
+        stale_ids.extend(group["stale_ids"])
+    logger.info(f"ga_credentials: {len(stale_ids)} duplicate documents")
+    if dry_run or not stale_ids:
+        return
+
+    result = await db.ga_credentials.delete_many({"_id": {"$in": stale_ids}})
+    logger.info(f"ga_credentials: deleted {result.deleted_count} duplicate documents")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Deduplicate Firebase-managed GA credentials before enforcing the unique index')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would change (no actual changes)')
+
+    args = parser.parse_args()
+
+    # init_db builds the indexes; a unique build blocked by old data is logged and retried below
+    await init_db()
+    db = await get_database()
+    logger.info("Connected to database")
+
+    await remove_duplicates(db, args.dry_run)
+
+    if not args.dry_run:
+        await create_indexes()
+    logger.info("Deduplication completed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
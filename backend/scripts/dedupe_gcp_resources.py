@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Migration script to make GCP resource documents unique per (credentials_id, resource_id).
+
+Discovery upserts rely on a unique (credentials_id, resource_id) index on gcp_resources
+and on every per-service collection. Data written by older code can block those builds:
+1. Filtered discovery stored credentials_id as a string while everything else stores an
+   ObjectId; string references are converted to ObjectIds
+2. Duplicate documents for the same resource are removed, keeping the most recently
+   written one
+3. Non-unique indexes on the same keys, single-field credentials_id indexes the
+   unique index makes redundant, and retired listing indexes are dropped
+4. The indexes are then created again
+
+Usage:
+    python scripts/dedupe_gcp_resources.py [--dry-run]
+"""
+
+import asyncio
+import argparse
+import logging
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import create_indexes, get_database, init_db
+from core.gcp_collections import GCP_SERVICE_COLLECTIONS
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+RESOURCE_COLLECTIONS = ["gcp_resources", *GCP_SERVICE_COLLECTIONS.values()]
+UNIQUE_KEY = [("credentials_id", 1), ("resource_id", 1)]
+# Indexes no longer created by core/database.py
+RETIRED_INDEXES = {"svc_creds_resource_created"}
+# Most recently written first; documents from older code paths only carry some of these
+NEWEST_FIRST = {"updated_at": -1, "last_updated": -1, "created_at": -1}
+DELETE_BATCH_SIZE = 1000
+
+
+async def convert_string_references(db, dry_run: bool):
+    """Store every credentials_id as an ObjectId, converting server-side"""
+    for collection_name in RESOURCE_COLLECTIONS:
+        collection = db[collection_name]
+        mismatched = {"credentials_id": {"$type": "string"}}
+
+        count = await collection.count_documents(mismatched)
+        logger.info(f"{collection_name}: {count} documents with a string credentials_id")
+        if dry_run or count == 0:
+            continue
+
+        result = await collection.update_many(mismatched, [{"$set": {"credentials_id": {
+            "$convert": {"input": "$credentials_id", "to": "objectId", "onError": "$credentials_id"}
+        }}}])
+        logger.info(f"{collection_name}: converted {result.modified_count} documents")
+
+
+async def remove_duplicates(db, dry_run: bool):
+    """Keep the newest document for each (credentials_id, resource_id) and delete the rest"""
+    for collection_name in RESOURCE_COLLECTIONS:
+        collection = db[collection_name]
+        pipeline = [
+            {"$sort": NEWEST_FIRST},
+            {"$group": {
+                "_id": {"credentials_id": "$credentials_id", "resource_id": "$resource_id"},
+                "ids": {"$push": "$_id"}
+            }},
+            {"$match": {"ids.1": {"$exists": True}}},
+            {"$project": {"stale_ids": {"$slice": ["$ids", 1, {"$size": "$ids"}]}}}
+        ]
+
+        stale_ids = []
+        async for group in collection.aggregate(pipeline, allowDiskUse=True):
+            stale_ids.extend(group["stale_ids"])
+        logger.info(f"{collection_name}: {len(stale_ids)} duplicate documents")
+        if dry_run or not stale_ids:
+            continue
+
+        deleted = 0
+        for start in range(0, len(stale_ids), DELETE_BATCH_SIZE):
+            result = await collection.delete_many({"_id": {"$in": stale_ids[start:start + DELETE_BATCH_SIZE]}})
+            deleted += result.deleted_count
+        logger.info(f"{collection_name}: deleted {deleted} duplicate documents")
+
+
+async def drop_legacy_indexes(db, dry_run: bool):
+    """Drop indexes that conflict with, or are covered by, the unique resource index"""
+    for collection_name in RESOURCE_COLLECTIONS:
+        collection = db[collection_name]
+        indexes = await collection.index_information()
+
+        for index_name, info in indexes.items():
+            key = [(field, int(direction)) for field, direction in info["key"]]
+            conflicting = key == UNIQUE_KEY and not info.get("unique")
+            redundant = key == UNIQUE_KEY[:1] or index_name in RETIRED_INDEXES
+            if not (conflicting or redundant):
+                continue
+
+            logger.info(f"{collection_name}: dropping index {index_name}")
+            if not dry_run:
+                await collection.drop_index(index_name)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Deduplicate GCP resources before enforcing unique indexes')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would change (no actual changes)')
+
+    args = parser.parse_args()
+
+    # init_db builds the indexes; unique builds blocked by old data are logged and retried below
+    await init_db()
+    db = await get_database()
+    logger.info("Connected to database")
+
+    await convert_string_references(db, args.dry_run)
+    await remove_duplicates(db, args.dry_run)
+    await drop_legacy_indexes(db, args.dry_run)
+
+    if not args.dry_run:
+        await create_indexes()
+    logger.info("Deduplication completed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
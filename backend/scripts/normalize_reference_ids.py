@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Migration script to store parent references in child collections with one type each.
+
+Joins and lookups only hit an index when the stored reference has the same BSON type
+as the value being queried. This script converts the references that were written with
+mixed types:
+1. device_health.device_id and interface_history.device_id become strings,
+   matching how the device routes and pollers query them
+2. uptime_check_results.monitor_id becomes an ObjectId, matching uptime_monitors._id
+   and the uptime routes
+3. Afterwards it explains the canonical lookup for each collection and reports
+   whether the winning plan uses an index
+
+Usage:
+    python scripts/normalize_reference_ids.py [--dry-run]
+"""
+
+import asyncio
+import argparse
+import logging
+from typing import Any, Dict
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import get_database, init_db
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# (collection, field, BSON type to convert from, conversion expression, sort field)
+REFERENCE_FIELDS = [
+    ("device_health", "device_id", "objectId", {"$toString": "$device_id"}, "timestamp"),
+    ("interface_history", "device_id", "objectId", {"$toString": "$device_id"}, "timestamp"),
+    (
+        "uptime_check_results",
+        "monitor_id",
+        "string",
+        {"$convert": {"input": "$monitor_id", "to": "objectId", "onError": "$monitor_id"}},
+        "checked_at"
+    ),
+]
+
+
+def _plan_stages(plan: Dict[str, Any]):
+    """Yield every stage name in an explain() winning plan"""
+    yield plan.get("stage")
+    for child_key in ("inputStage", "queryPlan"):
+        if child_key in plan:
+            yield from _plan_stages(plan[child_key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def normalize_references(db, dry_run: bool):
+    """Convert mismatched reference types in place, server-side"""
+    for collection_name, field, from_type, conversion, _ in REFERENCE_FIELDS:
+        collection = getattr(db, collection_name)
+        mismatched = {field: {"$type": from_type}}
+
+        count = await collection.count_documents(mismatched)
+        logger.info(f"{collection_name}.{field}: {count} documents stored as {from_type}")
+        if dry_run or count == 0:
+            continue
+
+        result = await collection.update_many(mismatched, [{"$set": {field: conversion}}])
+        logger.info(f"{collection_name}.{field}: converted {result.modified_count} documents")
+
+
+async def verify_index_usage(db):
+    """Explain the canonical lookup on each collection and report the scan type"""
+    for collection_name, field, _, _, sort_field in REFERENCE_FIELDS:
+        collection = getattr(db, collection_name)
+        sample = await collection.find_one({}, {field: 1})
+        if not sample or field not in sample:
+            logger.info(f"{collection_name}: no documents to explain")
+            continue
+
+        explain = await collection.find({field: sample[field]}).sort(sort_field, -1).limit(1).explain()
+        stages = set(_plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {})))
+        scan = "IXSCAN" if "IXSCAN" in stages else "COLLSCAN" if "COLLSCAN" in stages else ", ".join(sorted(filter(None, stages)))
+        logger.info(f"{collection_name}.{field} lookup uses {scan}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Normalize reference ID types in monitoring collections')
+    parser.add_argument('--dry-run', action='store_true', help='Only report mismatched documents (no actual changes)')
+
+    args = parser.parse_args()
+
+    # init_db also ensures the supporting indexes exist
+    await init_db()
+    db = await get_database()
+    logger.info("Connected to database")
+
+    await normalize_references(db, args.dry_run)
+    await verify_index_usage(db)
+    logger.info("Normalization completed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,8 @@
 import os
 import json
+import time
+import asyncio
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import firebase_admin
@@ -18,6 +21,17 @@ from core.database import get_database
 
 logger = logging.getLogger(__name__)
 
+# How long database-loaded credentials are trusted before the database is checked again
+CREDENTIALS_REFRESH_TTL = 300
+
+# GA4 report responses are reused for this long; reports only change as new events are processed
+REPORT_CACHE_TTL = 300
+REPORT_CACHE_MAX_ENTRIES = 512
+
+# GA4 reports run in the default thread pool, which also serves password hashing and
+# other blocking calls; cap how many a burst of /metrics requests can occupy at once
+REPORT_CONCURRENCY = 8
+
 class FirebaseAnalyticsService:
     """Service for fetching Firebase Analytics data using Google Service Account."""
     
@@ -26,15 +40,46 @@ class FirebaseAnalyticsService:
         self.client = None
         self.firebase_app = None
         self.db = None
+        self._initialized_at = None
+        self._credentials_fingerprint = None
+        self._report_cache = OrderedDict()
+        self._report_cache_hits = 0
+        self._report_cache_misses = 0
+        self._init_lock = asyncio.Lock()
+        self._report_semaphore = asyncio.Semaphore(REPORT_CONCURRENCY)
         self._initialize_firebase()
     
     async def initialize_from_database(self, db: AsyncIOMotorDatabase = None):
-        """Initialize Firebase service with credentials from database."""
-        if db is None:
-            db = await get_database()
+        """Initialize Firebase service with credentials from database.
         
-        self.db = db
-        await self._initialize_firebase_from_db()
+        Within CREDENTIALS_REFRESH_TTL of the last initialization this returns
+        immediately; call invalidate() after credentials change.
+        """
+        if self._is_initialization_fresh():
+            return
+        
+        # One caller reloads credentials; concurrent requests wait for it instead of
+        # each taking a connection for the same ga_credentials lookup
+        async with self._init_lock:
+            if self._is_initialization_fresh():
+                return
+            
+            if db is None:
+                db = await get_database()
+            
+            self.db = db
+            await self._initialize_firebase_from_db()
+            self._initialized_at = time.monotonic()
+    
+    def _is_initialization_fresh(self) -> bool:
+        """Whether credentials were loaded from the database within the refresh TTL."""
+        return self._initialized_at is not None and time.monotonic() - self._initialized_at < CREDENTIALS_REFRESH_TTL
+    
+    def invalidate(self):
+        """Force the next initialize_from_database call to reload credentials."""
+        self._initialized_at = None
+        self._credentials_fingerprint = None
+        self._report_cache.clear()
     
     async def _initialize_firebase_from_db(self):
         """Initialize Firebase from database credentials."""
@@ -53,6 +98,11 @@ class FirebaseAnalyticsService:
                 logger.warning("No active Firebase Analytics credentials found in database")
                 return
             
+            # Same credentials as the current client; skip re-parsing and rebuilding it
+            fingerprint = (creds_doc["_id"], creds_doc.get("updated_at"))
+            if fingerprint == self._credentials_fingerprint and self.is_connected():
+                return
+            
             # Parse service account JSON from database
             service_account_data = json.loads(creds_doc["service_account_json"])
             
@@ -73,6 +123,7 @@ class FirebaseAnalyticsService:
             
             self.client = BetaAnalyticsDataClient(credentials=credentials_obj)
             self.property_id = creds_doc["property_id"]
+            self._credentials_fingerprint = fingerprint
             
             logger.info(f"Firebase Analytics service initialized from database - property_id: {self.property_id}")
             
@@ -80,6 +131,7 @@ class FirebaseAnalyticsService:
             logger.error(f"Failed to initialize Firebase Analytics service from database: {str(e)}")
             self.client = None
             self.property_id = None
+            self._credentials_fingerprint = None
     
     def _initialize_firebase(self):
         """Initialize Firebase Admin SDK with service account credentials from environment (fallback)."""
@@ -122,6 +174,40 @@ class FirebaseAnalyticsService:
             self.client = None
             self.property_id = None
     
+    async def _run_report(self, request: RunReportRequest):
+        """Run a GA4 report without blocking the event loop, reusing recent responses.
+        
+        The serialized request is the cache key; it carries the property and the
+        date range, so entries roll over when the window moves to a new day. Failed
+        reports raise and are never cached.
+        """
+        key = RunReportRequest.serialize(request)
+        now = time.monotonic()
+        cached = self._report_cache.get(key)
+        if cached and cached[0] > now:
+            self._report_cache.move_to_end(key)
+            self._report_cache_hits += 1
+            return cached[1]
+        
+        self._report_cache_misses += 1
+        async with self._report_semaphore:
+            response = await asyncio.to_thread(self.client.run_report, request=request)
+        self._report_cache[key] = (now + REPORT_CACHE_TTL, response)
+        self._report_cache.move_to_end(key)
+        if len(self._report_cache) > REPORT_CACHE_MAX_ENTRIES:
+            self._report_cache.popitem(last=False)
+        return response
+    
+    def get_report_cache_stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the size of the GA4 report cache."""
+        return {
+            "hits": self._report_cache_hits,
+            "misses": self._report_cache_misses,
+            "entries": len(self._report_cache),
+            "max_entries": REPORT_CACHE_MAX_ENTRIES,
+            "ttl_seconds": REPORT_CACHE_TTL
+        }
+    
     def is_connected(self) -> bool:
         """Check if Firebase Analytics is properly connected."""
         return self.client is not None and self.property_id is not None
@@ -135,6 +221,9 @@ class FirebaseAnalyticsService:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
+            # Always one request for the whole window, even for long ranges: the report
+            # has no dimensions so it is a single row (no paging), and activeUsers and
+            # the rate metrics are not additive, so per-month shards cannot be merged
             request = RunReportRequest(
                 property=f"properties/{self.property_id}",
                 date_ranges=[DateRange(
@@ -153,7 +242,7 @@ class FirebaseAnalyticsService:
                 ]
             )
             
-            response = self.client.run_report(request=request)
+            response = await self._run_report(request)
             
             if response.rows:
                 row = response.rows[0]
@@ -196,7 +285,7 @@ class FirebaseAnalyticsService:
                 limit=limit
             )
             
-            response = self.client.run_report(request=request)
+            response = await self._run_report(request)
             
             pages = []
             for row in response.rows:
@@ -232,7 +321,7 @@ class FirebaseAnalyticsService:
                 limit=10
             )
             
-            country_response = self.client.run_report(country_request)
+            country_response = await self._run_report(country_request)
             
             countries = []
             for row in country_response.rows:
@@ -269,7 +358,7 @@ class FirebaseAnalyticsService:
                 limit=limit
             )
             
-            response = self.client.run_report(request)
+            response = await self._run_report(request)
             
             events = []
             for row in response.rows:
@@ -304,16 +393,6 @@ class FirebaseAnalyticsService:
                 metrics=[Metric(name="activeUsers"), Metric(name="sessions")]
             )
             
-            device_response = self.client.run_report(device_request)
-            
-            devices = []
-            for row in device_response.rows:
-                devices.append({
-                    "device": row.dimension_values[0].value,
-                    "users": int(row.metric_values[0].value),
-                    "sessions": int(row.metric_values[1].value)
-                })
-            
             # Get new vs returning users
             user_request = RunReportRequest(
                 property=f"properties/{self.property_id}",
@@ -325,7 +404,18 @@ class FirebaseAnalyticsService:
                 metrics=[Metric(name="activeUsers")]
             )
             
-            user_response = self.client.run_report(user_request)
+            device_response, user_response = await asyncio.gather(
+                self._run_report(device_request),
+                self._run_report(user_request)
+            )
+            
+            devices = []
+            for row in device_response.rows:
+                devices.append({
+                    "device": row.dimension_values[0].value,
+                    "users": int(row.metric_values[0].value),
+                    "sessions": int(row.metric_values[1].value)
+                })
             
             user_types = []
             for row in user_response.rows:
@@ -363,7 +453,7 @@ class FirebaseAnalyticsService:
                 limit=5
             )
             
-            response = self.client.run_report(request)
+            response = await self._run_report(request)
             
             funnel_steps = []
             for row in response.rows:
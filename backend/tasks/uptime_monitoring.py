@@ -139,6 +139,7 @@ async def perform_uptime_check(monitor_id: str) -> Dict[str, Any]:
             raise
         
         await db.uptime_check_results.insert_one(result_doc.dict(by_alias=True))
+        await _record_uptime_rollup(db, result_doc.checked_at, result_doc.status)
         
         # Check for alerts
         await _check_and_trigger_alerts(monitor, check_result, db)
@@ -157,6 +158,16 @@ async def perform_uptime_check(monitor_id: str) -> Dict[str, Any]:
         }
 
 
+async def _record_uptime_rollup(db: AsyncIOMotorDatabase, checked_at: datetime, status: str):
+    """Add a check result to its hourly uptime rollup bucket"""
+    hour = checked_at.replace(minute=0, second=0, microsecond=0)
+    await db.uptime_rollup_hourly.update_one(
+        {"hour": hour},
+        {"$inc": {"total": 1, "successful": 1 if status == MonitorStatus.UP else 0}},
+        upsert=True
+    )
+
+
 async def _perform_web_http_check(monitor: Dict[str, Any]) -> Dict[str, Any]:
     """Perform the actual HTTP check for web application monitoring"""
     import aiohttp
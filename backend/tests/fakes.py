@@ -0,0 +1,128 @@
+"""In-memory stand-ins for the Motor collections and cursors the routers use.
+
+Only the query operators and cursor methods the tested code paths need are
+implemented; every write is also recorded on the collection for assertions.
+"""
+
+from typing import Any, Dict, List
+
+
+def _matches(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(_matches(document, clause) for clause in condition):
+                return False
+        elif field == "$or":
+            if not any(_matches(document, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition):
+            if field not in document:
+                return False
+            value = document[field]
+            for operator, operand in condition.items():
+                if operator == "$in" and value not in operand:
+                    return False
+                if operator == "$gt" and not value > operand:
+                    return False
+                if operator == "$gte" and not value >= operand:
+                    return False
+                if operator == "$lt" and not value < operand:
+                    return False
+        elif document.get(field) != condition:
+            return False
+    return True
+
+
+def _project(document: Dict[str, Any], projection) -> Dict[str, Any]:
+    if not projection:
+        return dict(document)
+    included = {field for field, flag in projection.items() if flag}
+    if included:
+        projected = {field: document[field] for field in included if field in document}
+        if projection.get("_id", 1) and "_id" in document:
+            projected["_id"] = document["_id"]
+        return projected
+    return {field: value for field, value in document.items() if projection.get(field, 1)}
+
+
+class FakeCursor:
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self._documents = documents
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key, direction=None):
+        keys = [(key, direction)] if isinstance(key, str) else list(key)
+        for field, order in reversed(keys):
+            self._documents.sort(key=lambda document: document[field], reverse=order == -1)
+        return self
+
+    def skip(self, count: int):
+        self._skip = count
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def _window(self) -> List[Dict[str, Any]]:
+        documents = self._documents[self._skip:]
+        return documents[:self._limit] if self._limit else documents
+
+    async def to_list(self, length=None):
+        documents = self._window()
+        return documents[:length] if length else documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._window():
+            yield document
+
+
+class FakeCollection:
+    def __init__(self, name: str, documents=None):
+        self.name = name
+        self.documents: List[Dict[str, Any]] = list(documents or [])
+        self.bulk_writes: List[list] = []
+        self.inserted_batches: List[list] = []
+
+    def find(self, query=None, projection=None):
+        return FakeCursor([
+            _project(document, projection)
+            for document in self.documents
+            if _matches(document, query or {})
+        ])
+
+    async def find_one(self, query=None, projection=None):
+        for document in self.documents:
+            if _matches(document, query or {}):
+                return _project(document, projection)
+        return None
+
+    async def insert_one(self, document: Dict[str, Any]):
+        self.documents.append(document)
+
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True):
+        self.inserted_batches.append(list(documents))
+        self.documents.extend(documents)
+
+    async def bulk_write(self, requests: list, ordered: bool = True):
+        self.bulk_writes.append(list(requests))
+
+
+class FakeDatabase:
+    """Creates an empty FakeCollection on first access to each collection name"""
+
+    def __init__(self, **collections: List[Dict[str, Any]]):
+        self._collections: Dict[str, FakeCollection] = {
+            name: FakeCollection(name, documents) for name, documents in collections.items()
+        }
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._collections.setdefault(name, FakeCollection(name))
+
+    __getitem__ = __getattr__
@@ -0,0 +1,108 @@
+"""Singleflight for GA report fetches: concurrent identical fetches share one call."""
+
+import pytest
+
+pytest.importorskip("pytest_asyncio")
+pytest.importorskip("fastapi")
+pytest.importorskip("motor")
+pytest.importorskip("google.analytics.data")
+pytest.importorskip("google.analytics.admin_v1beta")
+pytest.importorskip("googleapiclient")
+
+import asyncio
+from datetime import datetime
+
+from routers import analytics
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31)
+
+
+class _GatedFetch:
+    """Fetch that blocks until released and counts how often it actually ran"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.error = None
+
+        async def _fetch_test_report(credentials, property_id, start_date, end_date):
+            self.calls.append((property_id, start_date, end_date))
+            await self.release.wait()
+            if self.error:
+                raise self.error
+            return {"property_id": property_id, "calls": len(self.calls)}
+
+        self.fetch = analytics._coalesce_fetch(_fetch_test_report)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_fetches_share_one_call():
+    gated = _GatedFetch()
+    callers = [asyncio.ensure_future(gated.fetch(None, "123", START, END)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    gated.release.set()
+    results = await asyncio.gather(*callers)
+
+    assert gated.calls == [("123", START, END)]
+    assert results == [{"property_id": "123", "calls": 1}] * 3
+    assert analytics._inflight_fetches == {}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_fetch_separately():
+    gated = _GatedFetch()
+    gated.release.set()
+
+    await asyncio.gather(
+        gated.fetch(None, "123", START, END),
+        gated.fetch(None, "456", START, END),
+        gated.fetch(None, "123", START, datetime(2024, 2, 29))
+    )
+
+    assert len(gated.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_finished_fetches_are_not_reused():
+    gated = _GatedFetch()
+    gated.release.set()
+
+    await gated.fetch(None, "123", START, END)
+    await gated.fetch(None, "123", START, END)
+
+    assert len(gated.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_fetch():
+    gated = _GatedFetch()
+    cancelled = asyncio.ensure_future(gated.fetch(None, "123", START, END))
+    waiting = asyncio.ensure_future(gated.fetch(None, "123", START, END))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    gated.release.set()
+
+    assert await waiting == {"property_id": "123", "calls": 1}
+    assert cancelled.cancelled()
+    assert len(gated.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_caller_and_are_not_cached():
+    gated = _GatedFetch()
+    gated.error = RuntimeError("quota exceeded")
+    callers = [asyncio.ensure_future(gated.fetch(None, "123", START, END)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    gated.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert all(result is gated.error for result in results)
+    assert analytics._inflight_fetches == {}
+
+    gated.error = None
+    assert await gated.fetch(None, "123", START, END) == {"property_id": "123", "calls": 2}
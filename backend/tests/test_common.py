@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("bson")
+pytest.importorskip("fastapi")
+
+from datetime import datetime
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+
+from utils.common import MongoJSONResponse, document_to_response
+
+
+class _Item(BaseModel):
+    id: str
+    name: str
+    count: int = 0
+
+
+def test_document_to_response_renames_id_without_validating():
+    object_id = ObjectId()
+    document = {"_id": object_id, "name": "edge-router", "count": "not validated"}
+
+    item = document_to_response(document, _Item)
+
+    assert item.id == str(object_id)
+    assert item.name == "edge-router"
+    # Stored documents are trusted, so the value is not coerced or rejected
+    assert item.count == "not validated"
+    # The document is reused in place
+    assert "_id" not in document
+    assert document["id"] == str(object_id)
+
+
+def test_document_to_response_keeps_model_defaults():
+    item = document_to_response({"_id": ObjectId(), "name": "core-switch"}, _Item)
+
+    assert item.count == 0
+
+
+def test_mongo_json_response_serializes_object_ids_and_non_string_keys():
+    object_id = ObjectId()
+    created_at = datetime(2024, 1, 2, 3, 4, 5)
+
+    body = MongoJSONResponse(content={
+        "_id": object_id,
+        "refs": [object_id],
+        "counts": {200: 3},
+        "created_at": created_at
+    }).body
+
+    assert orjson.loads(body) == {
+        "_id": str(object_id),
+        "refs": [str(object_id)],
+        "counts": {"200": 3},
+        "created_at": "2024-01-02T03:04:05"
+    }
+
+
+def test_mongo_json_response_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        MongoJSONResponse(content={"value": object()})
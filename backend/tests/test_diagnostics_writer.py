@@ -0,0 +1,105 @@
+"""Write-behind buffer for single uptime check results."""
+
+import pytest
+
+pytest_asyncio = pytest.importorskip("pytest_asyncio")
+pytest.importorskip("fastapi")
+pytest.importorskip("motor")
+pytest.importorskip("aiohttp")
+
+import asyncio
+from datetime import datetime
+
+from fakes import FakeDatabase
+from routers import diagnostics
+
+
+def _check_data(index):
+    return {
+        "target": f"host-{index}.example.com",
+        "check_type": "ping",
+        "timestamp": datetime(2024, 1, 1),
+        "is_up": True,
+        "response_time": 10.0
+    }
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = FakeDatabase()
+
+    async def get_database():
+        return database
+
+    monkeypatch.setattr(diagnostics, "get_database", get_database)
+    return database
+
+
+@pytest_asyncio.fixture
+async def check_writer(db):
+    await diagnostics.start_check_writer()
+    yield
+    await diagnostics.stop_check_writer()
+
+
+@pytest.mark.asyncio
+async def test_checks_are_inserted_directly_without_the_writer(db):
+    response = await diagnostics._save_uptime_check(_check_data(0), db)
+
+    assert [str(document["_id"]) for document in db.uptime_checks.documents] == [response.id]
+    assert db.uptime_checks.inserted_batches == []
+
+
+@pytest.mark.asyncio
+async def test_buffered_checks_are_flushed_after_the_interval(db, check_writer):
+    responses = [await diagnostics._save_uptime_check(_check_data(i), db) for i in range(3)]
+    assert db.uptime_checks.documents == []
+
+    await asyncio.sleep(diagnostics._WRITE_FLUSH_INTERVAL * 3)
+
+    assert len(db.uptime_checks.inserted_batches) == 1
+    # Responses carry the ids the documents are stored under
+    assert [str(document["_id"]) for document in db.uptime_checks.documents] == [r.id for r in responses]
+
+
+@pytest.mark.asyncio
+async def test_full_batches_are_flushed_without_waiting(db, monkeypatch):
+    monkeypatch.setattr(diagnostics, "_WRITE_BATCH_SIZE", 2)
+    monkeypatch.setattr(diagnostics, "_WRITE_FLUSH_INTERVAL", 60)
+    await diagnostics.start_check_writer()
+    try:
+        for i in range(3):
+            await diagnostics._save_uptime_check(_check_data(i), db)
+        await asyncio.sleep(0.05)
+
+        assert [len(batch) for batch in db.uptime_checks.inserted_batches] == [2]
+    finally:
+        await diagnostics.stop_check_writer()
+
+
+@pytest.mark.asyncio
+async def test_stopping_the_writer_drains_buffered_checks(db, monkeypatch):
+    monkeypatch.setattr(diagnostics, "_WRITE_FLUSH_INTERVAL", 60)
+    await diagnostics.start_check_writer()
+    for i in range(3):
+        await diagnostics._save_uptime_check(_check_data(i), db)
+
+    await diagnostics.stop_check_writer()
+
+    assert len(db.uptime_checks.documents) == 3
+    assert diagnostics._flusher_task is None
+
+
+@pytest.mark.asyncio
+async def test_insert_failures_are_logged_not_raised(db, check_writer, monkeypatch, caplog):
+    async def fail(documents, ordered=True):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(db.uptime_checks, "insert_many", fail)
+
+    await diagnostics._save_uptime_check(_check_data(0), db)
+    await asyncio.sleep(diagnostics._WRITE_FLUSH_INTERVAL * 3)
+
+    assert "Failed to persist 1 buffered uptime checks" in caplog.text
+    # The flusher keeps running after a failed batch
+    assert not diagnostics._flusher_task.done()
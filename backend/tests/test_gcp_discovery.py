@@ -0,0 +1,152 @@
+import pytest
+
+pytest.importorskip("pytest_asyncio")
+pytest.importorskip("fastapi")
+pytest.importorskip("motor")
+
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from fakes import FakeDatabase
+from models.gcp import GCPServiceType
+from routers import gcp
+
+
+def _resource(credentials_id, resource_id, labels=None):
+    now = datetime(2024, 1, 1)
+    return {
+        'credentials_id': credentials_id,
+        'resource_id': resource_id,
+        'name': resource_id,
+        'service_type': GCPServiceType.COMPUTE_ENGINE,
+        'labels': labels or {},
+        'metadata': {'machine_type': 'e2-small'},
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+def _expected_upsert(resource):
+    changed = {field: resource[field] for field in gcp._DISCOVERY_MUTABLE_FIELDS}
+    unchanged = {field: value for field, value in resource.items() if field not in changed}
+    return UpdateOne(
+        {'credentials_id': resource['credentials_id'], 'resource_id': resource['resource_id']},
+        {'$set': changed, '$setOnInsert': unchanged},
+        upsert=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_save_discovered_resources_upserts_new_resources():
+    db = FakeDatabase()
+    credentials_id = ObjectId()
+    resource = _resource(credentials_id, 'vm-1')
+    buffer = [resource]
+
+    saved = await gcp._save_discovered_resources(db, buffer)
+
+    assert saved == 1
+    assert buffer == []
+    assert resource['metadata_hash'] == gcp._resource_content_hash(resource)
+    assert db.gcp_compute_engine.bulk_writes == [[_expected_upsert(resource)]]
+
+
+@pytest.mark.asyncio
+async def test_save_discovered_resources_skips_unchanged_resources():
+    credentials_id = ObjectId()
+    unchanged = _resource(credentials_id, 'vm-1', labels={'env': 'prod'})
+    changed = _resource(credentials_id, 'vm-2', labels={'env': 'prod'})
+    db = FakeDatabase(gcp_compute_engine=[
+        {'credentials_id': credentials_id, 'resource_id': 'vm-1', 'metadata_hash': gcp._resource_content_hash(unchanged)},
+        {'credentials_id': credentials_id, 'resource_id': 'vm-2', 'metadata_hash': 'stale'},
+        # Same resource_id under other credentials must not count as stored
+        {'credentials_id': ObjectId(), 'resource_id': 'vm-3', 'metadata_hash': 'other'}
+    ])
+    new = _resource(credentials_id, 'vm-3')
+
+    saved = await gcp._save_discovered_resources(db, [unchanged, changed, new])
+
+    assert saved == 3
+    assert db.gcp_compute_engine.bulk_writes == [[_expected_upsert(changed), _expected_upsert(new)]]
+
+
+@pytest.mark.asyncio
+async def test_save_discovered_resources_writes_nothing_when_all_unchanged():
+    credentials_id = ObjectId()
+    resource = _resource(credentials_id, 'vm-1')
+    db = FakeDatabase(gcp_compute_engine=[
+        {'credentials_id': credentials_id, 'resource_id': 'vm-1', 'metadata_hash': gcp._resource_content_hash(resource)}
+    ])
+
+    await gcp._save_discovered_resources(db, [resource])
+
+    assert db.gcp_compute_engine.bulk_writes == []
+
+
+@pytest.mark.asyncio
+async def test_save_discovered_resources_batches_bulk_writes(monkeypatch):
+    monkeypatch.setattr(gcp, '_DISCOVERY_WRITE_BATCH_SIZE', 2)
+    db = FakeDatabase()
+    credentials_id = ObjectId()
+
+    await gcp._save_discovered_resources(db, [_resource(credentials_id, f'vm-{i}') for i in range(5)])
+
+    assert [len(batch) for batch in db.gcp_compute_engine.bulk_writes] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_save_discovered_resources_groups_by_service_collection():
+    db = FakeDatabase()
+    credentials_id = ObjectId()
+    instance = _resource(credentials_id, 'vm-1')
+    database = dict(_resource(credentials_id, 'sql-1'), service_type=GCPServiceType.CLOUD_SQL)
+
+    await gcp._save_discovered_resources(db, [instance, database])
+
+    assert db.gcp_compute_engine.bulk_writes == [[_expected_upsert(instance)]]
+    assert db.gcp_cloud_sql.bulk_writes == [[_expected_upsert(database)]]
+
+
+@pytest.fixture
+def saved_batches(monkeypatch):
+    batches = []
+
+    async def record(db, resources):
+        batches.append(list(resources))
+        resources.clear()
+        return len(batches[-1])
+
+    monkeypatch.setattr(gcp, '_save_discovered_resources', record)
+    monkeypatch.setattr(gcp, '_DISCOVERY_WRITE_BATCH_SIZE', 2)
+    return batches
+
+
+@pytest.mark.asyncio
+async def test_discovery_writer_flushes_full_batches(saved_batches):
+    writer = gcp._DiscoveryWriter(FakeDatabase())
+    resources = [{'resource_id': f'vm-{i}'} for i in range(5)]
+
+    for resource in resources:
+        await writer.add(resource)
+
+    assert writer.count == 5
+    assert saved_batches == [resources[0:2], resources[2:4]]
+
+    await writer.flush()
+
+    assert saved_batches == [resources[0:2], resources[2:4], resources[4:5]]
+
+
+@pytest.mark.asyncio
+async def test_discovery_writer_flush_without_buffered_resources_is_a_no_op(saved_batches):
+    writer = gcp._DiscoveryWriter(FakeDatabase())
+
+    await writer.flush()
+    await writer.add({'resource_id': 'vm-1'})
+    await writer.flush()
+    await writer.flush()
+
+    assert saved_batches == [[{'resource_id': 'vm-1'}]]
+    assert writer.count == 1
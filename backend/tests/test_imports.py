@@ -0,0 +1,17 @@
+"""Import smoke tests: module-level singletons are built at import time, so a broken
+constructor stops the app from starting."""
+
+import pytest
+
+
+def test_firebase_service_module_imports():
+    pytest.importorskip("firebase_admin")
+    pytest.importorskip("motor")
+    from services import firebase_service
+
+    service = firebase_service.firebase_analytics_service
+    assert isinstance(service, firebase_service.FirebaseAnalyticsService)
+    assert service.get_report_cache_stats()["entries"] == 0
+
+    service.invalidate()
+    assert service.get_report_cache_stats()["entries"] == 0
@@ -0,0 +1,114 @@
+"""Keyset pagination: each page's X-Next-Cursor, passed back as after_id, continues
+exactly where the page ended."""
+
+import pytest
+
+pytest.importorskip("pytest_asyncio")
+pytest.importorskip("fastapi")
+pytest.importorskip("motor")
+pytest.importorskip("aiohttp")
+
+from datetime import datetime, timedelta
+
+import orjson
+from bson import ObjectId
+from fastapi import HTTPException
+
+from fakes import FakeDatabase
+from routers import devices, diagnostics
+
+
+async def _collect_pages(list_page, **params):
+    """Follow X-Next-Cursor until the last page; returns the ids of every page"""
+    pages = []
+    after_id = None
+    while True:
+        response = await list_page(after_id=after_id, **params)
+        pages.append([item["id"] for item in orjson.loads(response.body)])
+        after_id = response.headers.get("x-next-cursor")
+        if after_id is None:
+            return pages
+        assert after_id == pages[-1][-1]
+
+
+def _device(index):
+    return {
+        "_id": ObjectId(),
+        "name": f"switch-{index}",
+        "ip_address": f"10.0.0.{index}",
+        "device_type": "switch",
+        "snmp_version": "v2c",
+        "is_active": True
+    }
+
+
+@pytest.mark.asyncio
+async def test_devices_pages_follow_the_cursor():
+    stored = [_device(i) for i in range(5)]
+    db = FakeDatabase(devices=stored)
+
+    pages = await _collect_pages(devices.get_devices, skip=0, limit=2, device_type=None, db=db)
+
+    ids = [str(device["_id"]) for device in stored]
+    assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+
+
+@pytest.mark.asyncio
+async def test_devices_skip_applies_only_without_cursor():
+    stored = [_device(i) for i in range(5)]
+    db = FakeDatabase(devices=stored)
+    ids = [str(device["_id"]) for device in stored]
+
+    first = await devices.get_devices(skip=1, limit=2, device_type=None, after_id=None, db=db)
+    following = await devices.get_devices(skip=1, limit=2, device_type=None, after_id=ids[2], db=db)
+
+    assert [item["id"] for item in orjson.loads(first.body)] == ids[1:3]
+    assert [item["id"] for item in orjson.loads(following.body)] == ids[3:5]
+
+
+@pytest.mark.asyncio
+async def test_devices_reject_malformed_cursor():
+    with pytest.raises(HTTPException) as error:
+        await devices.get_devices(skip=0, limit=2, device_type=None, after_id="not-an-id", db=FakeDatabase())
+
+    assert error.value.status_code == 400
+
+
+def _check(timestamp):
+    return {
+        "_id": ObjectId(),
+        "target": "example.com",
+        "check_type": "ping",
+        "timestamp": timestamp,
+        "is_up": True,
+        "response_time": 12.5
+    }
+
+
+@pytest.mark.asyncio
+async def test_uptime_check_pages_do_not_skip_equal_timestamps():
+    now = datetime(2024, 1, 1, 12)
+    # Three checks share a timestamp, so a page boundary falls inside the tie
+    stored = [_check(now - timedelta(minutes=minutes)) for minutes in (0, 5, 5, 5, 10)]
+    db = FakeDatabase(uptime_checks=stored)
+
+    pages = await _collect_pages(
+        diagnostics.get_uptime_checks, skip=0, limit=2, target=None, check_type=None, days=None, db=db
+    )
+
+    newest_first = sorted(stored, key=lambda check: (check["timestamp"], check["_id"]), reverse=True)
+    ids = [str(check["_id"]) for check in newest_first]
+    assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("after_id", ["not-an-id", str(ObjectId())])
+async def test_uptime_checks_reject_malformed_or_unknown_cursor(after_id):
+    db = FakeDatabase(uptime_checks=[_check(datetime(2024, 1, 1))])
+
+    with pytest.raises(HTTPException) as error:
+        await diagnostics.get_uptime_checks(
+            skip=0, limit=2, target=None, check_type=None, days=None, after_id=after_id, db=db
+        )
+
+    assert error.value.status_code == 400
@@ -1,6 +1,14 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Type, TypeVar
 from bson import ObjectId
 from datetime import datetime
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+import orjson
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Fields every Google service account key file contains
+SERVICE_ACCOUNT_REQUIRED_FIELDS = frozenset(('type', 'project_id', 'private_key_id', 'private_key', 'client_email'))
 
 
 def convert_objectid_to_str(data: Any) -> Any:
@@ -15,6 +23,34 @@ def convert_objectid_to_str(data: Any) -> Any:
         return data
 
 
+def document_to_response(document: Dict[str, Any], model: Type[ModelT]) -> ModelT:
+    """Build a response model from a stored document without re-validating it.
+    
+    Renames ``_id`` to a string ``id`` in place; only use for documents that
+    were validated when they were written.
+    """
+    document["id"] = str(document.pop("_id"))
+    return model.model_construct(**document)
+
+
+def _orjson_default(value: Any) -> Any:
+    """Serialize BSON types orjson does not handle natively"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class MongoJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes raw Mongo documents (ObjectId values)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS
+        )
+
+
 def build_aggregation_pipeline(
     query_filter: Dict[str, Any],
     group_by_field: str = "resource_id",